@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: out-of-core chunked loading against the in-memory path
+
+Writes a synthetic processed log (data_processing/synthetic.py) and builds
+the violin summaries of the top event types for both time measures and the
+log and raw hour transformations twice, each in a fresh process: with
+PMVA_LOADING=memory (the whole log read into RAM) and PMVA_LOADING=chunked
+(data_processing/chunked_log.py). Reports wall time and peak resident memory
+above the process's state after imports, and how far the chunked summaries
+deviate from the in-memory ones:
+
+- quartiles, whisker ends and means as a fraction of the violin's value range
+- densities as a fraction of the violin's peak density
+- counts, top event types and the median sort order (must be identical)
+
+The memory-mapped columns are removed, so the in-memory path reads the
+Parquet copy (or, with --format csv, the CSV) like the chunked path.
+
+Usage:
+    python benchmarks/bench_chunked_loading.py [--events 2000000] [--chunk 250000] [--format parquet]
+"""
+
+import argparse
+import os
+import pickle
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+TRANSFORMATIONS = ['log_hours', 'raw_hours']
+NUM_EVENTS = 8
+DATASET_KEY = 'bench_chunked'
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB."""
+    # VmHWM starts fresh at exec; ru_maxrss can carry over the parent's peak on Linux
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_worker(csv_path, output_path):
+    """Build all summaries in this process (mode from PMVA_LOADING) and pickle them."""
+    import app
+
+    app.DATASETS[DATASET_KEY] = {
+        'name': 'Chunked benchmark', 'file': csv_path, 'description': 'Synthetic benchmark log',
+        'domain': 'Benchmark', 'cases': '-', 'events': '-'
+    }
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    results = {}
+    selection = app.load_selection(DATASET_KEY, NUM_EVENTS)
+    for metric in app.TIME_METRICS:
+        for transformation in TRANSFORMATIONS:
+            plot_df, _ = app._violin_plot_data(selection, transformation, metric)
+            summaries = app._violin_summaries(DATASET_KEY, metric, transformation, NUM_EVENTS, plot_df)
+            order = app._violin_event_order(DATASET_KEY, metric, transformation, 'median', selection['top_events'], plot_df)
+            results[(metric, transformation)] = (selection['top_events'], summaries, order)
+    seconds = time.perf_counter() - start
+    with open(output_path, 'wb') as f:
+        pickle.dump({'results': results, 'seconds': seconds, 'peak_mb': peak_rss_mb() - baseline}, f)
+
+
+def run_mode(mode, csv_path, work_dir, chunk_events):
+    """Run one loading mode in a fresh process and load its results."""
+    output_path = os.path.join(work_dir, f'{mode}.pkl')
+    env = dict(os.environ, PMVA_LOADING=mode, PMVA_CHUNK_EVENTS=str(chunk_events))
+    subprocess.run([sys.executable, __file__, '--worker', csv_path, output_path], env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+    with open(output_path, 'rb') as f:
+        return pickle.load(f)
+
+
+def deviations(memory, chunked):
+    """Largest deviations of the chunked summaries from the in-memory ones."""
+    worst = {'box': 0.0, 'whiskers': 0.0, 'mean': 0.0, 'density': 0.0}
+    identical = True
+    for key, (top_events, summaries, order) in memory['results'].items():
+        chunked_top, chunked_summaries, chunked_order = chunked['results'][key]
+        identical &= top_events == chunked_top and order == chunked_order
+        for name in top_events:
+            exact, streamed = summaries[name], chunked_summaries[name]
+            identical &= exact['count'] == streamed['count']
+            span = exact['grid'][-1] - exact['grid'][0]
+            worst['box'] = max(worst['box'], *(abs(exact[q] - streamed[q]) / span for q in ('q1', 'median', 'q3')))
+            worst['whiskers'] = max(worst['whiskers'], *(
+                abs(exact[f] - streamed[f]) / span for f in ('lowerfence', 'upperfence')
+            ))
+            worst['mean'] = max(worst['mean'], abs(exact['mean'] - streamed['mean']) / span)
+            worst['density'] = max(worst['density'], float(
+                np.abs(np.interp(exact['grid'], streamed['grid'], streamed['density']) - exact['density']).max()
+                / exact['density'].max()
+            ))
+    return worst, identical
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark out-of-core chunked loading")
+    parser.add_argument('--events', type=int, default=2_000_000, help='Number of events (default: 2000000)')
+    parser.add_argument('--chunk', type=int, default=250_000, help='Events per chunk (default: 250000)')
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet',
+                        help='File both modes read (default: parquet)')
+    parser.add_argument('--worker', nargs=2, metavar=('CSV', 'OUTPUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(*args.worker)
+        return 0
+
+    from data_processing.mapped_log import mapped_meta_path_for
+    from data_processing.storage import columnar_path_for
+    from data_processing.synthetic import generate_event_log, write_processed_log
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        csv_path = os.path.join(work_dir, 'processed_bench_chunked.csv')
+        write_processed_log(generate_event_log(n_cases=max(args.events // 10, 1)), csv_path)
+        shutil.rmtree(os.path.dirname(mapped_meta_path_for(csv_path)), ignore_errors=True)
+        if args.format == 'csv' and os.path.exists(columnar_path_for(csv_path)):
+            os.remove(columnar_path_for(csv_path))
+
+        memory = run_mode('memory', csv_path, work_dir, args.chunk)
+        chunked = run_mode('chunked', csv_path, work_dir, args.chunk)
+
+    worst, identical = deviations(memory, chunked)
+    print(f"Synthetic data: about {args.events:,} events from {args.format}, chunks of {args.chunk:,}")
+    print(f"   in memory            : {memory['seconds']:8.2f} s, peak +{memory['peak_mb']:.0f} MB")
+    print(f"   chunked              : {chunked['seconds']:8.2f} s, peak +{chunked['peak_mb']:.0f} MB")
+    print(f"   quartiles            : {worst['box']:.2e} of the value range")
+    print(f"   whisker ends         : {worst['whiskers']:.2e} of the value range")
+    print(f"   means                : {worst['mean']:.2e} of the value range")
+    print(f"   densities            : {worst['density']:.2%} of the peak density")
+    print(f"   counts, top-N, order : {'identical' if identical else 'DIFFERENT'}")
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: memory footprint of loaded event logs
+
+Writes a synthetic processed CSV (with the usual extra XES columns) to a
+temporary directory and loads it twice: the original way (all columns with
+default dtypes, filtered and copied) and with read_compact_log (dashboard
+columns only, categoricals and float32). Reports bytes per event and load time.
+
+Usage:
+    python benchmarks/bench_compact_loading.py [--events 1000000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from data_processing.storage import read_compact_log, bytes_per_event
+
+
+def make_processed_csv(path, n_events, seed=0):
+    """Write a synthetic processed log with about 8 events per case."""
+    rng = np.random.default_rng(seed)
+    case_ids = np.sort(rng.integers(0, max(n_events // 8, 1), n_events))
+    start_ns = pd.Timestamp('2020-01-01', tz='UTC').value
+    pd.DataFrame({
+        'case:concept:name': pd.Series(case_ids).map('case_{}'.format),
+        'concept:name': rng.choice([f'Activity {i}' for i in range(20)], n_events),
+        'org:resource': rng.choice([f'User_{i}' for i in range(50)], n_events),
+        'lifecycle:transition': 'complete',
+        'time:timestamp': pd.to_datetime(start_ns + rng.integers(0, 10**16, n_events), utc=True),
+        'time_since_case_start': np.where(rng.random(n_events) < 0.12, 0.0, rng.lognormal(3, 2, n_events)),
+    }).to_csv(path, index=False)
+
+
+def original_load(path):
+    """The loading path before compact typing."""
+    df = pd.read_csv(path)
+    return df[df['time_since_case_start'] > 0].copy()
+
+
+def compact_load(path):
+    """The dashboard's current loading path."""
+    df = read_compact_log(path)
+    return df[df['time_since_case_start'] > 0]
+
+
+def timed(func, path):
+    start = time.perf_counter()
+    result = func(path)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory footprint of loaded event logs")
+    parser.add_argument('--events', type=int, default=1_000_000, help='Number of events (default: 1000000)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'processed_synthetic.csv')
+        make_processed_csv(path, args.events)
+        print(f"Synthetic log: {args.events:,} events ({os.path.getsize(path) / 1e6:.1f} MB CSV)")
+
+        original, original_time = timed(original_load, path)
+        compact, compact_time = timed(compact_load, path)
+
+    same_events = len(original) == len(compact) and np.array_equal(
+        original['concept:name'].to_numpy(), compact['concept:name'].to_numpy(dtype=object)
+    )
+
+    print(f"   original : {bytes_per_event(original):8.1f} bytes/event, load {original_time:6.2f} s")
+    print(f"   compact  : {bytes_per_event(compact):8.1f} bytes/event, load {compact_time:6.2f} s")
+    print(f"   reduction: {bytes_per_event(original) / bytes_per_event(compact):8.1f}x")
+    print(f"   same events: {same_events}")
+    return 0 if same_events else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
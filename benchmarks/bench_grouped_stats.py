@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: grouped statistics for event type sorting
+
+Compares the original pandas aggregation with two lambda quantiles (as used
+for sorting in update_violin_plot) against utils.grouped_stats, and checks
+that both give identical results.
+
+Usage:
+    python benchmarks/bench_grouped_stats.py [--events 1000000] [--groups 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'utils'))
+from grouped_stats import grouped_stats
+
+COLUMNS = ['mean', 'median', 'min', 'max', 'q1', 'q3']
+
+
+def lambda_baseline(df):
+    """The original aggregation from update_violin_plot."""
+    stats_df = df.groupby('concept:name', observed=True)['transformed_time'].agg([
+        'mean', 'median', 'min', 'max',
+        lambda x: x.quantile(0.25),
+        lambda x: x.quantile(0.75)
+    ])
+    stats_df.columns = COLUMNS
+    return stats_df
+
+
+def engine(df):
+    return grouped_stats(df['concept:name'], df['transformed_time'])[COLUMNS]
+
+
+def best_of(func, df, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark grouped statistics")
+    parser.add_argument('--events', type=int, default=1_000_000, help='Number of events (default: 1000000)')
+    parser.add_argument('--groups', type=int, default=10, help='Number of event types (default: 10)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'concept:name': pd.Categorical(rng.choice([f'Event {i}' for i in range(args.groups)], args.events)),
+        'transformed_time': np.log1p(rng.lognormal(3, 2, args.events)),
+    })
+    print(f"Synthetic data: {args.events:,} events, {args.groups} event types")
+
+    baseline, baseline_time = best_of(lambda_baseline, df)
+    result, engine_time = best_of(engine, df)
+    identical = baseline.index.equals(result.index) and (baseline.to_numpy() == result.to_numpy()).all()
+
+    print(f"   pandas agg + lambdas : {baseline_time:8.3f} s")
+    print(f"   grouped_stats        : {engine_time:8.3f} s")
+    print(f"   speedup              : {baseline_time / engine_time:8.1f}x")
+    print(f"   identical results    : {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: KLL quantile sketch accuracy, size and speed
+
+Feeds skewed synthetic time values (log-normal hours, as in event logs) to
+utils.quantile_sketch.KLLSketch three ways: in one batch, in chunks (as the
+streaming ingestion does) and as several chunk sketches merged into one (as
+for several files), plus a JSON round trip. For each it reports the largest
+normalized rank error over the 1st-99th percentiles, the retained items,
+the serialized size and the time, against an exact np.quantile.
+
+Usage:
+    python benchmarks/bench_quantile_sketch.py [--values 1000000] [--chunk 100000] [--k 200]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'utils'))
+from quantile_sketch import DEFAULT_K, KLLSketch
+
+QUANTILES = np.linspace(0.01, 0.99, 99)
+
+
+def max_rank_error(sketch, sorted_values):
+    """Largest distance between requested and true rank of the sketch's quantiles."""
+    estimates = sketch.quantiles(QUANTILES)
+    ranks = np.searchsorted(sorted_values, estimates, side='right') / len(sorted_values)
+    return float(np.max(np.abs(ranks - QUANTILES)))
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KLL quantile sketches")
+    parser.add_argument('--values', type=int, default=1_000_000, help='Number of values (default: 1000000)')
+    parser.add_argument('--chunk', type=int, default=100_000, help='Values per chunk (default: 100000)')
+    parser.add_argument('--k', type=int, default=DEFAULT_K, help=f'Sketch accuracy parameter (default: {DEFAULT_K})')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(3, 2, args.values)
+    chunks = [values[start:start + args.chunk] for start in range(0, len(values), args.chunk)]
+    print(f"Synthetic data: {args.values:,} log-normal values, {len(chunks)} chunks, k={args.k}")
+
+    sorted_values, exact_time = timed(lambda: np.sort(values))
+    np.quantile(sorted_values, QUANTILES)
+
+    def chunked():
+        sketch = KLLSketch(args.k)
+        for chunk in chunks:
+            sketch.update(chunk)
+        return sketch
+
+    def merged():
+        sketch = KLLSketch(args.k)
+        for i, chunk in enumerate(chunks):
+            sketch.merge(KLLSketch(args.k, seed=i).update(chunk))
+        return sketch
+
+    runs = {
+        'one batch': timed(lambda: KLLSketch(args.k).update(values)),
+        'chunked': timed(chunked),
+        'merged chunks': timed(merged),
+    }
+    restored, _ = timed(lambda: KLLSketch.from_dict(json.loads(json.dumps(runs['chunked'][0].to_dict()))))
+    runs['JSON round trip'] = (restored, 0.0)
+
+    print(f"   exact sort             : {exact_time:8.3f} s")
+    ok = True
+    for name, (sketch, seconds) in runs.items():
+        error = max_rank_error(sketch, sorted_values)
+        size = len(json.dumps(sketch.to_dict()))
+        exact_moments = sketch.n == len(values) and np.isclose(sketch.mean, values.mean(), rtol=1e-9)
+        ok = ok and error < 0.01 and exact_moments
+        print(f"   {name:<22} : {seconds:8.3f} s, rank error {error:.2%}, "
+              f"{sketch.retained:,} items, {size / 1024:.1f} KiB JSON")
+    print(f"   within 1% rank error   : {ok}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
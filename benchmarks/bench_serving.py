@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: dashboard request throughput per serving mode
+
+Starts the dashboard with setup_and_run.py in the given serving mode (or
+targets an already running one with --url), waits for /ready and sends
+violin plot callback requests (POST /_dash-update-component) from several
+concurrent clients. The requests cycle through every combination of time
+measure, transformation, sort order and number of event types for the
+dataset, like users clicking through the controls, and reference the
+selection by its handle as the browser does. Reports requests per second and latency
+percentiles.
+
+The development server is started with --warm-up blocking, so both modes
+begin with the datasets loaded. One untimed round over all combinations
+runs before the measurement. Server output goes to
+benchmarks/results/serving-<mode>.log.
+
+Usage:
+    python benchmarks/bench_serving.py --serve development
+    python benchmarks/bench_serving.py --serve production --workers 4 --threads 4
+    python benchmarks/bench_serving.py --url http://127.0.0.1:8050 --clients 32
+"""
+
+import argparse
+import itertools
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.join(BENCH_DIR, '..')
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+from utils.transformations import TRANSFORMATIONS  # noqa: E402
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+TIME_METRICS = ['time_since_case_start', 'time_since_previous_event']
+SORTINGS = ['frequency', 'mean', 'median', 'min', 'max', 'q1', 'q3']
+NUM_EVENTS = [4, 6, 8, 10]
+
+
+def callback_payload(dataset, metric, transformation, sorting, num_events):
+    """Build the request body Dash sends when a control of the violin plot changes."""
+    inputs = [
+        ('selection-handle', 'data', {'dataset': dataset, 'num_events': num_events}),
+        ('metric-dropdown', 'value', metric),
+        ('transformation-dropdown', 'value', transformation),
+        ('sorting-dropdown', 'value', sorting),
+    ]
+    # Without the violin-view state the server sends complete figures, not partial updates
+    return json.dumps({
+        'output': '..violin-plot.figure...violin-view.data..',
+        'outputs': [{'id': 'violin-plot', 'property': 'figure'}, {'id': 'violin-view', 'property': 'data'}],
+        'inputs': [{'id': id_, 'property': prop, 'value': value} for id_, prop, value in inputs],
+        'changedPropIds': ['sorting-dropdown.value'],
+        'state': [{'id': 'violin-view', 'property': 'data', 'value': None}],
+    }).encode('utf-8')
+
+
+def post(url, body, timeout=120):
+    """Send one callback request and return its latency in seconds."""
+    request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def wait_until_ready(base_url, process=None, timeout=600):
+    """Poll /ready until the server answers 200."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(f'{base_url}/ready', timeout=5) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"{base_url} not ready after {timeout}s")
+
+
+def start_server(args):
+    """Start the dashboard in its own process group."""
+    command = [sys.executable, os.path.join(ROOT_DIR, 'setup_and_run.py'), '--skip-processing', '--serve', args.serve]
+    if args.serve == 'production':
+        command += ['--threads', str(args.threads)]
+        if args.workers:
+            command += ['--workers', str(args.workers)]
+    else:
+        command += ['--warm-up', 'blocking']
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    log = open(os.path.join(RESULTS_DIR, f'serving-{args.serve}.log'), 'w', encoding='utf-8')
+    return subprocess.Popen(command, cwd=ROOT_DIR, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+
+
+def stop_server(process):
+    """Stop the server and its workers (or the debug reloader's child)."""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def run_load(url, bodies, clients):
+    """
+    Send all request bodies from concurrent clients.
+
+    Returns:
+        tuple: (latencies in seconds, wall time, error count)
+    """
+    errors = 0
+
+    def send(body):
+        nonlocal errors
+        try:
+            return post(url, body)
+        except (urllib.error.URLError, OSError):
+            errors += 1
+            return None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = [latency for latency in pool.map(send, bodies) if latency is not None]
+    return np.array(latencies), time.perf_counter() - start, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard request throughput")
+    parser.add_argument('--serve', choices=['development', 'production'], default='development',
+                        help='Serving mode to start (default: development)')
+    parser.add_argument('--url', default=None, help='Benchmark an already running server instead of starting one')
+    parser.add_argument('--workers', type=int, default=None, help='Production worker processes (default: one per CPU)')
+    parser.add_argument('--threads', type=int, default=4, help='Production threads per worker (default: 4)')
+    parser.add_argument('--dataset', default='sepsis', help='Dataset key to request (default: sepsis)')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent clients (default: 16)')
+    parser.add_argument('--rounds', type=int, default=3,
+                        help='Measured passes over all control combinations (default: 3)')
+    args = parser.parse_args()
+
+    base_url = (args.url or 'http://127.0.0.1:8050').rstrip('/')
+    process = None if args.url else start_server(args)
+    try:
+        wait_until_ready(base_url, process)
+        url = f'{base_url}/_dash-update-component'
+        combinations = list(itertools.product(TIME_METRICS, TRANSFORMATIONS, SORTINGS, NUM_EVENTS))
+        bodies = [callback_payload(args.dataset, *combination) for combination in combinations]
+
+        run_load(url, bodies, args.clients)
+        latencies, wall_time, errors = run_load(url, bodies * args.rounds, args.clients)
+    finally:
+        if process is not None:
+            stop_server(process)
+
+    mode = 'external' if args.url else args.serve
+    print(f"Serving mode: {mode}, dataset {args.dataset}, {args.clients} clients, {os.cpu_count()} CPUs")
+    print(f"   requests   : {len(latencies):,} ok, {errors} failed in {wall_time:.1f} s")
+    if len(latencies):
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+        print(f"   throughput : {len(latencies) / wall_time:8.1f} req/s")
+        print(f"   latency    : p50 {p50:.0f} ms, p95 {p95:.0f} ms, p99 {p99:.0f} ms")
+    return 0 if len(latencies) and not errors else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
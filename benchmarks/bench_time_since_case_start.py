@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: time-since-case-start and inter-event time computation
+
+Compares the original per-case pandas code (groupby().transform for the time
+since case start, groupby().diff() for the inter-event time of
+scripts/analysis/event_log_interevent.py) against the vectorized
+add_time_features on a synthetic log with many cases, and checks that both
+give identical values.
+
+Usage:
+    python benchmarks/bench_time_since_case_start.py [--cases 150000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from data_processing.time_features import add_time_features
+
+
+def make_log(n_cases, seed=0):
+    """Build a shuffled synthetic log with 1-8 events per case."""
+    rng = np.random.default_rng(seed)
+    events_per_case = rng.integers(1, 9, n_cases)
+    case_ids = np.repeat(np.arange(n_cases), events_per_case)
+    start_ns = pd.Timestamp('2020-01-01', tz='UTC').value + rng.integers(0, 10**16, n_cases)
+    offsets_ns = (rng.lognormal(3, 2, len(case_ids)) * 3.6e12).astype('int64')
+    df = pd.DataFrame({
+        'case:concept:name': pd.Series(case_ids).map('case_{}'.format),
+        'concept:name': rng.choice(list('ABCDEFGHIJ'), len(case_ids)),
+        'time:timestamp': pd.to_datetime(np.repeat(start_ns, events_per_case) + offsets_ns, utc=True),
+    })
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def lambda_baseline(df):
+    """The original implementations from process_xes_to_csv and the inter-event script."""
+    df = df.copy()
+    df['time_since_case_start'] = df.groupby('case:concept:name')['time:timestamp'].transform(
+        lambda x: (x - x.min()).dt.total_seconds() / 3600
+    )
+    df = df.sort_values(['case:concept:name', 'time:timestamp'])
+    df['time_since_previous_event'] = df.groupby('case:concept:name')['time:timestamp'].diff().dt.total_seconds() / 3600
+    return df
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark time_since_case_start and inter-event time computation")
+    parser.add_argument('--cases', type=int, default=150_000, help='Number of cases (default: 150000)')
+    args = parser.parse_args()
+
+    df = make_log(args.cases)
+    print(f"Synthetic log: {args.cases:,} cases, {len(df):,} events")
+
+    baseline, baseline_time = timed(lambda_baseline, df)
+    vectorized, vectorized_time = timed(add_time_features, df)
+
+    # Compare per original row (tie order within a case may differ between sorts)
+    identical = all(
+        np.array_equal(baseline[column].sort_index().to_numpy(), vectorized[column].sort_index().to_numpy(),
+                       equal_nan=True)
+        for column in ('time_since_case_start', 'time_since_previous_event')
+    )
+
+    print(f"   groupby + lambda/diff : {baseline_time:8.3f} s")
+    print(f"   vectorized            : {vectorized_time:8.3f} s")
+    print(f"   speedup               : {baseline_time / vectorized_time:8.1f}x")
+    print(f"   identical values      : {identical}")
+    return 0 if identical else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Check: import time of the entry points
+
+Imports each entry point in a fresh interpreter with `python -X importtime`
+and checks two things:
+
+- heavy packages an entry point must not load at import time (pm4py is only
+  imported when an XES conversion runs, plotly.express only for the client
+  violin mode, the setup script imports nothing but the standard library)
+- the cumulative import time against a budget (best of --repeat runs)
+
+Budgets are generous upper bounds for a developer laptop; scale them with
+--budget-scale on slow machines. Exits with 1 if any check fails, so it can
+run as part of `make test`.
+
+Usage:
+    python benchmarks/check_import_time.py [--repeat 3] [--budget-scale 1.0]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.abspath(os.path.join(BENCH_DIR, '..'))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+
+# (module, directory it is imported from, packages it must not load, budget in ms)
+ENTRY_POINTS = [
+    ('setup_and_run', ROOT_DIR, ['numpy', 'pandas', 'dash', 'plotly', 'pm4py'], 300),
+    ('data_processing.data_processing', SRC_DIR, ['pm4py', 'dash', 'plotly'], 2000),
+    ('app', SRC_DIR, ['pm4py', 'plotly.express', 'sklearn', 'gunicorn'], 5000),
+]
+
+
+def import_times(statement, cwd):
+    """
+    Run a statement under -X importtime.
+
+    Returns:
+        list: (module name, nesting depth, cumulative microseconds) per import
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [cwd, os.environ.get('PYTHONPATH')])))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{statement!r} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(cumulative)))
+    return imports
+
+
+def measure(module, cwd, startup):
+    """
+    Import a module once.
+
+    Returns:
+        tuple: (import time in ms excluding interpreter startup, set of imported module names)
+    """
+    imports = import_times(f'import {module}', cwd)
+    total_us = sum(cumulative for name, depth, cumulative in imports if depth == 0 and name not in startup)
+    return total_us / 1000, {name for name, _, _ in imports}
+
+
+def loaded_forbidden(imported, forbidden):
+    """Get the forbidden packages (or their submodules) that were imported."""
+    return sorted(package for package in forbidden
+                  if any(name == package or name.startswith(package + '.') for name in imported))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import time of the entry points")
+    parser.add_argument('--repeat', type=int, default=3, help='Imports per entry point, best is kept (default: 3)')
+    parser.add_argument('--budget-scale', type=float, default=1.0, help='Multiply all budgets (default: 1.0)')
+    args = parser.parse_args()
+
+    startup = {name for name, _, _ in import_times('pass', ROOT_DIR)}
+    failures = 0
+    for module, cwd, forbidden, budget_ms in ENTRY_POINTS:
+        try:
+            runs = [measure(module, cwd, startup) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            failures += 1
+            print(f"❌ {module:<32} {e}")
+            continue
+        best_ms = min(ms for ms, _ in runs)
+        heavy = loaded_forbidden(runs[0][1], forbidden)
+        budget_ms *= args.budget_scale
+
+        ok = not heavy and best_ms <= budget_ms
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {module:<32} {best_ms:8.1f} ms (budget {budget_ms:.0f} ms)")
+        if heavy:
+            print(f"   imports {', '.join(heavy)} at startup")
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
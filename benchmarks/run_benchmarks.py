@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite for the ingestion and rendering hot paths
+
+Builds synthetic event logs of several sizes (data_processing/synthetic.py)
+and measures each stage the dashboard goes through:
+
+- ingest:    XES -> processed CSV/Parquet/statistics (process_xes_to_csv;
+             the streaming converter if pm4py is not installed)
+- load:      cold load_dataset (read, filter, top event types)
+- transform: transform_time_data over all loaded events
+- plot_cold: first violin figure for a selection (densities, figure)
+- plot_warm: the same figure again (served from the dataset cache)
+- plot_sort: the violin callback after a sort-only change (a partial update)
+
+For every stage it records wall time (best of --repeat untraced runs), peak
+Python heap memory (one extra run under tracemalloc, which also sees NumPy
+buffers) and, for plot stages, the size of the JSON figure sent to the browser.
+
+Results are saved as JSON in benchmarks/results/ and compared against a
+stored baseline (benchmarks/baseline.json) if one exists. Baselines are
+machine-specific: record one with --save-baseline on the machine you compare on.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 10k,100k,1M,10M] [--repeat 3]
+    python benchmarks/run_benchmarks.py --sizes 10k,100k --save-baseline
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+from plotly.utils import PlotlyJSONEncoder
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+import app  # noqa: E402
+from data_processing.synthetic import generate_event_log, write_processed_log, write_xes  # noqa: E402
+from utils.transformations import transform_time_data  # noqa: E402
+
+if importlib.util.find_spec('pm4py') is not None:
+    from data_processing.data_processing import process_xes_to_csv
+    INGEST_MODE = 'pm4py'
+else:
+    from data_processing.xes_stream import stream_xes_to_csv as process_xes_to_csv
+    INGEST_MODE = 'streaming'
+
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+BASELINE_PATH = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_SIZES = '10k,100k,1M,10M'
+METRICS = ['time_s', 'peak_bytes', 'payload_bytes']
+
+
+def parse_size(text):
+    """Parse sizes like 10k, 1M or 250000."""
+    text = text.strip().lower()
+    factor = {'k': 1_000, 'm': 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * factor)
+
+
+def make_event_log(n_events, seed=0):
+    """Build a synthetic processed log of about n_events events (10 per case, 20 event types)."""
+    return generate_event_log(n_cases=max(n_events // 10, 1), events_per_case=10, n_activities=20, seed=seed)
+
+
+def measure(run, setup=None, repeat=1, trace=True):
+    """
+    Measure a stage.
+
+    Args:
+        run (callable): Stage to measure; its return value is passed through
+        setup (callable): Called before every run (not timed)
+        repeat (int): Number of timed runs (the best is reported)
+        trace (bool): Also do one run under tracemalloc for the peak memory
+
+    Returns:
+        tuple: (result, metrics dict)
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+
+    metrics = {'time_s': best}
+    if trace:
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            run()
+            metrics['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, metrics
+
+
+def quiet(func):
+    """Run a function with its progress prints suppressed."""
+    from contextlib import redirect_stdout
+    import io
+
+    def wrapper():
+        with redirect_stdout(io.StringIO()):
+            return func()
+    return wrapper
+
+
+def bench_size(n_events, work_dir, args):
+    """Run all stages for one log size."""
+    results = {}
+    df = make_event_log(n_events)
+    csv_path = os.path.join(work_dir, f'processed_bench_{n_events}.csv')
+
+    if n_events <= args.ingest_max_events:
+        xes_path = os.path.join(work_dir, f'bench_{n_events}.xes')
+        write_xes(df, xes_path)
+        success, results['ingest'] = measure(
+            quiet(lambda: process_xes_to_csv(xes_path, csv_path)), trace=not args.no_memory
+        )
+        if not success:
+            raise RuntimeError(f"ingestion of {xes_path} failed")
+        results['ingest']['mode'] = INGEST_MODE
+        os.remove(xes_path)
+    else:
+        quiet(lambda: write_processed_log(df, csv_path))()
+    del df
+
+    # Point a temporary dashboard entry at the benchmark file (absolute paths win in get_dataset_path)
+    dataset_key = f'bench_{n_events}'
+    app.DATASETS[dataset_key] = {
+        'name': f'Benchmark {n_events:,}', 'file': csv_path, 'description': 'Synthetic benchmark log',
+        'domain': 'Benchmark', 'cases': '-', 'events': f'{n_events:,}'
+    }
+    clear_cache = app.DATASET_STORE.clear
+
+    _, results['load'] = measure(
+        quiet(lambda: app.load_dataset(dataset_key, args.num_events)),
+        setup=clear_cache, repeat=args.repeat, trace=not args.no_memory
+    )
+
+    hours = quiet(lambda: app.get_dataset_entry(dataset_key))().df[app.DEFAULT_METRIC]
+    _, results['transform'] = measure(
+        lambda: transform_time_data(hours, args.transformation),
+        repeat=args.repeat, trace=not args.no_memory
+    )
+    del hours
+
+    def plot():
+        return app.build_violin_plot(dataset_key, args.transformation, 'median', args.num_events)
+
+    def warm_load():
+        clear_cache()
+        quiet(lambda: app.get_dataset_entry(dataset_key))()
+
+    figure, results['plot_cold'] = measure(plot, setup=warm_load, repeat=args.repeat, trace=not args.no_memory)
+    results['plot_cold']['payload_bytes'] = len(pio.to_json(figure, validate=False))
+    figure, results['plot_warm'] = measure(plot, repeat=args.repeat, trace=not args.no_memory)
+    results['plot_warm']['payload_bytes'] = len(pio.to_json(figure, validate=False))
+
+    handle = app.load_selection(dataset_key, args.num_events)['handle']
+    _, view = app.update_violin_plot(handle, app.DEFAULT_METRIC, args.transformation, 'median')
+    patch, results['plot_sort'] = measure(
+        lambda: app.update_violin_plot(handle, app.DEFAULT_METRIC, args.transformation, 'max', view)[0],
+        repeat=args.repeat, trace=not args.no_memory
+    )
+    results['plot_sort']['payload_bytes'] = len(json.dumps(patch.to_plotly_json(), cls=PlotlyJSONEncoder))
+
+    clear_cache()
+    del app.DATASETS[dataset_key]
+    return results
+
+
+def environment():
+    """Describe the machine and code version the results belong to."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=BENCH_DIR
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'violin_mode': app.VIOLIN_RENDER_MODE,
+        'commit': commit,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print current vs baseline metrics and collect regressions.
+
+    Returns:
+        list: (size, stage, metric, ratio) entries slower/larger than tolerance
+    """
+    regressions = []
+    print("\nComparison against baseline (ratio = current / baseline):")
+    for size, stages in results['sizes'].items():
+        for stage, metrics in stages.items():
+            base = baseline.get('sizes', {}).get(size, {}).get(stage)
+            if base is None:
+                continue
+            ratios = []
+            for metric in METRICS:
+                if metric in metrics and base.get(metric):
+                    ratio = metrics[metric] / base[metric]
+                    ratios.append(f"{metric}={ratio:5.2f}x")
+                    if ratio > tolerance:
+                        regressions.append((size, stage, metric, ratio))
+            print(f"   {size:>10} {stage:<10} " + '  '.join(ratios))
+    return regressions
+
+
+def format_bytes(value):
+    return f"{value / 1e6:9.1f} MB" if value is not None else ' ' * 12
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the ingestion and rendering hot paths")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f'Comma-separated event counts (default: {DEFAULT_SIZES})')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage, best is kept (default: 3)')
+    parser.add_argument('--num-events', type=int, default=8, help='Top event types to plot (default: 8)')
+    parser.add_argument('--transformation', default='log_hours', help='Transformation to benchmark (default: log_hours)')
+    parser.add_argument('--ingest-max-events', type=int, default=1_000_000,
+                        help='Largest size that also benchmarks XES ingestion (default: 1000000)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc runs')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline JSON to compare against')
+    parser.add_argument('--save-baseline', action='store_true', help='Store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=1.25,
+                        help='Ratio above which a metric counts as a regression (default: 1.25)')
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    results = {
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'settings': {'repeat': args.repeat, 'num_events': args.num_events, 'transformation': args.transformation},
+        'sizes': {},
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for n_events in sizes:
+            print(f"Benchmarking {n_events:,} events...")
+            stages = bench_size(n_events, work_dir, args)
+            results['sizes'][str(n_events)] = stages
+            for stage, metrics in stages.items():
+                print(f"   {stage:<10} {metrics['time_s']:9.3f} s"
+                      f"  peak {format_bytes(metrics.get('peak_bytes'))}"
+                      f"  payload {format_bytes(metrics.get('payload_bytes'))}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    for path in (os.path.join(RESULTS_DIR, f'bench-{stamp}.json'), os.path.join(RESULTS_DIR, 'latest.json')):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    print(f"\nSaved results to {os.path.join(RESULTS_DIR, 'latest.json')}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline found; record one with --save-baseline")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for size, stage, metric, ratio in regressions:
+        print(f"❌ Regression: {stage} at {size} events, {metric} {ratio:.2f}x baseline")
+    if not regressions:
+        print("✅ No regressions above tolerance")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,26 +1,42 @@
-import pandas as pd
-import numpy as np
+import argparse
+import os
+import sys
 
-# Load the processed event log
-df = pd.read_csv('processed_bpi2017.csv')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'src'))
+from data_processing.event_sketches import load_event_sketches
+from data_processing.event_stats import describe_event_types
+from data_processing.storage import EVENT_COLUMN, GAP_COLUMN, read_compact_log
+from utils.quantile_sketch import KLLSketch
 
-# Sort by case and timestamp to compute inter-event times
-# Ensure timestamp is in datetime format
-if not np.issubdtype(df['time:timestamp'].dtype, np.datetime64):
-    df['time:timestamp'] = pd.to_datetime(df['time:timestamp'], format='ISO8601')
+parser = argparse.ArgumentParser(description="Inter-event time per event type of a processed event log")
+parser.add_argument('csv_path', nargs='?', default='processed_bpi2017.csv', help='Processed CSV file')
+parser.add_argument('--percentile', type=float, default=0.99,
+                    help='Percentile of all inter-event times to report, as a fraction (default: 0.99)')
+args = parser.parse_args()
 
-df = df.sort_values(['case:concept:name', 'time:timestamp'])
+# Inter-event time (hours since the previous event of the case) is stored by the
+# processing pipeline; the first event of each case has none
+sketches = load_event_sketches(args.csv_path)
+scope = sketches.sketches(GAP_COLUMN) if sketches is not None else None
+if scope:
+    # Merge the per-event-type sketches instead of loading every gap (approximate, see quantile_sketch.py)
+    merged = KLLSketch()
+    for sketch in scope.values():
+        merged.merge(sketch)
+    n_gaps, percentile, source = merged.n, merged.quantile(args.percentile), 'approximate, from the quantile sketches'
+else:
+    df = read_compact_log(args.csv_path, columns=[EVENT_COLUMN, GAP_COLUMN])
+    if GAP_COLUMN not in df.columns:
+        sys.exit(f'{args.csv_path} has no {GAP_COLUMN} column; reprocess it with the current pipeline')
+    gaps = df[GAP_COLUMN].dropna()
+    n_gaps, percentile, source = len(gaps), gaps.quantile(args.percentile), 'exact'
 
-# Compute inter-event time (in hours) within each case
-df['inter_event_time'] = df.groupby('case:concept:name')['time:timestamp'].diff().dt.total_seconds() / 3600
+# Per-event-type stats (from the .stats.json sidecar when up to date)
+summary = describe_event_types(args.csv_path, metric=GAP_COLUMN)
+print(summary[['min', '25%', '50%', '75%', 'max', 'count']])
+print(f'{n_gaps:,} inter-event times, {args.percentile:.0%} below {percentile:.2f} hours ({source})')
 
-# Remove the first event in each case (inter_event_time is NaN)
-df_inter = df.dropna(subset=['inter_event_time'])
-
-# Optionally filter out extreme outliers (e.g., above 99th percentile)
-upper_limit = df_inter['inter_event_time'].quantile(0.99)
-df_inter = df_inter[df_inter['inter_event_time'] <= upper_limit]
-
-# Save for visualization or further analysis
-df_inter.to_csv('processed_bpi2017_interevent.csv', index=False)
-print('Saved processed_bpi2017_interevent.csv with inter-event times.')
+# Save to CSV for manual inspection
+output = os.path.splitext(os.path.basename(args.csv_path))[0] + '_interevent_stats.csv'
+summary.to_csv(output)
+print(f'Saved {output}')
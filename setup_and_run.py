@@ -14,12 +14,20 @@ Usage:
 Options:
     --process-data    Process all XES files to CSV
     --skip-processing Skip data processing, just run dashboard
+    --streaming       Parse XES files trace by trace with bounded memory
+    --jobs N          Convert N XES files in parallel (0 = one per CPU)
+    --force           Reconvert XES files even if the manifest says they are up to date
+    --warm-up [MODE]  Load all datasets at start: background (default) or blocking
+    --serve MODE      development (default) or production (multi-worker gunicorn)
+    --workers N       Production worker processes (default: one per CPU)
+    --threads N       Production threads per worker (default: 4)
     --help           Show this help message
 """
 
 import sys
 import os
 import argparse
+import importlib.util
 import subprocess
 import glob
 from pathlib import Path
@@ -27,23 +35,19 @@ from pathlib import Path
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+REQUIRED_PACKAGES = ['pandas', 'plotly', 'dash', 'numpy', 'pm4py']
+
 def check_requirements():
-    """Check if all required packages are installed."""
-    try:
-        import pandas
-        import plotly
-        import dash
-        import numpy
-        import sklearn
-        import pm4py
-        print("✅ All required packages are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing required package: {e}")
+    """Check if all required packages are installed (without importing them)."""
+    missing = [name for name in REQUIRED_PACKAGES if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"❌ Missing required package: {', '.join(missing)}")
         print("Please run: pip install -r requirements.txt")
         return False
+    print("✅ All required packages are installed")
+    return True
 
-def process_datasets():
+def process_datasets(streaming=False, jobs=1, force=False):
     """Process all XES files in datasets/raw/ to CSV format."""
     print("🔄 Processing XES files to CSV...")
     
@@ -67,31 +71,24 @@ def process_datasets():
         if src_path not in sys.path:
             sys.path.insert(0, src_path)
         
-        from data_processing.data_processing import process_xes_to_csv
-        
-        for xes_file in xes_files:
-            print(f"   Processing: {xes_file.name}")
-            
-            # Generate output filename
-            csv_name = f"processed_{xes_file.stem.lower().replace(' ', '_').replace('-', '_')}.csv"
-            csv_path = processed_dir / csv_name
-            
-            try:
-                # Process the file
-                success = process_xes_to_csv(str(xes_file), str(csv_path))
-                if success:
-                    print(f"   ✅ Created: {csv_path.name}")
-                else:
-                    print(f"   ❌ Failed: {xes_file.name}")
-            except Exception as e:
-                print(f"   ❌ Error processing {xes_file.name}: {e}")
-        
-        print("📊 Data processing complete!")
-        return True
+        from data_processing.data_processing import batch_process_directory
         
     except ImportError:
         print("❌ Could not import data processing module")
         return False
+    
+    # Convert files (in parallel worker processes when jobs > 1)
+    successful = batch_process_directory(str(raw_dir), str(processed_dir), streaming=streaming, jobs=jobs, force=force)
+    for csv_name in successful:
+        print(f"   ✅ Ready: {csv_name}")
+    
+    failed = len(xes_files) - len(successful)
+    if failed:
+        print(f"   ❌ {failed} of {len(xes_files)} files failed (see log above)")
+        return False
+    
+    print("📊 Data processing complete!")
+    return True
 
 def validate_datasets():
     """Check if processed datasets exist."""
@@ -110,19 +107,79 @@ def validate_datasets():
     
     return True
 
-def run_dashboard():
-    """Launch the dashboard application."""
+def run_dashboard(warm_up=None, serve='development', workers=None, threads=4):
+    """
+    Launch the dashboard application.
+    
+    Args:
+        warm_up (str): 'background' or 'blocking' to load all datasets at start
+            (defaults to PMVA_WARMUP; production mode always preloads)
+        serve (str): 'development' (Dash debug server) or 'production'
+        workers (int): Production worker processes (default: one per CPU)
+        threads (int): Production threads per worker
+    """
     print("🚀 Launching Process Mining Dashboard...")
     print("📊 Dashboard will be available at: http://127.0.0.1:8050")
     print("🔄 Press Ctrl+C to stop the server")
     
+    if serve == 'production':
+        return run_production_server(workers=workers, threads=threads)
+    
     try:
-        from app import app
+        from app import app, start_warmup, is_serving_process, WARMUP_MODE
+        warm_up = warm_up or WARMUP_MODE
+        if warm_up and is_serving_process(debug=True):
+            start_warmup(wait=warm_up == 'blocking')
         app.run(debug=True, host='127.0.0.1', port=8050)
     except Exception as e:
         print(f"❌ Failed to start dashboard: {e}")
         return False
 
+def run_production_server(workers=None, threads=4, bind='127.0.0.1:8050', timeout=120):
+    """
+    Serve the dashboard with multiple gunicorn worker processes.
+    
+    Datasets are loaded once in the master process (src/wsgi.py) before the
+    workers are forked, so the workers share them copy-on-write. Debug mode
+    and the reloader are off.
+    
+    Args:
+        workers (int): Worker processes (default: one per CPU)
+        threads (int): Threads per worker
+        bind (str): Address to listen on
+        timeout (int): Seconds before an unresponsive worker is restarted
+        
+    Returns:
+        bool: False if gunicorn is not available
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("❌ Production mode needs gunicorn (Linux/macOS): pip install gunicorn")
+        return False
+    
+    workers = workers or os.cpu_count() or 1
+    
+    class DashboardServer(BaseApplication):
+        def load_config(self):
+            options = {
+                'bind': bind,
+                'workers': workers,
+                'threads': threads,
+                'timeout': timeout,
+                'preload_app': True,
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            from wsgi import server
+            return server
+    
+    print(f"🏭 Production mode: {workers} workers x {threads} threads on http://{bind}")
+    DashboardServer().run()
+    return True
+
 def main():
     """Main execution function."""
     parser = argparse.ArgumentParser(
@@ -133,6 +190,7 @@ Examples:
   python setup_and_run.py                    # Complete setup and run dashboard
   python setup_and_run.py --skip-processing  # Skip data processing, just run dashboard
   python setup_and_run.py --process-data     # Only process data, don't run dashboard
+  python setup_and_run.py --skip-processing --serve production --workers 4  # Multi-worker server
         """
     )
     
@@ -140,6 +198,21 @@ Examples:
                        help='Process XES files and exit (don\'t run dashboard)')
     parser.add_argument('--skip-processing', action='store_true',
                        help='Skip data processing, just run dashboard')
+    parser.add_argument('--streaming', action='store_true',
+                       help='Parse XES files trace by trace with bounded memory (for very large logs)')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                       help='Convert N XES files in parallel worker processes (0 = one per CPU, default: 1)')
+    parser.add_argument('--force', action='store_true',
+                       help='Reconvert all XES files, ignoring datasets/processed/manifest.json')
+    parser.add_argument('--warm-up', nargs='?', const='background', choices=['background', 'blocking'],
+                       help='Load all datasets at start, while serving (background, default) or before (blocking)')
+    parser.add_argument('--serve', choices=['development', 'production'], default='development',
+                       help='development: single-process debug server (default); '
+                            'production: multi-worker gunicorn with datasets preloaded, debug off')
+    parser.add_argument('--workers', type=int, default=None, metavar='N',
+                       help='Production worker processes (default: one per CPU)')
+    parser.add_argument('--threads', type=int, default=4, metavar='N',
+                       help='Production threads per worker (default: 4)')
     
     args = parser.parse_args()
     
@@ -152,7 +225,7 @@ Examples:
     
     # Handle process-data-only mode
     if args.process_data:
-        success = process_datasets()
+        success = process_datasets(streaming=args.streaming, jobs=args.jobs, force=args.force)
         print(f"✅ Data processing {'completed' if success else 'failed'}")
         return 0 if success else 1
     
@@ -161,7 +234,7 @@ Examples:
         print("\n📊 Step 1: Data Processing")
         if not validate_datasets():
             print("Processing required datasets...")
-            if not process_datasets():
+            if not process_datasets(streaming=args.streaming, jobs=args.jobs, force=args.force):
                 print("❌ Data processing failed")
                 return 1
         else:
@@ -170,7 +243,7 @@ Examples:
         print("\n⏭️  Skipping data processing...")
     
     print("\n🚀 Step 2: Launching Dashboard")
-    run_dashboard()
+    run_dashboard(warm_up=args.warm_up, serve=args.serve, workers=args.workers, threads=args.threads)
     
     return 0
 
@@ -1,68 +1,162 @@
 # -*- coding: utf-8 -*-
 import pandas as pd
-import plotly.express as px
 import dash
-from dash import dcc, html, Input, Output
+import plotly.graph_objects as go
+from dash import dcc, html, Input, Output, State, Patch
 import numpy as np
 import os
-import sys
-
-# Add utils to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'utils'))
-from transformations import transform_time_data, get_transformation_options
-
-# Dataset Configuration
-DATASETS = {
-    'traffic_fines': {
-        'name': '🚗 Traffic Fines',
-        'file': 'processed_road_traffic_fine_management_process.csv',
-        'description': 'Road Traffic Fine Management Process',
-        'domain': 'Government',
-        'cases': '150,370',
-        'events': '561,470'
-    },
-    'bpi_2012': {
-        'name': '🏦 BPI Challenge 2012',
-        'file': 'processed_bpi_challenge_2012.csv',
-        'description': 'Loan Application Process',
-        'domain': 'Finance',
-        'cases': '13,087',
-        'events': '262,000'
-    },
-    'bpi_2017': {
-        'name': '🏦 BPI Challenge 2017',
-        'file': 'processed_bpi_challenge_2017.csv',
-        'description': 'Credit Application Process',
-        'domain': 'Finance',
-        'cases': '31,509',
-        'events': '1,202,267'
-    },
-    'sepsis': {
-        'name': '🏥 Sepsis Cases',
-        'file': 'processed_sepsis_cases___event_log.csv',
-        'description': 'Hospital Patient Treatment Process',
-        'domain': 'Healthcare',
-        'cases': '1,050',
-        'events': '15,214'
-    }
+import zlib
+from flask import jsonify
+
+# One package import path, so there is a single transformation registry (see utils/transformations.py)
+from utils.transformations import apply_transformation, get_axis_title, get_transformation, get_transformation_options
+from utils.dataset_store import DatasetStore
+from utils.violin_density import (
+    summarize_groups, build_violin_figure, build_violin_traces, violin_axes_layout, violin_axis,
+    common_max_density
+)
+from utils.grouped_stats import grouped_stats
+from utils.sampling import stratified_sample_indices
+from utils import metrics
+from utils.warmup import DatasetWarmer
+from data_processing.storage import read_compact_log, bytes_per_event, columnar_path_for, HOURS_COLUMN, GAP_COLUMN
+from data_processing.chunked_log import aggregate_violins, chunked_event_sketches, top_event_types
+from data_processing.event_sketches import load_event_sketches, sketches_path_for
+from data_processing.event_stats import load_event_stats, metric_stats, stats_path_for
+from data_processing.mapped_log import has_fresh_mapped, read_mapped_log, leading_rows, mapped_meta_path_for
+from dataset_config import DATASETS, PROCESSED_DIR, get_dataset_path
+
+# In-memory dataset cache budget (override with PMVA_CACHE_MAX_MB)
+DATASET_CACHE_MAX_MB = int(os.environ.get('PMVA_CACHE_MAX_MB', '2048'))
+DATASET_STORE = DatasetStore(max_bytes=DATASET_CACHE_MAX_MB * 1024 * 1024)
+
+# Violin rendering: 'server' sends precomputed fixed-size densities,
+# 'client' sends every event and lets the browser compute the KDE
+VIOLIN_RENDER_MODE = os.environ.get('PMVA_VIOLIN_MODE', 'server')
+
+# Per-event-type quartiles: 'exact' sorts the values, 'sketch' takes them from the
+# quantile sketches written at processing time (see data_processing/event_sketches.py)
+QUANTILE_MODE = os.environ.get('PMVA_QUANTILES', 'exact').lower()
+
+# Dataset loading: 'memory' reads the dashboard columns into RAM, 'chunked' streams the
+# processed file for every selection and keeps only per-event-type aggregates
+# (see data_processing/chunked_log.py; events per chunk: PMVA_CHUNK_EVENTS)
+LOADING_MODE = os.environ.get('PMVA_LOADING', 'memory').lower()
+CHUNK_EVENTS = int(os.environ.get('PMVA_CHUNK_EVENTS', '1000000'))
+if LOADING_MODE == 'chunked':
+    # Client-side violins need every event in the browser
+    VIOLIN_RENDER_MODE = 'server'
+
+# Optional warm-up of all datasets at server start: '' (off), 'background' or 'blocking'
+WARMUP_MODE = os.environ.get('PMVA_WARMUP', '').lower()
+DATASET_WARMER = None
+
+# Time measures the violins can show (both columns are loaded, so switching needs no I/O)
+TIME_METRICS = {
+    HOURS_COLUMN: {'label': '⏱️ Time Since Case Start', 'title': 'Time Since Case Start'},
+    GAP_COLUMN: {'label': '↔️ Time Since Previous Event', 'title': 'Time Since Previous Event'},
 }
 
+# Initial dashboard selection (also what the warm-up prepares)
+DEFAULT_METRIC = HOURS_COLUMN
+DEFAULT_TRANSFORMATION = 'log_hours'
+DEFAULT_SORTING = 'frequency'
+DEFAULT_NUM_EVENTS = 6
+
+# Optional sampling: cap on the events drawn per figure (0 disables, override with PMVA_SAMPLE_CAP)
+SAMPLE_CAP = int(os.environ.get('PMVA_SAMPLE_CAP', '0'))
+
+def _read_filtered_dataset(data_path):
+    """Read the dashboard columns of a processed log and drop case-start events."""
+    if has_fresh_mapped(data_path):
+        # Memory-mapped columns: shared by all worker processes, case-start events already at the end
+        with metrics.stage('read'):
+            df = read_mapped_log(data_path)
+        print(f"Mapped {os.path.basename(data_path)}: {len(df):,} events")
+        return df
+    
+    # Only the needed columns, as categoricals and float32 (columnar copy preferred over CSV)
+    with metrics.stage('read'):
+        df = read_compact_log(data_path)
+    
+    # Filter out the first events (time_since_case_start = 0) for meaningful temporal insights
+    with metrics.stage('filter'):
+        df = df[df[HOURS_COLUMN] > 0]
+    print(f"Loaded {os.path.basename(data_path)}: {len(df):,} events, {bytes_per_event(df):.1f} bytes/event")
+    return df
+
+def get_dataset_entry(dataset_key):
+    """Get the cached entry of a dataset, loading it on first use or after the files change."""
+    data_path = get_dataset_path(dataset_key)
+    return DATASET_STORE.get(
+        dataset_key,
+        [data_path, columnar_path_for(data_path), stats_path_for(data_path), sketches_path_for(data_path),
+         mapped_meta_path_for(data_path)],
+        # In chunked mode the entry holds no events, only the aggregates memoized on it
+        (lambda: None) if LOADING_MODE == 'chunked' else (lambda: _read_filtered_dataset(data_path))
+    )
+
+def _timed(stage_name, compute):
+    """Wrap a memoized computation so it is recorded as a metrics stage."""
+    def run():
+        with metrics.stage(stage_name):
+            return compute()
+    return run
+
+def load_dataset_event_stats(dataset_key):
+    """Get the per-event-type statistics sidecar of a dataset (None if missing or stale)."""
+    return get_dataset_entry(dataset_key).memo(
+        'event_stats',
+        lambda: load_event_stats(get_dataset_path(dataset_key))
+    )
+
+def load_dataset_event_sketches(dataset_key):
+    """Get the per-event-type quantile sketches of a dataset (None if missing or stale)."""
+    if LOADING_MODE == 'chunked':
+        return load_chunked_sketches(dataset_key)
+    return get_dataset_entry(dataset_key).memo(
+        'event_sketches',
+        lambda: load_event_sketches(get_dataset_path(dataset_key))
+    )
+
+def load_chunked_sketches(dataset_key):
+    """Get the quantile sketches of a dataset in chunked mode, streaming the log once if there is no sidecar."""
+    return get_dataset_entry(dataset_key).memo(
+        'event_sketches',
+        _timed('sketch', lambda: chunked_event_sketches(get_dataset_path(dataset_key), CHUNK_EVENTS))
+    )
+
+def _sketch_scope(dataset_key, metric, transformation, top_events):
+    """Get the sketches of the plotted event types in sketch quantile or chunked mode (None if not available)."""
+    if QUANTILE_MODE != 'sketch' and LOADING_MODE != 'chunked':
+        return None
+    event_sketches = load_dataset_event_sketches(dataset_key)
+    sketches = event_sketches.sketches(metric, transformation) if event_sketches is not None else None
+    if sketches is None or not all(name in sketches for name in top_events):
+        return None
+    return sketches
+
+def _top_event_types(event_names, num_events):
+    """Get the most frequent event types (unused categories never count)."""
+    counts = event_names.value_counts()
+    return counts[counts > 0].head(num_events).index.tolist()
+
 def load_dataset(dataset_key, num_events=6):
-    """Load and process a dataset by key."""
+    """Load and process a dataset by key (cached across callbacks, treat the frame as read-only)."""
     if dataset_key not in DATASETS:
         raise ValueError(f"Dataset {dataset_key} not found")
     
     dataset_info = DATASETS[dataset_key]
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'datasets', 'processed', dataset_info['file'])
     
     try:
-        df = pd.read_csv(data_path)
-        
-        # Filter out the first events (time_since_case_start = 0) for meaningful temporal insights
-        df_filtered = df[df['time_since_case_start'] > 0].copy()
+        entry = get_dataset_entry(dataset_key)
+        df_filtered = entry.df
         
         # Get top event types for filtering (from non-zero time events)
-        top_events = df_filtered['concept:name'].value_counts().head(num_events).index.tolist()
+        top_events = entry.memo(
+            ('top_events', num_events),
+            _timed('top_events', lambda: _top_event_types(df_filtered['concept:name'], num_events))
+        )
         
         return df_filtered, top_events, dataset_info
         
@@ -70,11 +164,204 @@ def load_dataset(dataset_key, num_events=6):
         print(f"Error loading dataset {dataset_key}: {e}")
         return None, None, None
 
+def _top_events_row_count(entry, top_events, num_events):
+    """Get the number of rows of the top N event types if they lead the frame (mapped datasets), else None."""
+    return entry.memo(('top_events_rows', num_events), lambda: leading_rows(entry.df, top_events))
+
+def load_top_events_frame(dataset_key, num_events=6):
+    """Load the rows of the top N event types of a dataset (cached, treat as read-only)."""
+    df_filtered, top_events, dataset_info = load_dataset(dataset_key, num_events)
+    if df_filtered is None:
+        return None, None, None
+    
+    entry = get_dataset_entry(dataset_key)
+    n_rows = _top_events_row_count(entry, top_events, num_events)
+    if n_rows is not None:
+        # Rows are grouped by frequency, so the selection is a view of the first rows
+        return df_filtered.iloc[:n_rows], top_events, dataset_info
+    
+    df_top = entry.memo(
+        ('top_events_frame', num_events),
+        _timed('select', lambda: df_filtered[df_filtered['concept:name'].isin(top_events)])
+    )
+    return df_top, top_events, dataset_info
+
+def load_transformed_time(dataset_key, transformation, num_events=6, metric=DEFAULT_METRIC):
+    """Get a transformed time measure of the top N event types' rows (computed once per dataset, measure and transformation)."""
+    df_top, top_events, _ = load_top_events_frame(dataset_key, num_events)
+    if df_top is None or metric not in df_top.columns:
+        return None
+    
+    entry = get_dataset_entry(dataset_key)
+    if not get_transformation(transformation)['elementwise']:
+        # Data-fitted transformations (e.g. min-max) depend on the selected rows
+        return entry.memo(
+            ('transformed', metric, transformation, num_events),
+            _timed('transform', lambda: apply_transformation(df_top[metric], transformation))
+        )
+    
+    # Transform the whole column once, then reuse it for every top-N selection
+    transformed = entry.memo(
+        ('transformed', metric, transformation),
+        _timed('transform', lambda: apply_transformation(entry.df[metric], transformation))
+    )
+    n_rows = _top_events_row_count(entry, top_events, num_events)
+    if n_rows is not None:
+        return transformed[:n_rows]
+    top_mask = entry.memo(
+        ('top_events_mask', num_events),
+        _timed('select', lambda: entry.df['concept:name'].isin(top_events).to_numpy())
+    )
+    return entry.memo(('transformed', metric, transformation, num_events), _timed('select', lambda: transformed[top_mask]))
+
+def load_sample_indices(dataset_key, num_events=6, metric=DEFAULT_METRIC):
+    """Get the stratified sample of the top N event types' rows for a time measure (None if sampling is off or not needed)."""
+    if SAMPLE_CAP <= 0 or LOADING_MODE == 'chunked':
+        return None
+    df_top, _, _ = load_top_events_frame(dataset_key, num_events)
+    if df_top is None or metric not in df_top.columns or len(df_top) <= SAMPLE_CAP:
+        return None
+    
+    # Deterministic, so one sample per dataset, selection and measure is enough
+    # (each measure keeps its own per-type min and max)
+    return get_dataset_entry(dataset_key).memo(
+        ('sample', metric, num_events),
+        _timed('sample', lambda: stratified_sample_indices(
+            df_top['concept:name'], df_top[metric], SAMPLE_CAP
+        ))
+    )
+
+def _data_version(entry):
+    """Short identifier of the files a dataset entry was loaded from (changes when they change)."""
+    return zlib.crc32(repr(entry.signature).encode('utf-8'))
+
+def _count_cases(case_names):
+    """Count the distinct cases of a case column (from the categorical codes when possible)."""
+    if not isinstance(case_names.dtype, pd.CategoricalDtype):
+        return int(case_names.nunique())
+    codes = case_names.array.codes
+    return int(np.count_nonzero(np.bincount(codes[codes >= 0], minlength=len(case_names.cat.categories))))
+
+def _dataset_counts(dataset_key):
+    """Measure the case and event counts of a dataset (whole log from the statistics sidecar if present)."""
+    entry = get_dataset_entry(dataset_key)
+    
+    def measure():
+        event_stats = load_dataset_event_stats(dataset_key)
+        if event_stats is not None:
+            return {'cases': event_stats['cases'], 'events': event_stats['events'], 'analysed_events': len(entry.df)}
+        # Without a statistics sidecar (streamed logs) the sketches still count every event
+        event_sketches = load_dataset_event_sketches(dataset_key)
+        cases = _count_cases(entry.df['case:concept:name']) if 'case:concept:name' in entry.df.columns else None
+        events = event_sketches.events if event_sketches is not None else None
+        return {'cases': cases, 'events': events, 'analysed_events': len(entry.df)}
+    
+    return entry.memo('counts', measure)
+
+def load_chunked_selection(dataset_key, num_events=6):
+    """
+    Prepare the top N event types of a dataset in chunked mode (see load_selection).
+    
+    Returns:
+        dict: Selection without a frame ('frame' is None), with the time measures
+            the log has under 'metrics', or None if the dataset could not be read
+    """
+    entry = get_dataset_entry(dataset_key)
+    
+    def prepare():
+        try:
+            sketches = load_chunked_sketches(dataset_key)
+        except Exception as e:
+            print(f"Error streaming dataset {dataset_key}: {e}")
+            return None
+        top_events = top_event_types(sketches, num_events)
+        shown_counts = sketches.shown_counts()
+        event_stats = load_dataset_event_stats(dataset_key)
+        return {
+            'handle': {'dataset': dataset_key, 'num_events': num_events, 'version': _data_version(entry)},
+            'frame': None,
+            'metrics': list(sketches.metrics),
+            'top_events': top_events,
+            'dataset_info': DATASETS[dataset_key],
+            'counts': {
+                'cases': event_stats['cases'] if event_stats is not None else None,
+                'events': sketches.events,
+                'analysed_events': sketches.shown_events,
+                'selected_events': sum(shown_counts[name] for name in top_events),
+            },
+        }
+    
+    return entry.memo(('selection', num_events), _timed('prepare', prepare))
+
+def load_selection(dataset_key, num_events=6):
+    """
+    Prepare the top N event types of a dataset once for all callbacks of an interaction.
+    
+    The result is cached with the dataset in DATASET_STORE. Callbacks pass
+    around its small 'handle' (through the selection-handle store) and look
+    the result up again with get_selection. In chunked loading mode the
+    selection holds no frame (see load_chunked_selection).
+    
+    Args:
+        dataset_key (str): Dataset key
+        num_events (int): Number of most frequent event types
+        
+    Returns:
+        dict: handle, frame (rows of the top N event types, read-only), top_events,
+            dataset_info and counts (cases, events, analysed_events, selected_events),
+            or None if the dataset could not be loaded
+    """
+    if LOADING_MODE == 'chunked':
+        return load_chunked_selection(dataset_key, num_events)
+    
+    df_top, top_events, dataset_info = load_top_events_frame(dataset_key, num_events)
+    if df_top is None:
+        return None
+    
+    entry = get_dataset_entry(dataset_key)
+    
+    def prepare():
+        counts = dict(_dataset_counts(dataset_key), selected_events=len(df_top))
+        return {
+            'handle': {'dataset': dataset_key, 'num_events': num_events, 'version': _data_version(entry)},
+            'frame': df_top,
+            'top_events': top_events,
+            'dataset_info': dataset_info,
+            'counts': counts,
+        }
+    
+    return entry.memo(('selection', num_events), _timed('prepare', prepare))
+
+def get_selection(handle):
+    """
+    Resolve a selection handle from the selection-handle store.
+    
+    Args:
+        handle (dict): Handle with 'dataset' and 'num_events'
+        
+    Returns:
+        dict: Selection (see load_selection), or None if the handle is invalid or the dataset failed to load
+    """
+    if not handle or handle.get('dataset') not in DATASETS or not isinstance(handle.get('num_events'), int):
+        return None
+    return load_selection(handle['dataset'], handle['num_events'])
+
 # Create Dash app
 app = dash.Dash(__name__, external_stylesheets=[
     'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css'
 ])
 
+# Prometheus /metrics route (only with PMVA_METRICS enabled)
+metrics.register_metrics_route(app.server)
+
+@app.server.route('/ready')
+def readiness():
+    """Readiness probe: 200 once the warm-up finished (or if it is off), 503 while datasets load or if every load failed."""
+    if DATASET_WARMER is None:
+        return jsonify({'ready': True, 'warmup': 'off'}), 200
+    state = DATASET_WARMER.snapshot()
+    return jsonify(state), (200 if state['ready'] and not state['failed'] else 503)
+
 # Add custom CSS
 app.index_string = '''
 <!DOCTYPE html>
@@ -358,6 +645,39 @@ app.layout = html.Div([
                 'marginBottom': '15px'
             }),
             
+            # Time measure selector (time since case start or inter-event time)
+            html.Div([
+                html.Div([
+                    html.I(className="fas fa-stopwatch", style={'marginRight': '8px', 'color': COLORS['secondary']}),
+                    html.Label(
+                        "Time Measure", 
+                        style={
+                            'fontWeight': '600', 
+                            'marginBottom': '10px',
+                            'color': COLORS['primary'],
+                            'fontSize': '0.9rem',
+                            'fontFamily': 'Inter, sans-serif'
+                        }
+                    )
+                ], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '10px'}),
+                dcc.Dropdown(
+                    id='metric-dropdown',
+                    options=[{'label': metric['label'], 'value': key} for key, metric in TIME_METRICS.items()],
+                    value=DEFAULT_METRIC,
+                    style={
+                        'fontFamily': 'Inter, sans-serif',
+                        'fontSize': '0.85rem'
+                    }
+                )
+            ], className="control-card", style={
+                'background': COLORS['card'],
+                'padding': '15px',
+                'borderRadius': '12px',
+                'boxShadow': '0 3px 15px rgba(0,0,0,0.08)',
+                'border': f'1px solid {COLORS["border"]}',
+                'marginBottom': '15px'
+            }),
+            
             # Time transformation toggle buttons
             html.Div([
                 html.Div([
@@ -378,7 +698,7 @@ app.layout = html.Div([
                 dcc.Dropdown(
                     id='transformation-dropdown',
                     options=get_transformation_options(),
-                    value='log_hours',
+                    value=DEFAULT_TRANSFORMATION,
                     style={
                         'fontFamily': 'Inter, sans-serif',
                         'fontSize': '0.85rem'
@@ -419,7 +739,7 @@ app.layout = html.Div([
                         {'label': '📈 25th Percentile', 'value': 'q1'},
                         {'label': '📈 75th Percentile', 'value': 'q3'}
                     ],
-                    value='frequency',
+                    value=DEFAULT_SORTING,
                     style={
                         'fontFamily': 'Inter, sans-serif',
                         'fontSize': '0.85rem'
@@ -457,7 +777,7 @@ app.layout = html.Div([
                         {'label': 'Top 8', 'value': 8},
                         {'label': 'Top 10', 'value': 10}
                     ],
-                    value=6,
+                    value=DEFAULT_NUM_EVENTS,
                     style={
                         'fontFamily': 'Inter, sans-serif',
                         'fontSize': '0.85rem'
@@ -487,7 +807,11 @@ app.layout = html.Div([
                         }
                     )
                 ], style={'display': 'flex', 'alignItems': 'center', 'marginBottom': '10px'}),
-                html.Div(id='dynamic-info-panel')
+                html.Div(id='dynamic-info-panel'),
+                # Refreshes the info panel while the selected dataset is warming up
+                dcc.Interval(id='warmup-poll', interval=1000, disabled=True),
+                # Reference to the prepared dataset selection (see load_selection)
+                dcc.Store(id='selection-handle')
             ], className="info-panel", style={
                 'background': f'linear-gradient(135deg, #e8f4fd 0%, #f8f9fa 100%)',
                 'padding': '15px',
@@ -507,6 +831,8 @@ app.layout = html.Div([
         
         # Main chart area - stretched to the right
         html.Div([
+            # What the browser's figure shows, so updates can be sent as partial figure patches
+            dcc.Store(id='violin-view'),
             dcc.Graph(
                 id='violin-plot',
                 className="chart-container",
@@ -534,17 +860,52 @@ app.layout = html.Div([
     'fontFamily': 'Inter, -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif'
 })
 
-# Callback to update dataset info display in sidebar
+# Callback preparing the selected dataset once per interaction; the other callbacks read its handle
 @app.callback(
-    Output('dynamic-info-panel', 'children'),
+    [Output('selection-handle', 'data'),
+     Output('warmup-poll', 'disabled')],
     [Input('dataset-dropdown', 'value'),
-     Input('num-events-dropdown', 'value')]
+     Input('num-events-dropdown', 'value'),
+     Input('warmup-poll', 'n_intervals')]
 )
-def update_dataset_info(selected_dataset, num_events):
+@metrics.instrument_callback
+def prepare_selection(selected_dataset, num_events, _poll=None):
+    handle = {'dataset': selected_dataset, 'num_events': num_events}
     if selected_dataset not in DATASETS:
+        return dict(handle, error=True), True
+    
+    # Report warm-up progress instead of waiting for the load; poll until it is done
+    if DATASET_WARMER is not None and DATASET_WARMER.is_loading(selected_dataset):
+        return dict(handle, loading=True), False
+    
+    selection = load_selection(selected_dataset, num_events)
+    if selection is None:
+        return dict(handle, error=True), True
+    return selection['handle'], True
+
+def _info_line(text, color=None):
+    """One line of the sidebar info panel."""
+    return html.P(text, style={
+        'margin': '3px 0', 
+        'fontSize': '0.75rem', 
+        'color': color or COLORS['text_light']
+    })
+
+# Callback to update dataset info display in sidebar
+@app.callback(
+    Output('dynamic-info-panel', 'children'),
+    [Input('selection-handle', 'data'),
+     Input('metric-dropdown', 'value')]
+)
+@metrics.instrument_callback
+def update_dataset_info(handle, metric=DEFAULT_METRIC):
+    if not handle:
+        return dash.no_update
+    if handle.get('error') or handle.get('dataset') not in DATASETS:
         return html.P("Error", style={'color': 'red'})
     
-    dataset_info = DATASETS[selected_dataset]
+    dataset_info = DATASETS[handle['dataset']]
+    num_events = handle['num_events']
     
     # Compact sidebar info panel
     sidebar_info = html.Div([
@@ -554,133 +915,428 @@ def update_dataset_info(selected_dataset, num_events):
             'color': COLORS['text'],
             'fontWeight': '600'
         }),
-        html.P(f"🏢 {dataset_info['domain']}", style={
-            'margin': '3px 0', 
-            'fontSize': '0.75rem', 
-            'color': COLORS['text_light']
-        }),
-        html.P(f"📊 {dataset_info['cases']} cases", style={
-            'margin': '3px 0', 
-            'fontSize': '0.75rem', 
-            'color': COLORS['text_light']
-        }),
-        html.P("🧹 Case-start events excluded", style={
-            'margin': '3px 0', 
-            'fontSize': '0.75rem', 
-            'color': COLORS['text']
-        }),
-        html.P(f"📈 Top {num_events} event types", style={
-            'margin': '3px 0', 
-            'fontSize': '0.75rem', 
-            'color': COLORS['text']
-        })
+        _info_line(f"🏢 {dataset_info['domain']}")
     ])
     
+    if handle.get('loading'):
+        sidebar_info.children.append(_info_line("⏳ Loading in the background...", COLORS['secondary']))
+        return sidebar_info
+    
+    selection = get_selection(handle)
+    if selection is None:
+        return html.P("Error", style={'color': 'red'})
+    
+    # Measured counts of the loaded data
+    counts = selection['counts']
+    if counts['cases'] is not None and counts['events'] is not None:
+        sidebar_info.children.append(_info_line(f"📊 {counts['cases']:,} cases · {counts['events']:,} events"))
+    elif counts['cases'] is not None:
+        sidebar_info.children.append(_info_line(f"📊 {counts['cases']:,} cases"))
+    sidebar_info.children.append(
+        _info_line(f"🧹 Events after excluding case starts: {counts['analysed_events']:,}", COLORS['text'])
+    )
+    share = counts['selected_events'] / max(counts['analysed_events'], 1)
+    sidebar_info.children.append(
+        _info_line(f"📈 Top {num_events} event types: {counts['selected_events']:,} events ({share:.0%})", COLORS['text'])
+    )
+    
+    # Report the sampling ratio when the plot shows a sample (each time measure has its own)
+    metric = metric if metric in TIME_METRICS else DEFAULT_METRIC
+    sample = load_sample_indices(handle['dataset'], num_events, metric)
+    if sample is not None:
+        sidebar_info.children.append(_info_line(
+            f"🎯 Sampled {len(sample):,} of {counts['selected_events']:,} events "
+            f"({len(sample) / counts['selected_events']:.1%})", COLORS['text']
+        ))
+    
     return sidebar_info
 
-# Callback to update the violin plot based on selected dataset, transformation, and sorting
-@app.callback(
-    Output('violin-plot', 'figure'),
-    [Input('dataset-dropdown', 'value'),
-     Input('transformation-dropdown', 'value'),
-     Input('sorting-dropdown', 'value'),
-     Input('num-events-dropdown', 'value')]
-)
-def update_violin_plot(selected_dataset, transformation, sorting, num_events):
-    # Load the selected dataset
-    df_filtered_time, top_events, dataset_info = load_dataset(selected_dataset, num_events)
+# Violin colors by number of event types (server-rendered violins use the first one)
+VIOLIN_COLORS = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#f1c40f', '#e67e22', '#1abc9c', '#34495e', '#95a5a6']
+
+def _unavailable_message(selection, metric, transformation):
+    """Explain why a selection cannot be drawn with a time measure and transformation (None if it can)."""
+    columns = selection['metrics'] if selection['frame'] is None else selection['frame'].columns
+    if metric not in columns:
+        # Processed before inter-event time was stored; reprocessing adds it
+        return f"{TIME_METRICS[metric]['title']} not available - reprocess the dataset"
+    if selection['frame'] is None and not get_transformation(transformation)['elementwise']:
+        # Data-fitted transformations need the whole selection at once
+        return f"{get_transformation(transformation)['label']} not available with chunked loading"
+    if selection['frame'] is None and _chunked_scope(selection, metric, transformation) is None:
+        # Sketches are built for the transformations registered when the sidecar was written
+        return f"{get_transformation(transformation)['label']} not sketched yet - reprocess the dataset"
+    return None
+
+def _chunked_scope(selection, metric, transformation):
+    """Get the sketches a chunked selection's violins are streamed against (None if not sketched)."""
+    dataset_key = selection['handle']['dataset']
+    try:
+        scope = load_chunked_sketches(dataset_key).sketches(metric, transformation)
+    except Exception as e:
+        print(f"Error loading sketches of {dataset_key}: {e}")
+        return None
+    if scope is None or not all(name in scope for name in selection['top_events']):
+        return None
+    return scope
+
+def _violin_plot_data(selection, transformation, metric=DEFAULT_METRIC):
+    """
+    Get the events a violin plot of a prepared selection draws (cached per selection, measure and transformation).
     
-    if df_filtered_time is None:
-        # Return empty figure if dataset loading fails
-        return px.scatter(title="Error loading dataset")
+    Args:
+        selection (dict): Prepared selection (see load_selection)
+        transformation (str): Transformation name
+        metric (str): Time measure column (see TIME_METRICS)
+        
+    Returns:
+        tuple: (read-only frame with concept:name and transformed_time, sampled flag),
+            or (None, False) for chunked selections, which hold no events
+    """
+    dataset_key, num_events = selection['handle']['dataset'], selection['handle']['num_events']
+    if selection['frame'] is None:
+        # The violins of chunked selections come from streamed aggregates (see _violin_summaries)
+        return None, False
     
-    # Filter to top N event types for better visualization
-    df_final = df_filtered_time[df_filtered_time['concept:name'].isin(top_events)].copy()
+    def build():
+        # Apply the selected transformation (cached per dataset, measure and transformation)
+        transformed_data = load_transformed_time(dataset_key, transformation, num_events, metric)
+        event_names = selection['frame']['concept:name'].array
+        
+        # Optionally draw a stratified sample (per-type min and max are kept exactly)
+        sample = load_sample_indices(dataset_key, num_events, metric)
+        if sample is not None:
+            event_names = event_names[sample]
+            transformed_data = transformed_data[sample]
+        
+        # A separate plotting frame over the cached arrays instead of mutating the cached one
+        plot_df = pd.DataFrame({
+            'concept:name': event_names,
+            'transformed_time': transformed_data
+        }, copy=False)
+        return plot_df, sample is not None
     
-    # Apply the selected transformation using the transformations module
-    transformed_data, x_title, plot_title = transform_time_data(
-        df_final['time_since_case_start'], 
-        transformation
+    return get_dataset_entry(dataset_key).memo(('plot_frame', metric, transformation, num_events), build)
+
+def _violin_event_order(selected_dataset, metric, transformation, sorting, top_events, plot_df):
+    """Get the display order of the event types for a sort option (first at the top)."""
+    event_stats = load_dataset_event_stats(selected_dataset)
+    scopes = metric_stats(event_stats, metric) if event_stats is not None else None
+    with metrics.stage('sort'):
+        if sorting == 'frequency':
+            # Sort by frequency (most common first); top_events is already in that order
+            return list(top_events)
+        if scopes is not None and all(
+            name in scopes['transformations'].get(transformation, {}) for name in top_events
+        ):
+            # Sort from the statistics sidecar written at processing time
+            stats = scopes['transformations'][transformation]
+            return sorted(top_events, key=lambda name: stats[name][sorting])
+        sketches = _sketch_scope(selected_dataset, metric, transformation, top_events)
+        if sketches is not None:
+            # Sort from the quantile sketches (approximate quartiles)
+            stats_df = load_dataset_event_sketches(selected_dataset).stats_frame(metric, transformation)
+            return stats_df.loc[list(top_events)].sort_values(sorting, kind='stable').index.tolist()
+        
+        # No sidecar: calculate statistics for each event type in one sort-based pass
+        stats_df = grouped_stats(plot_df['concept:name'], plot_df['transformed_time'])
+        
+        # Sort based on selected metric
+        return stats_df.sort_values(sorting, ascending=True).index.tolist()
+
+def _violin_summaries(selected_dataset, metric, transformation, num_events, plot_df):
+    """Get the densities, quartiles and whiskers of the plotted event types (cached per selection)."""
+    def compute():
+        top_events = load_selection(selected_dataset, num_events)['top_events']
+        if LOADING_MODE == 'chunked':
+            # One streaming pass over the log per selection, measure and transformation
+            return aggregate_violins(
+                get_dataset_path(selected_dataset), load_chunked_sketches(selected_dataset),
+                metric, transformation, top_events, CHUNK_EVENTS
+            )
+        sketches = _sketch_scope(selected_dataset, metric, transformation, top_events)
+        # In sketch mode the box quartiles come from the sketches instead of sorting every event type
+        quartiles = None if sketches is None else {
+            name: tuple(sketches[name].quantiles([0.25, 0.5, 0.75])) for name in top_events
+        }
+        return summarize_groups(plot_df['concept:name'], plot_df['transformed_time'], quartiles=quartiles)
+    
+    return get_dataset_entry(selected_dataset).memo(
+        ('violin_summaries', metric, transformation, num_events),
+        _timed('density', compute)
     )
-    df_final.loc[:, 'transformed_time'] = transformed_data
+
+def _violin_view(selected_dataset, metric, transformation, num_events, top_events, plot_df, sampled):
+    """
+    Describe a violin figure, so the next update can tell what the browser already shows.
+    
+    Returns:
+        dict: JSON-serializable description (stored in the violin-view store)
+    """
+    entry = get_dataset_entry(selected_dataset)
+    view = {
+        'dataset': selected_dataset,
+        'data_version': _data_version(entry),
+        'metric': metric,
+        'transformation': transformation,
+        'num_events': num_events,
+        'mode': VIOLIN_RENDER_MODE,
+        'sampled': sampled,
+    }
+    if VIOLIN_RENDER_MODE == 'server':
+        summaries = _violin_summaries(selected_dataset, metric, transformation, num_events, plot_df)
+        # Traces stay in frequency order whatever the sort order, so sorting only changes the layout
+        view['names'] = [name for name in top_events if name in summaries]
+        view['max_density'] = common_max_density(summaries, view['names'])
+    return view
+
+def _violin_figure(selected_dataset, metric, transformation, sorting, num_events, plot_df, top_events, dataset_info, view):
+    """Build the complete violin figure."""
+    plot_title = get_transformation(transformation)['plot_title']
+    x_title = get_axis_title(transformation, TIME_METRICS[metric]['title'])
     
     # Update plot title to include dataset name
     plot_title = f"{plot_title} - {dataset_info['name']}"
     
-    # Calculate statistics for sorting
-    if sorting == 'frequency':
-        # Sort by frequency (most common first)
-        event_order = df_final['concept:name'].value_counts().index.tolist()
+    event_order = _violin_event_order(selected_dataset, metric, transformation, sorting, top_events, plot_df)
+    
+    # Dynamic color sequence based on number of events
+    color_sequence = VIOLIN_COLORS[:num_events]
+    
+    if VIOLIN_RENDER_MODE == 'server':
+        # Densities, quartiles and whiskers computed here; payload independent of event count
+        summaries = _violin_summaries(selected_dataset, metric, transformation, num_events, plot_df)
+        with metrics.stage('figure'):
+            fig = build_violin_figure(summaries, event_order, color_sequence[0], trace_order=view['names'])
     else:
-        # Calculate statistics for each event type
-        stats_df = df_final.groupby('concept:name')['transformed_time'].agg([
-            'mean', 'median', 'min', 'max',
-            lambda x: x.quantile(0.25),  # Q1
-            lambda x: x.quantile(0.75)   # Q3
-        ]).reset_index()
+        # Create violin plot with custom ordering (plotly.express is only imported for this mode)
+        import plotly.express as px
+        with metrics.stage('figure'):
+            fig = px.violin(
+                plot_df, 
+                x='transformed_time', 
+                y='concept:name',
+                orientation='h',
+                box=True,
+                title=plot_title,
+                category_orders={'concept:name': event_order},
+                color_discrete_sequence=color_sequence
+            )
+    
+    with metrics.stage('layout'):
+        fig.update_layout(
+            title={
+                'text': plot_title,
+                'x': 0.5,
+                'xanchor': 'center',
+                'font': {'size': 18, 'color': COLORS['primary'], 'family': 'Inter, Arial, sans-serif'}
+            },
+            xaxis_title=x_title,
+            yaxis_title="Event Type",
+            font={'family': 'Inter, Arial, sans-serif', 'color': COLORS['text']},
+            plot_bgcolor='rgba(0,0,0,0)',
+            paper_bgcolor='rgba(0,0,0,0)',
+            margin={'t': 60, 'l': 200, 'r': 20, 'b': 60},
+            xaxis={
+                'gridcolor': '#f1f3f4',
+                'linecolor': '#bdc3c7',
+                'title_font': {'size': 12, 'color': COLORS['primary']},
+                'tickfont': {'color': COLORS['text'], 'size': 10}
+            },
+            yaxis={
+                'gridcolor': '#f1f3f4',
+                'linecolor': '#bdc3c7',
+                'title_font': {'size': 12, 'color': COLORS['primary']},
+                'tickfont': {'color': COLORS['text'], 'size': 10}
+            }
+        )
+    
+    return fig
+
+def _violin_patch(previous, view, selected_dataset, metric, transformation, sorting, num_events, plot_df, top_events):
+    """
+    Build a partial update of the figure the browser shows instead of a new figure.
+    
+    Sort changes only reorder the axes. Changing the number of event types
+    removes or appends violins, as long as the other violins stay the same
+    (elementwise transformation, no sampling) and the top event types only
+    grow or shrink at the end.
+    
+    Args:
+        previous (dict): View of the figure in the browser (None on first render)
+        view (dict): View of the requested figure
+        
+    Returns:
+        Patch: Partial figure update, or None if the figure has to be rebuilt
+    """
+    if not previous or any(
+        previous.get(key) != view[key] for key in ('dataset', 'data_version', 'metric', 'transformation', 'mode')
+    ):
+        return None
+    
+    resized = previous['num_events'] != num_events
+    if view['mode'] == 'client':
+        if resized:
+            return None
+        event_order = _violin_event_order(selected_dataset, metric, transformation, sorting, top_events, plot_df)
+        patch = Patch()
+        # px.violin lists horizontal categories from the bottom up
+        patch['layout']['yaxis']['categoryorder'] = 'array'
+        patch['layout']['yaxis']['categoryarray'] = event_order[::-1]
+        return patch
+    
+    old_names, names = previous['names'], view['names']
+    kept = min(len(old_names), len(names))
+    if resized and (
+        not get_transformation(transformation)['elementwise'] or previous['sampled'] or view['sampled']
+        or old_names[:kept] != names[:kept]
+    ):
+        return None
+    if not resized and old_names != names:
+        return None
+    
+    summaries = _violin_summaries(selected_dataset, metric, transformation, num_events, plot_df)
+    event_order = [name for name in _violin_event_order(
+        selected_dataset, metric, transformation, sorting, top_events, plot_df
+    ) if name in summaries]
+    
+    patch = Patch()
+    with metrics.stage('figure'):
+        # Three traces per violin: outline, box, outliers
+        for index in reversed(range(3 * len(names), 3 * len(old_names))):
+            del patch['data'][index]
+        for index in range(len(names), len(old_names)):
+            del patch['layout'][violin_axis(index)[0]]
+        # Encoded through a figure, so arrays are sent in the same compact form as full figures
+        traces = go.Figure(data=build_violin_traces(
+            summaries, names, VIOLIN_COLORS[0], view['max_density']
+        )).to_plotly_json()['data']
+        if len(names) > len(old_names):
+            patch['data'].extend(traces[3 * kept:])
         
-        stats_df.columns = ['concept:name', 'mean', 'median', 'min', 'max', 'q1', 'q3']
+        # Violins share one width scale, so kept outlines are redrawn if the widest violin changed
+        if view['max_density'] != previous['max_density']:
+            for index in range(kept):
+                patch['data'][3 * index]['y'] = traces[3 * index]['y']
         
-        # Sort based on selected metric
-        if sorting == 'mean':
-            stats_df = stats_df.sort_values('mean', ascending=True)
-        elif sorting == 'median':
-            stats_df = stats_df.sort_values('median', ascending=True)
-        elif sorting == 'min':
-            stats_df = stats_df.sort_values('min', ascending=True)
-        elif sorting == 'max':
-            stats_df = stats_df.sort_values('max', ascending=True)
-        elif sorting == 'q1':
-            stats_df = stats_df.sort_values('q1', ascending=True)
-        elif sorting == 'q3':
-            stats_df = stats_df.sort_values('q3', ascending=True)
+        # Reorder: tick labels and the position of each violin's overlay axis
+        layout = violin_axes_layout(names, event_order)
+        for key, value in layout['yaxis'].items():
+            patch['layout']['yaxis'][key] = value
+        for index in range(len(names)):
+            axis_key = violin_axis(index)[0]
+            if index < kept:
+                patch['layout'][axis_key]['range'] = layout[axis_key]['range']
+            else:
+                patch['layout'][axis_key] = layout[axis_key]
+    return patch
+
+def _message_figure(text):
+    """Build an empty figure that only shows a message as its title."""
+    return go.Figure(layout={'title': {'text': text}})
+
+def build_violin_plot(selected_dataset, transformation, sorting, num_events, metric=DEFAULT_METRIC):
+    """
+    Build the complete violin figure of a selection.
+    
+    Args:
+        selected_dataset (str): Dataset key
+        transformation (str): Transformation name
+        sorting (str): Sort option ('frequency', 'mean', 'median', 'min', 'max', 'q1', 'q3')
+        num_events (int): Number of most frequent event types
+        metric (str): Time measure column (see TIME_METRICS)
         
-        event_order = stats_df['concept:name'].tolist()
+    Returns:
+        go.Figure: Violin figure (a message figure if the dataset or measure could not be loaded)
+    """
+    selection = load_selection(selected_dataset, num_events)
+    if selection is None:
+        return _message_figure("Error loading dataset")
+    top_events, dataset_info = selection['top_events'], selection['dataset_info']
+    message = _unavailable_message(selection, metric, transformation)
+    if message is not None:
+        return _message_figure(message)
+    plot_df, sampled = _violin_plot_data(selection, transformation, metric)
+    view = _violin_view(selected_dataset, metric, transformation, num_events, top_events, plot_df, sampled)
+    return _violin_figure(
+        selected_dataset, metric, transformation, sorting, num_events, plot_df, top_events, dataset_info, view
+    )
+
+# Callback to update the violin plot based on the prepared selection, time measure, transformation, and sorting
+@app.callback(
+    [Output('violin-plot', 'figure'),
+     Output('violin-view', 'data')],
+    [Input('selection-handle', 'data'),
+     Input('metric-dropdown', 'value'),
+     Input('transformation-dropdown', 'value'),
+     Input('sorting-dropdown', 'value')],
+    [State('violin-view', 'data')]
+)
+@metrics.instrument_callback
+def update_violin_plot(handle, metric, transformation, sorting, previous_view=None):
+    # Keep the current figure while the selection is still loading
+    if not handle or handle.get('loading'):
+        return dash.no_update, dash.no_update
     
-    # Dynamic color sequence based on number of events
-    colors = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#f1c40f', '#e67e22', '#1abc9c', '#34495e', '#95a5a6']
-    color_sequence = colors[:num_events]
-    
-    # Create violin plot with custom ordering
-    fig = px.violin(
-        df_final, 
-        x='transformed_time', 
-        y='concept:name',
-        orientation='h',
-        box=True,
-        title=plot_title,
-        category_orders={'concept:name': event_order},
-        color_discrete_sequence=color_sequence
+    selection = None if handle.get('error') else get_selection(handle)
+    if selection is None:
+        # Return empty figure if dataset loading fails
+        return _message_figure("Error loading dataset"), None
+    
+    # Both measures are columns of the loaded selection, so switching only selects another array
+    metric = metric if metric in TIME_METRICS else DEFAULT_METRIC
+    selected_dataset, num_events = handle['dataset'], handle['num_events']
+    top_events, dataset_info = selection['top_events'], selection['dataset_info']
+    message = _unavailable_message(selection, metric, transformation)
+    if message is not None:
+        return _message_figure(message), None
+    plot_df, sampled = _violin_plot_data(selection, transformation, metric)
+    
+    # Sort-only and event-count changes are sent as small partial updates when possible
+    view = _violin_view(selected_dataset, metric, transformation, num_events, top_events, plot_df, sampled)
+    patch = _violin_patch(
+        previous_view, view, selected_dataset, metric, transformation, sorting, num_events, plot_df, top_events
     )
+    if patch is not None:
+        return patch, view
     
-    fig.update_layout(
-        title={
-            'text': plot_title,
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 18, 'color': COLORS['primary'], 'family': 'Inter, Arial, sans-serif'}
-        },
-        xaxis_title=x_title,
-        yaxis_title="Event Type",
-        font={'family': 'Inter, Arial, sans-serif', 'color': COLORS['text']},
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        margin={'t': 60, 'l': 200, 'r': 20, 'b': 60},
-        xaxis={
-            'gridcolor': '#f1f3f4',
-            'linecolor': '#bdc3c7',
-            'title_font': {'size': 12, 'color': COLORS['primary']},
-            'tickfont': {'color': COLORS['text'], 'size': 10}
-        },
-        yaxis={
-            'gridcolor': '#f1f3f4',
-            'linecolor': '#bdc3c7',
-            'title_font': {'size': 12, 'color': COLORS['primary']},
-            'tickfont': {'color': COLORS['text'], 'size': 10}
-        }
+    fig = _violin_figure(
+        selected_dataset, metric, transformation, sorting, num_events, plot_df, top_events, dataset_info, view
     )
+    return fig, view
+
+def _warm_dataset(dataset_key):
+    """Load a dataset and prepare the default view, so the first request finds it cached."""
+    if load_selection(dataset_key, DEFAULT_NUM_EVENTS) is None:
+        return False
+    build_violin_plot(dataset_key, DEFAULT_TRANSFORMATION, DEFAULT_SORTING, DEFAULT_NUM_EVENTS)
+    return True
+
+def start_warmup(wait=False):
+    """
+    Load and prepare every configured dataset concurrently in background threads.
     
-    return fig
+    Args:
+        wait (bool): Block until all datasets are loaded
+        
+    Returns:
+        DatasetWarmer: Warm-up state (also served by /ready)
+    """
+    global DATASET_WARMER
+    if DATASET_WARMER is None:
+        print(f"🔥 Warming up {len(DATASETS)} datasets in the background...")
+        DATASET_WARMER = DatasetWarmer(
+            {key: (lambda key=key: _warm_dataset(key)) for key in DATASETS}
+        ).start()
+    if wait:
+        DATASET_WARMER.wait()
+    return DATASET_WARMER
+
+def is_serving_process(debug):
+    """Check whether this process serves requests (the debug reloader's parent only watches files)."""
+    return not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
 
 if __name__ == '__main__':
+    if WARMUP_MODE and is_serving_process(debug=True):
+        start_warmup(wait=WARMUP_MODE == 'blocking')
     app.run(debug=True)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Out-of-Core Chunked Loading and Aggregation
+
+This module builds the per-event-type violin summaries the dashboard draws
+without loading the processed log into memory. The log is streamed from
+the Parquet copy (one record batch at a time) or the CSV (chunked reader),
+and only fixed-size aggregates are kept, so peak memory depends on the
+chunk size and the number of event types, not on the number of events.
+
+Two passes over the log:
+1. Quantile sketches per event type (data_processing/event_sketches.py).
+   The sidecar written at processing time is used when it is up to date;
+   otherwise it is built from the chunks and saved. Its exact counts give
+   the top-N event types, and its exact min, max, std and approximate
+   quartiles fix the box, density grid and bandwidth of every violin.
+2. Chunks filtered on the fly (time_since_case_start > 0, top-N event
+   types) feed one ViolinAccumulator per event type (linear-binned
+   density counts, whisker ends, outliers).
+
+Tolerances against the in-memory path (summarize_groups over the loaded
+log): counts, means, min/max and the grid are equal up to float rounding;
+quartiles carry the sketch's rank error (below 1%, see
+utils/quantile_sketch.py), and the bandwidth, whisker ends and densities
+follow from them. Only elementwise transformations can be streamed;
+data-fitted ones (min-max) depend on the whole selection.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    from utils.transformations import apply_transformation, get_transformation
+    from utils.violin_density import DENSITY_POINTS, ViolinAccumulator
+except ImportError:  # executed as a script
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from utils.transformations import apply_transformation, get_transformation
+    from utils.violin_density import DENSITY_POINTS, ViolinAccumulator
+
+try:
+    from .event_sketches import EventTypeSketches, load_event_sketches, save_event_sketches
+    from .storage import EVENT_COLUMN, HOURS_COLUMN, TIME_COLUMNS, iter_compact_chunks
+except ImportError:  # executed as a script
+    from event_sketches import EventTypeSketches, load_event_sketches, save_event_sketches
+    from storage import EVENT_COLUMN, HOURS_COLUMN, TIME_COLUMNS, iter_compact_chunks
+
+# Default number of events per chunk
+DEFAULT_CHUNK_EVENTS = 1_000_000
+
+# Columns read from the log (case names are not needed for the aggregates)
+CHUNK_COLUMNS = [EVENT_COLUMN] + TIME_COLUMNS
+
+
+def chunked_event_sketches(csv_path, chunk_events=DEFAULT_CHUNK_EVENTS):
+    """
+    Get the quantile sketches of a processed log, building them chunk by chunk if needed.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+        chunk_events (int): Events per chunk
+
+    Returns:
+        EventTypeSketches: Sketches of every event (the sidecar is written when built)
+    """
+    sketches = load_event_sketches(csv_path)
+    if sketches is not None:
+        return sketches
+
+    start = time.perf_counter()
+    sketches = EventTypeSketches()
+    for chunk in iter_compact_chunks(csv_path, CHUNK_COLUMNS, chunk_events):
+        sketches.update(chunk)
+    print(f"   Sketched {sketches.events:,} events in {time.perf_counter() - start:.1f}s")
+    save_event_sketches(sketches, csv_path)
+    return sketches
+
+
+def top_event_types(sketches, num_events):
+    """
+    Get the most frequent event types among the events the dashboard shows.
+
+    Args:
+        sketches (EventTypeSketches): Sketches of the log
+        num_events (int): Number of event types
+
+    Returns:
+        list: Event type names, most frequent first
+    """
+    counts = pd.Series(sketches.shown_counts(), dtype='int64')
+    return counts[counts > 0].sort_values(ascending=False, kind='stable').head(num_events).index.tolist()
+
+
+def aggregate_violins(csv_path, sketches, metric, transformation, top_events,
+                      chunk_events=DEFAULT_CHUNK_EVENTS, n_points=DENSITY_POINTS):
+    """
+    Compute the violin summaries of the top event types in one pass over the log.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+        sketches (EventTypeSketches): Sketches of the log (see chunked_event_sketches)
+        metric (str): Time measure column
+        transformation (str): Elementwise transformation name
+        top_events (list): Event types to summarize
+        chunk_events (int): Events per chunk
+        n_points (int): Number of density points
+
+    Returns:
+        dict: Event type -> summary in the layout of summarize_violin
+    """
+    if not get_transformation(transformation)['elementwise']:
+        raise ValueError(f"{transformation} is fitted to the whole selection and cannot be streamed")
+    scope = sketches.sketches(metric, transformation)
+    if scope is None:
+        raise ValueError(f"no sketches for {metric} / {transformation}")
+
+    accumulators = {name: ViolinAccumulator(scope[name], n_points) for name in top_events if name in scope}
+    top = list(accumulators)
+    for chunk in iter_compact_chunks(csv_path, [EVENT_COLUMN, HOURS_COLUMN, metric], chunk_events):
+        # Same filter as the in-memory load: no case-start events, only the top event types
+        keep = (chunk[HOURS_COLUMN].to_numpy() > 0) & chunk[EVENT_COLUMN].isin(top).to_numpy()
+        if not keep.any():
+            continue
+        values = apply_transformation(chunk[metric].to_numpy(dtype=np.float64)[keep], transformation)
+        codes, labels = pd.factorize(chunk[EVENT_COLUMN].to_numpy()[keep])
+        order = np.argsort(codes, kind='stable')
+        bounds = np.r_[0, np.cumsum(np.bincount(codes, minlength=len(labels)))]
+        sorted_values = values[order]
+        for i, label in enumerate(labels):
+            accumulators[label].update(sorted_values[bounds[i]:bounds[i + 1]])
+
+    return {name: accumulator.summary() for name, accumulator in accumulators.items()}
@@ -4,64 +4,214 @@
 XES to CSV Data Processing Module
 
 This module provides functions to convert XES event logs to CSV format
-with time-since-case-start calculations for process mining analysis.
+with time-since-case-start and inter-event time calculations for process
+mining analysis.
+A typed columnar copy (Parquet) and memory-mapped dashboard columns are
+written next to each CSV for fast loading.
 """
 
-import pm4py
 import pandas as pd
 import os
+import io
+import sys
+import contextlib
 from pathlib import Path
 
-def process_xes_to_csv(xes_path, csv_path):
+try:
+    from .event_sketches import sketches_path_for, write_event_sketches
+    from .event_stats import stats_path_for, write_event_stats
+    from .manifest import ProcessingManifest, input_state
+    from .mapped_log import mapped_meta_path_for, write_mapped_log
+    from .storage import COLUMNAR_AVAILABLE, columnar_path_for, write_columnar
+    from .time_features import add_time_features
+    from .worker_pool import run_in_workers
+    from .xes_stream import stream_xes_to_csv
+except ImportError:  # executed as a script
+    from event_sketches import sketches_path_for, write_event_sketches
+    from event_stats import stats_path_for, write_event_stats
+    from manifest import ProcessingManifest, input_state
+    from mapped_log import mapped_meta_path_for, write_mapped_log
+    from storage import COLUMNAR_AVAILABLE, columnar_path_for, write_columnar
+    from time_features import add_time_features
+    from worker_pool import run_in_workers
+    from xes_stream import stream_xes_to_csv
+
+try:
+    from utils import metrics
+except ImportError:  # executed as a script
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from utils import metrics
+
+# Bump whenever the processed output changes, so the manifest reprocesses all inputs
+PIPELINE_VERSION = '2.5.0'
+
+def process_xes_to_csv(xes_path, csv_path, streaming=False):
     """
     Convert XES event log to CSV with time calculations.
     
     Args:
         xes_path (str): Path to input XES file
         csv_path (str): Path to output CSV file
+        streaming (bool): Parse trace by trace with bounded memory instead of
+            loading the whole log through pm4py (see xes_stream.py)
         
     Returns:
         bool: True if successful, False otherwise
     """
+    with metrics.collect_stages() as timings:
+        if streaming:
+            with metrics.stage('process.stream_xes'):
+                success = stream_xes_to_csv(xes_path, csv_path)
+        else:
+            success = _convert_xes_in_memory(xes_path, csv_path)
+    
+    if metrics.ENABLED and timings:
+        print(f"   Stage timings: {metrics.format_stages(timings)}")
+    return success
+
+def _convert_xes_in_memory(xes_path, csv_path):
+    """Load an XES log completely through pm4py and write the processed outputs."""
     try:
+        # pm4py takes seconds to import, so only load it when a conversion runs
+        import pm4py
+        
         print(f"   Loading XES file: {xes_path}")
         
         # Load XES log
-        log = pm4py.read_xes(xes_path)
+        with metrics.stage('process.read_xes'):
+            log = pm4py.read_xes(xes_path)
         print(f"   Loaded {len(log)} cases")
         
         # Convert to DataFrame  
-        df = pm4py.convert_to_dataframe(log)
+        with metrics.stage('process.to_dataframe'):
+            df = pm4py.convert_to_dataframe(log)
         print(f"   Converted to DataFrame: {len(df)} events")
         
-        # Calculate time since case start (in hours)
-        df['time_since_case_start'] = df.groupby('case:concept:name')['time:timestamp'].transform(
-            lambda x: (x - x.min()).dt.total_seconds() / 3600
-        )
-        
-        # Sort by case and timestamp for consistency
-        df = df.sort_values(['case:concept:name', 'time:timestamp'])
+        # Sort by case and timestamp, then calculate time since case start and since the previous event (in hours)
+        with metrics.stage('process.time_features'):
+            df = add_time_features(df)
         
         # Save to CSV
-        df.to_csv(csv_path, index=False)
+        with metrics.stage('process.write_csv'):
+            df.to_csv(csv_path, index=False)
         print(f"   Saved to: {csv_path}")
         
+        # Save typed columnar copy for fast dashboard loads
+        with metrics.stage('process.write_columnar'):
+            write_columnar(df, csv_path)
+        
+        # Save memory-mapped dashboard columns, shared by all dashboard workers
+        with metrics.stage('process.write_mapped'):
+            write_mapped_log(df, csv_path)
+        
+        # Save per-event-type statistics used for sorting and reports
+        with metrics.stage('process.write_stats'):
+            write_event_stats(df, csv_path)
+        
+        # Save mergeable per-event-type quantile sketches
+        with metrics.stage('process.write_sketches'):
+            write_event_sketches(df, csv_path)
+        
         return True
         
     except Exception as e:
         print(f"   Error processing {xes_path}: {e}")
         return False
 
-def batch_process_directory(raw_dir, processed_dir):
+def processed_csv_name(xes_file):
+    """
+    Get the processed CSV file name for an XES file.
+    
+    Args:
+        xes_file (Path): Input XES file
+        
+    Returns:
+        str: Output CSV file name
+    """
+    return f"processed_{Path(xes_file).stem.lower().replace(' ', '_').replace('-', '_')}.csv"
+
+def expected_outputs(csv_path, streaming=False):
+    """
+    Get the files a conversion writes for one input.
+    
+    Args:
+        csv_path (str): Output CSV file
+        streaming (bool): Streaming conversion (writes no statistics sidecar)
+        
+    Returns:
+        list: Paths of the CSV, Parquet copy, sidecars and mapped metadata file
+    """
+    outputs = [csv_path, sketches_path_for(csv_path), mapped_meta_path_for(csv_path)]
+    if COLUMNAR_AVAILABLE:
+        outputs.append(columnar_path_for(csv_path))
+    if not streaming:
+        outputs.append(stats_path_for(csv_path))
+    return outputs
+
+def _missing_outputs(outputs):
+    """Get the outputs that were not written (missing, or older than the CSV written first)."""
+    written_after = os.path.getmtime(outputs[0]) if os.path.exists(outputs[0]) else None
+    return [
+        output for output in outputs
+        if written_after is None or not os.path.exists(output) or os.path.getmtime(output) < written_after
+    ]
+
+def _process_file(xes_path, csv_path, streaming=False):
+    """
+    Convert one XES file and check its outputs, printing as it goes.
+    
+    The input is hashed here too, so with worker processes the parent does
+    not hash every file serially.
+    
+    Returns:
+        tuple: (success, input_state of the converted input or None if the
+            conversion failed or an output is missing)
+    """
+    try:
+        state = input_state(xes_path)
+        success = process_xes_to_csv(xes_path, csv_path, streaming=streaming)
+        missing = _missing_outputs(expected_outputs(csv_path, streaming)) if success else []
+        if missing:
+            # The CSV is usable, but the file is converted again on the next run
+            print(f"   ⚠️  Not written: {', '.join(os.path.basename(path) for path in missing)}")
+            state = None
+    except Exception as e:
+        print(f"   Error processing {xes_path}: {e}")
+        success, state = False, None
+    return success, state if success else None
+
+def _process_file_captured(xes_path, csv_path, streaming=False):
+    """
+    Convert one XES file while capturing its log output.
+    
+    Used as the process pool task so that per-file logs can be printed
+    as one block instead of interleaving between workers.
+    
+    Returns:
+        tuple: (success, captured_log, input_state as in _process_file)
+    """
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        success, state = _process_file(xes_path, csv_path, streaming)
+    return success, buffer.getvalue(), state
+
+def batch_process_directory(raw_dir, processed_dir, streaming=False, jobs=1, force=False):
     """
     Process all XES files in a directory.
     
+    Inputs whose content and pipeline version match the manifest in
+    `processed_dir` are skipped unless `force` is set.
+    
     Args:
         raw_dir (str): Directory containing XES files
         processed_dir (str): Directory for output CSV files
+        streaming (bool): Use the bounded-memory streaming parser
+        jobs (int): Number of files converted in parallel worker processes
+            (1 converts in this process, 0 uses one worker per CPU)
+        force (bool): Reconvert every file even if it is up to date
         
     Returns:
-        list: List of successfully processed files
+        list: List of successfully processed (or already up-to-date) files
     """
     raw_path = Path(raw_dir)
     processed_path = Path(processed_dir)
@@ -69,17 +219,59 @@ def batch_process_directory(raw_dir, processed_dir):
     # Create output directory
     processed_path.mkdir(parents=True, exist_ok=True)
     
-    # Find XES files
-    xes_files = list(raw_path.glob("*.xes"))
+    # Find XES files and their output paths
+    xes_files = sorted(raw_path.glob("*.xes"))
+    tasks = {str(xes_file): str(processed_path / processed_csv_name(xes_file)) for xes_file in xes_files}
     successful = []
+    failed = []
     
-    for xes_file in xes_files:
-        # Generate output filename
-        csv_name = f"processed_{xes_file.stem.lower().replace(' ', '_').replace('-', '_')}.csv"
-        csv_path = processed_path / csv_name
-        
-        if process_xes_to_csv(str(xes_file), str(csv_path)):
-            successful.append(csv_name)
+    # Skip inputs that are unchanged since the last run of this pipeline version
+    manifest = ProcessingManifest(processed_path, PIPELINE_VERSION)
+    if not force:
+        for xes_path, csv_path in list(tasks.items()):
+            if manifest.is_up_to_date(xes_path, csv_path, expected_outputs(csv_path, streaming)):
+                print(f"⏭️  Up to date: {Path(xes_path).name}")
+                successful.append(Path(csv_path).name)
+                del tasks[xes_path]
+    
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(tasks)))
+    
+    def record(xes_path, success, state):
+        if success:
+            successful.append(Path(tasks[xes_path]).name)
+            if state is not None:
+                manifest.record(xes_path, tasks[xes_path], expected_outputs(tasks[xes_path], streaming), state)
+            else:
+                manifest.forget(xes_path)
+        else:
+            failed.append(Path(xes_path).name)
+            manifest.forget(xes_path)
+    
+    if jobs == 1:
+        # One file at a time in this process: progress is printed live
+        for xes_path, csv_path in tasks.items():
+            print(f"📄 {Path(xes_path).name}")
+            record(xes_path, *_process_file(xes_path, csv_path, streaming))
+    else:
+        print(f"Converting {len(tasks)} files with {jobs} worker processes...")
+        # A crashed worker breaks the pool; its unfinished files are rerun one at a time
+        pool_tasks = {xes_path: (xes_path, csv_path, streaming) for xes_path, csv_path in tasks.items()}
+        for xes_path, result, error in run_in_workers(_process_file_captured, pool_tasks, jobs):
+            success, log, state = result if error is None else (False, f"   Worker failed: {error!r}\n", None)
+            # Each file's log is printed as one block once the file is done
+            print(f"📄 {Path(xes_path).name}")
+            if log:
+                print(log, end='' if log.endswith('\n') else '\n')
+            record(xes_path, success, state)
+    
+    manifest.save()
+    
+    if failed:
+        print(f"Failed to process {len(failed)} files:")
+        for filename in failed:
+            print(f"   • {filename}")
     
     return successful
 
@@ -92,8 +284,8 @@ if __name__ == "__main__":
     raw_dir = base_dir / "datasets" / "raw"
     processed_dir = base_dir / "datasets" / "processed"
     
-    # Process all files
-    successful = batch_process_directory(str(raw_dir), str(processed_dir))
+    # Process all files (one worker per CPU)
+    successful = batch_process_directory(str(raw_dir), str(processed_dir), jobs=0)
     
     print(f"Successfully processed {len(successful)} files:")
     for filename in successful:
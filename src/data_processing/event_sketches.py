@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-Event-Type Quantile Sketch Sidecar
+
+This module keeps one KLL quantile sketch (utils/quantile_sketch.py) per
+time measure, scope and event type, built chunk by chunk while a log is
+processed, and stores them in a JSON sidecar next to the processed CSV
+(`processed_*.sketches.json`). Unlike the exact statistics sidecar
+(event_stats.py), building it never needs the whole log in memory, and
+sketches of several chunks, files or datasets merge into one.
+
+The layout mirrors the statistics sidecar, per time measure column:
+- 'all_events': raw hours over every event
+- 'transformations': every elementwise transformation over the events the
+  dashboard shows (time_since_case_start > 0); data-fitted ones such as
+  min-max depend on the whole selection and have no sketch
+
+Counts, min, max, mean and std taken from sketches are exact; quartiles have
+the rank error documented in utils/quantile_sketch.py (below 1% for the
+default k = 200).
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    from utils.quantile_sketch import DEFAULT_K, KLLSketch
+    from utils.transformations import apply_transformation, get_transformation, get_transformation_options
+except ImportError:  # executed as a script
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from utils.quantile_sketch import DEFAULT_K, KLLSketch
+    from utils.transformations import apply_transformation, get_transformation, get_transformation_options
+
+try:
+    from .event_stats import STAT_NAMES
+    from .storage import EVENT_COLUMN, HOURS_COLUMN, TIME_COLUMNS
+except ImportError:  # executed as a script
+    from event_stats import STAT_NAMES
+    from storage import EVENT_COLUMN, HOURS_COLUMN, TIME_COLUMNS
+
+SKETCHES_SUFFIX = '.sketches.json'
+
+
+def sketches_path_for(csv_path):
+    """
+    Get the sketch sidecar path that belongs to a processed CSV file.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+
+    Returns:
+        str: Path of the matching sketch file
+    """
+    return os.path.splitext(str(csv_path))[0] + SKETCHES_SUFFIX
+
+
+def sketched_transformations():
+    """Get the names of the transformations that are sketched (the elementwise ones)."""
+    return [option['value'] for option in get_transformation_options()
+            if get_transformation(option['value'])['elementwise']]
+
+
+def _groups(event_names):
+    """Group rows by event type: (labels, row order, group bounds) for slicing sorted rows."""
+    codes, labels = pd.factorize(pd.Series(event_names), sort=False)
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    # Rows without an event type (code -1) sort first and are skipped
+    start = int(np.count_nonzero(codes < 0))
+    bounds = start + np.r_[0, np.cumsum(counts)]
+    return [str(label) for label in labels], order, bounds
+
+
+class EventTypeSketches:
+    """
+    Quantile sketches per time measure, scope and event type.
+
+    Args:
+        k (int): Accuracy parameter of every sketch
+    """
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = int(k)
+        self.events = 0
+        self.shown_events = 0
+        # metric -> {'all_events': {event: sketch}, 'transformations': {name: {event: sketch}}}
+        self.metrics = {}
+
+    def _update_group_sketches(self, sketches, labels, order, bounds, values):
+        sorted_values = values[order]
+        for i, label in enumerate(labels):
+            if bounds[i + 1] > bounds[i]:
+                sketch = sketches.get(label)
+                if sketch is None:
+                    sketch = sketches[label] = KLLSketch(self.k)
+                sketch.update(sorted_values[bounds[i]:bounds[i + 1]])
+
+    def update(self, df):
+        """
+        Add a chunk of a processed log (whole cases or not; every event counts once).
+
+        Args:
+            df (pd.DataFrame): Events with concept:name and time measure columns
+
+        Returns:
+            EventTypeSketches: self
+        """
+        hours = df[HOURS_COLUMN].to_numpy(dtype=np.float64)
+        shown = hours > 0
+        self.events += len(df)
+        self.shown_events += int(shown.sum())
+
+        labels, order, bounds = _groups(df[EVENT_COLUMN])
+        shown_labels, shown_order, shown_bounds = _groups(df[EVENT_COLUMN].to_numpy()[shown])
+        for metric in TIME_COLUMNS:
+            if metric not in df.columns:
+                continue
+            values = df[metric].to_numpy(dtype=np.float64)
+            scopes = self.metrics.setdefault(metric, {'all_events': {}, 'transformations': {}})
+            self._update_group_sketches(scopes['all_events'], labels, order, bounds, values)
+            for name in sketched_transformations():
+                self._update_group_sketches(
+                    scopes['transformations'].setdefault(name, {}),
+                    shown_labels, shown_order, shown_bounds, apply_transformation(values[shown], name)
+                )
+        return self
+
+    def merge(self, other):
+        """
+        Add the sketches of another log, chunk or file.
+
+        Args:
+            other (EventTypeSketches): Sketches with the same k
+
+        Returns:
+            EventTypeSketches: self
+        """
+        self.events += other.events
+        self.shown_events += other.shown_events
+        for metric, other_scopes in other.metrics.items():
+            scopes = self.metrics.setdefault(metric, {'all_events': {}, 'transformations': {}})
+            groups = [(scopes['all_events'], other_scopes['all_events'])] + [
+                (scopes['transformations'].setdefault(name, {}), sketches)
+                for name, sketches in other_scopes['transformations'].items()
+            ]
+            for target, source in groups:
+                for label, sketch in source.items():
+                    if label in target:
+                        target[label].merge(sketch)
+                    else:
+                        target[label] = KLLSketch.from_dict(sketch.to_dict())
+        return self
+
+    def sketches(self, metric=HOURS_COLUMN, transformation=None):
+        """
+        Get the sketches of one scope.
+
+        Args:
+            metric (str): Time measure column
+            transformation (str): Transformation name, or None for raw hours over all events
+
+        Returns:
+            dict: Event type -> KLLSketch, or None if the scope was not sketched
+        """
+        scopes = self.metrics.get(metric)
+        if scopes is None:
+            return None
+        if transformation is None:
+            return scopes['all_events']
+        return scopes['transformations'].get(transformation)
+
+    def shown_counts(self):
+        """
+        Count the events the dashboard shows (time_since_case_start > 0) per event type.
+
+        Returns:
+            dict: Event type -> exact count
+        """
+        scopes = self.metrics.get(HOURS_COLUMN, {'transformations': {}})['transformations']
+        sketches = next(iter(scopes.values()), {})
+        return {label: sketch.n for label, sketch in sketches.items()}
+
+    def stats_frame(self, metric=HOURS_COLUMN, transformation=None):
+        """
+        Get the statistics of one scope in the layout of event_stats.event_stats_frame.
+
+        Args:
+            metric (str): Time measure column
+            transformation (str): Transformation name, or None for raw hours over all events
+
+        Returns:
+            pd.DataFrame: One row per event type with STAT_NAMES (quartiles
+                approximate), or None if the scope was not sketched
+        """
+        sketches = self.sketches(metric, transformation)
+        if sketches is None:
+            return None
+        rows = {}
+        for label, sketch in sketches.items():
+            q1, median, q3 = sketch.quantiles([0.25, 0.5, 0.75])
+            rows[label] = {
+                'count': sketch.n, 'mean': sketch.mean, 'std': sketch.std, 'min': sketch.min,
+                'q1': q1, 'median': median, 'q3': q3, 'max': sketch.max,
+            }
+        frame = pd.DataFrame.from_dict(rows, orient='index', columns=STAT_NAMES)
+        frame.index.name = EVENT_COLUMN
+        return frame
+
+    def to_dict(self):
+        """Serialize all sketches (JSON-safe)."""
+        return {
+            'k': self.k,
+            'events': self.events,
+            'shown_events': self.shown_events,
+            'filter': f'{HOURS_COLUMN} > 0',
+            'metrics': {
+                metric: {
+                    'all_events': {label: sketch.to_dict() for label, sketch in scopes['all_events'].items()},
+                    'transformations': {
+                        name: {label: sketch.to_dict() for label, sketch in sketches.items()}
+                        for name, sketches in scopes['transformations'].items()
+                    },
+                }
+                for metric, scopes in self.metrics.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore sketches serialized with to_dict."""
+        sketches = cls(data['k'])
+        sketches.events = data['events']
+        sketches.shown_events = data['shown_events']
+        for metric, scopes in data['metrics'].items():
+            sketches.metrics[metric] = {
+                'all_events': {label: KLLSketch.from_dict(item) for label, item in scopes['all_events'].items()},
+                'transformations': {
+                    name: {label: KLLSketch.from_dict(item) for label, item in items.items()}
+                    for name, items in scopes['transformations'].items()
+                },
+            }
+        return sketches
+
+
+def save_event_sketches(sketches, csv_path):
+    """
+    Write the sketch sidecar of a processed CSV.
+
+    Args:
+        sketches (EventTypeSketches): Sketches of the whole log
+        csv_path (str): Path of the CSV file written for the same log
+
+    Returns:
+        str: Path of the written sidecar, or None if it failed
+    """
+    path = sketches_path_for(csv_path)
+    try:
+        data = sketches.to_dict()
+        data['source'] = os.path.basename(str(csv_path))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        print(f"   Saved quantile sketches to: {path}")
+        return path
+    except Exception as e:
+        print(f"   Could not write quantile sketches {path}: {e}")
+        return None
+
+
+def write_event_sketches(df, csv_path):
+    """
+    Sketch a processed log that is in memory and write the sidecar.
+
+    Args:
+        df (pd.DataFrame): Processed event log
+        csv_path (str): Path of the CSV file written for the same log
+
+    Returns:
+        str: Path of the written sidecar, or None if it failed
+    """
+    try:
+        sketches = EventTypeSketches().update(df)
+    except Exception as e:
+        print(f"   Could not build quantile sketches for {csv_path}: {e}")
+        return None
+    return save_event_sketches(sketches, csv_path)
+
+
+def load_event_sketches(csv_path):
+    """
+    Load the sketch sidecar of a processed CSV if it is up to date.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+
+    Returns:
+        EventTypeSketches: Sketches, or None if missing or older than the CSV
+    """
+    path = sketches_path_for(csv_path)
+    if not os.path.exists(path):
+        return None
+    if os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return EventTypeSketches.from_dict(json.load(f))
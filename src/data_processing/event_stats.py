@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-Event-Type Statistics Sidecar
+
+This module computes counts, moments and quantiles of the time measures
+(time since case start and inter-event time) per event type when a log is
+processed, and stores them in a JSON
+sidecar next to the processed CSV (`processed_*.stats.json`). The dashboard
+sorts event types from this sidecar and the analysis scripts print it,
+instead of scanning all events again.
+
+Two scopes are stored:
+- 'all_events': raw hours over every event (what the analysis scripts report)
+- 'transformations': every registered transformation over the
+  events the dashboard shows (time_since_case_start > 0)
+
+for time since case start at the top level, and for the other time measures
+under 'metrics' -> column name (e.g. 'time_since_previous_event'), over the
+same events. Events without a value (the first event of a case has no
+inter-event time) are not counted.
+
+Min-max scaling is fitted on all shown events here, while the dashboard fits
+it on the selected top-N events; being affine, it sorts event types the same.
+"""
+
+import json
+import math
+import os
+import sys
+
+import pandas as pd
+
+try:
+    from utils.grouped_stats import grouped_stats
+    from utils.transformations import apply_transformation, get_transformation_options
+except ImportError:  # executed as a script
+    sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+    from utils.grouped_stats import grouped_stats
+    from utils.transformations import apply_transformation, get_transformation_options
+
+try:
+    from .storage import HOURS_COLUMN, TIME_COLUMNS
+except ImportError:  # executed as a script
+    from storage import HOURS_COLUMN, TIME_COLUMNS
+
+STATS_SUFFIX = '.stats.json'
+STAT_NAMES = ['count', 'mean', 'std', 'min', 'q1', 'median', 'q3', 'max']
+
+
+def stats_path_for(csv_path):
+    """
+    Get the statistics sidecar path that belongs to a processed CSV file.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+
+    Returns:
+        str: Path of the matching statistics file
+    """
+    return os.path.splitext(str(csv_path))[0] + STATS_SUFFIX
+
+
+def describe_by_event_type(event_names, values):
+    """
+    Compute STAT_NAMES per event type.
+
+    Args:
+        event_names (pd.Series): Event type of each event
+        values (array-like): Value of each event
+
+    Returns:
+        pd.DataFrame: One row per event type, one column per statistic
+    """
+    stats = grouped_stats(event_names, values, quantiles=(0.25, 0.5, 0.75), std=True)
+    return stats[STAT_NAMES]
+
+
+def _to_records(stats):
+    """Convert a statistics frame to JSON-safe nested dicts (NaN -> None)."""
+    records = {}
+    for event_name, row in stats.iterrows():
+        records[str(event_name)] = {
+            name: (None if isinstance(value, float) and math.isnan(value) else
+                   int(value) if name == 'count' else float(value))
+            for name, value in row.items()
+        }
+    return records
+
+
+def _metric_stats(event_names, values, shown):
+    """Compute both scopes of one time measure (see module docstring)."""
+    transformations = {}
+    for option in get_transformation_options():
+        transformed = apply_transformation(values[shown], option['value'])
+        transformations[option['value']] = _to_records(
+            describe_by_event_type(event_names[shown], transformed)
+        )
+    return {
+        'all_events': _to_records(describe_by_event_type(event_names, values)),
+        'transformations': transformations,
+    }
+
+
+def compute_event_type_stats(df):
+    """
+    Compute the statistics sidecar content for a processed event log.
+
+    Args:
+        df (pd.DataFrame): Processed event log
+
+    Returns:
+        dict: Sidecar content (see module docstring)
+    """
+    hours = df[HOURS_COLUMN]
+    shown = (hours > 0).to_numpy()
+    event_names = df['concept:name']
+
+    stats = {
+        'cases': int(df['case:concept:name'].nunique()) if 'case:concept:name' in df.columns else None,
+        'events': int(len(df)),
+        'shown_events': int(shown.sum()),
+        'filter': f'{HOURS_COLUMN} > 0',
+        **_metric_stats(event_names, hours, shown),
+        'metrics': {},
+    }
+    for column in TIME_COLUMNS:
+        if column != HOURS_COLUMN and column in df.columns:
+            stats['metrics'][column] = _metric_stats(event_names, df[column], shown)
+    return stats
+
+
+def write_event_stats(df, csv_path):
+    """
+    Write the statistics sidecar of a processed CSV.
+
+    Args:
+        df (pd.DataFrame): Processed event log
+        csv_path (str): Path of the CSV file written for the same log
+
+    Returns:
+        str: Path of the written sidecar, or None if it failed
+    """
+    path = stats_path_for(csv_path)
+    try:
+        stats = compute_event_type_stats(df)
+        stats['source'] = os.path.basename(str(csv_path))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=1)
+        print(f"   Saved event type statistics to: {path}")
+        return path
+    except Exception as e:
+        print(f"   Could not write event type statistics {path}: {e}")
+        return None
+
+
+def load_event_stats(csv_path):
+    """
+    Load the statistics sidecar of a processed CSV if it is up to date.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+
+    Returns:
+        dict: Sidecar content, or None if missing or older than the CSV
+    """
+    path = stats_path_for(csv_path)
+    if not os.path.exists(path):
+        return None
+    if os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def metric_stats(stats, metric=HOURS_COLUMN):
+    """
+    Get the statistics of one time measure from the sidecar.
+
+    Args:
+        stats (dict): Sidecar content
+        metric (str): Time measure column
+
+    Returns:
+        dict: 'all_events' and 'transformations' of the measure, or None if
+            the sidecar has no statistics for it (written before it existed)
+    """
+    if metric == HOURS_COLUMN:
+        return stats
+    return stats.get('metrics', {}).get(metric)
+
+
+def event_stats_frame(stats, transformation='raw_hours', scope='transformations', metric=HOURS_COLUMN):
+    """
+    Get one table of the sidecar as a DataFrame.
+
+    Args:
+        stats (dict): Sidecar content
+        transformation (str): Transformation key (ignored for 'all_events')
+        scope (str): 'transformations' or 'all_events'
+        metric (str): Time measure column (must be in the sidecar)
+
+    Returns:
+        pd.DataFrame: One row per event type, one column per statistic
+    """
+    scopes = metric_stats(stats, metric)
+    records = scopes['all_events'] if scope == 'all_events' else scopes['transformations'][transformation]
+    frame = pd.DataFrame.from_dict(records, orient='index', columns=STAT_NAMES)
+    frame.index.name = 'concept:name'
+    return frame
+
+
+def describe_event_types(csv_path, metric=HOURS_COLUMN):
+    """
+    Describe a time measure per event type over all events.
+
+    Reads the statistics sidecar when it is up to date and only scans the
+    processed log (two columns) when it is not.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+        metric (str): Time measure column (default: time since case start)
+
+    Returns:
+        pd.DataFrame: Columns min, 25%, 50%, 75%, max, count, mean, std per event type
+    """
+    stats = load_event_stats(csv_path)
+    if stats is not None and metric_stats(stats, metric) is not None:
+        summary = event_stats_frame(stats, scope='all_events', metric=metric)
+    else:
+        df = pd.read_csv(csv_path, usecols=['concept:name', metric])
+        summary = describe_by_event_type(df['concept:name'], df[metric])
+
+    return summary.rename(columns={'q1': '25%', 'median': '50%', 'q3': '75%'})
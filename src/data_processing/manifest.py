@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Processing Manifest for Incremental Reprocessing
+
+This module keeps a JSON manifest in the processed directory that records,
+for every converted XES file, its size, mtime and SHA-256 hash, the pipeline
+version that converted it and every output written for it (CSV, Parquet
+copy, sidecars, mapped columns). Files whose input and pipeline version are
+unchanged and whose outputs all still exist can then be skipped on the next
+run.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+MANIFEST_NAME = 'manifest.json'
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_sha256(path):
+    """
+    Hash a file's content in blocks.
+
+    Args:
+        path (str): File to hash
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def input_state(path):
+    """
+    Describe an input file as the manifest records it (run in the worker that converts it).
+
+    Args:
+        path (str): Input file
+
+    Returns:
+        dict: size, mtime_ns and sha256 of the file
+    """
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_sha256(path)}
+
+
+class ProcessingManifest:
+    """
+    Manifest of processed inputs stored as `manifest.json` in the processed directory.
+
+    Args:
+        processed_dir (str): Directory holding the processed outputs
+        pipeline_version (str): Version of the conversion pipeline; entries
+            written by another version are treated as stale
+    """
+
+    def __init__(self, processed_dir, pipeline_version):
+        self.path = Path(processed_dir) / MANIFEST_NAME
+        self.pipeline_version = pipeline_version
+        self.files = {}
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.files = json.load(f).get('files', {})
+            except (OSError, ValueError) as e:
+                print(f"   Ignoring unreadable manifest {self.path}: {e}")
+
+    def is_up_to_date(self, xes_path, csv_path, outputs=()):
+        """
+        Check whether an input was already converted by this pipeline version.
+
+        Size and mtime are compared first; the content hash is only computed
+        when the size matches but the mtime changed (e.g. after a copy).
+
+        Args:
+            xes_path (str): Input XES file
+            csv_path (str): Expected output CSV file
+            outputs (list): Outputs the current run would write (e.g. the
+                statistics sidecar, which a streaming conversion does not write);
+                each must have been recorded for the input
+
+        Returns:
+            bool: True if the input can be skipped
+        """
+        entry = self.files.get(Path(xes_path).name)
+        if entry is None or entry.get('pipeline_version') != self.pipeline_version:
+            return False
+        if entry.get('output') != Path(csv_path).name:
+            return False
+        # Entries written before outputs were recorded are stale
+        recorded = entry.get('outputs')
+        if not recorded or not all((self.path.parent / name).exists() for name in recorded):
+            return False
+        if not set(self._output_names(csv_path, outputs)) <= set(recorded):
+            # Converted in another mode that skips outputs this run needs
+            return False
+
+        stat = os.stat(xes_path)
+        if stat.st_size != entry.get('size'):
+            return False
+        if stat.st_mtime_ns == entry.get('mtime_ns'):
+            return True
+
+        if file_sha256(xes_path) != entry.get('sha256'):
+            return False
+
+        # Same content, only touched: remember the new mtime
+        entry['mtime_ns'] = stat.st_mtime_ns
+        return True
+
+    def record(self, xes_path, csv_path, outputs=(), state=None):
+        """
+        Record a successful conversion of an input file.
+
+        Args:
+            xes_path (str): Input XES file
+            csv_path (str): Output CSV file
+            outputs (list): Every file written for the input (the CSV is always included)
+            state (dict): input_state of the input when it was converted
+                (default: computed here)
+        """
+        state = state or input_state(xes_path)
+        self.files[Path(xes_path).name] = {
+            **state,
+            'pipeline_version': self.pipeline_version,
+            'output': Path(csv_path).name,
+            'outputs': self._output_names(csv_path, outputs),
+            'processed_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+
+    def _output_names(self, csv_path, outputs):
+        """Output paths relative to the manifest directory, CSV first."""
+        return [Path(csv_path).name] + [
+            os.path.relpath(output, self.path.parent) for output in outputs if Path(output) != Path(csv_path)
+        ]
+
+    def forget(self, xes_path):
+        """Drop the entry of an input (e.g. after a failed conversion)."""
+        self.files.pop(Path(xes_path).name, None)
+
+    def save(self):
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'pipeline_version': self.pipeline_version, 'files': self.files}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Memory-Mapped Column Store for Processed Event Logs
+
+This module writes the dashboard columns of a processed event log as plain
+NumPy files (event and case codes, time since case start and since the
+previous event) plus a JSON file with the category
+names, in a directory next to the CSV. The dashboard maps these files
+read-only instead of reading the log into pandas, so every worker process of
+a multi-worker server shares one copy of the data through the OS page cache.
+
+Rows are stored grouped by event type, most frequent type first, with the
+case-start events (time_since_case_start of 0 or missing) at the end. The
+filtered log and every "top N event types" selection are therefore leading
+slices of the arrays and can be served as views without copying.
+
+Files are replaced by writing a new directory and renaming it, never
+rewritten in place, so processes that still map the old files keep reading
+valid data.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .storage import CASE_COLUMN, EVENT_COLUMN, GAP_COLUMN, HOURS_COLUMN
+except ImportError:  # executed as a script
+    from storage import CASE_COLUMN, EVENT_COLUMN, GAP_COLUMN, HOURS_COLUMN
+
+MAPPED_SUFFIX = '.mapped'
+META_FILE = 'meta.json'
+FORMAT_VERSION = 1
+
+# Column -> array file in the mapped directory
+ARRAY_FILES = {
+    EVENT_COLUMN: 'event_codes.npy',
+    CASE_COLUMN: 'case_codes.npy',
+    HOURS_COLUMN: 'hours.npy',
+    GAP_COLUMN: 'previous_event_hours.npy',
+}
+CATEGORICAL_COLUMNS = (EVENT_COLUMN, CASE_COLUMN)
+
+# Type of the name codes in the spool files of MappedChunkWriter
+SPOOL_CODES = np.int32
+
+
+def mapped_dir_for(csv_path):
+    """
+    Get the mapped column directory that belongs to a processed CSV file.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+
+    Returns:
+        str: Path of the matching directory
+    """
+    return os.path.splitext(str(csv_path))[0] + MAPPED_SUFFIX
+
+
+def mapped_meta_path_for(csv_path):
+    """Get the path of the metadata file of a mapped log (changes whenever the log is rewritten)."""
+    return os.path.join(mapped_dir_for(csv_path), META_FILE)
+
+
+def codes_dtype(n_categories):
+    """Get the integer type pandas uses for categorical codes with n categories (so no cast is needed)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _event_layout(event_names, hours):
+    """
+    Order the rows: event types by descending frequency among the non-case-start
+    rows (as value_counts ranks them), rows without an event name after them
+    and the case-start rows last.
+
+    Returns:
+        tuple: (row order, category names, codes in the original row order,
+            counts of the leading categories, number of included rows)
+    """
+    names = pd.Series(event_names).astype('category')
+    included = np.asarray(hours, dtype='float64') > 0
+    counts = names[included].value_counts()
+    counts = counts[counts > 0]
+
+    # Frequent types first, then types that only occur in case-start rows
+    categories = counts.index.tolist()
+    seen = set(categories)
+    categories += [name for name in names.cat.categories if name not in seen]
+    codes = names.cat.set_categories(categories).cat.codes.to_numpy().astype('int64')
+
+    # Each group keeps its original row order
+    sort_key = np.where(codes < 0, len(categories), codes)
+    sort_key = np.where(included, sort_key, len(categories) + 1)
+    order = np.argsort(sort_key, kind='stable')
+    return order, categories, codes, counts.astype('int64').tolist(), int(included.sum())
+
+
+def _publish(tmp_dir, target_dir, meta):
+    """Write the metadata and swap the new directory in (mapped files of the old one stay readable until unmapped)."""
+    with open(os.path.join(tmp_dir, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+
+    old_dir = f'{target_dir}.old-{os.getpid()}'
+    if os.path.exists(target_dir):
+        os.replace(target_dir, old_dir)
+    os.replace(tmp_dir, target_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def write_mapped_log(df, csv_path):
+    """
+    Write the memory-mapped column files of a processed log.
+
+    Args:
+        df (pd.DataFrame): Processed event log (needs concept:name and
+            time_since_case_start; case:concept:name and
+            time_since_previous_event are stored if present)
+        csv_path (str): Path of the CSV file written for the same log
+
+    Returns:
+        str: Path of the written directory, or None if writing failed
+    """
+    target_dir = mapped_dir_for(csv_path)
+    tmp_dir = f'{target_dir}.tmp-{os.getpid()}'
+    try:
+        hours = df[HOURS_COLUMN].to_numpy(dtype='float32')
+        order, event_categories, event_codes, event_counts, included_rows = _event_layout(df[EVENT_COLUMN], hours)
+
+        os.makedirs(tmp_dir, exist_ok=True)
+        meta = {
+            'version': FORMAT_VERSION,
+            'rows': int(len(df)),
+            'included_rows': included_rows,
+            'event_counts': event_counts,
+            'categories': {},
+        }
+
+        np.save(os.path.join(tmp_dir, ARRAY_FILES[EVENT_COLUMN]),
+                event_codes[order].astype(codes_dtype(len(event_categories))))
+        meta['categories'][EVENT_COLUMN] = [str(name) for name in event_categories]
+
+        if CASE_COLUMN in df.columns:
+            cases = df[CASE_COLUMN].astype('category').array
+            np.save(os.path.join(tmp_dir, ARRAY_FILES[CASE_COLUMN]),
+                    cases.codes[order].astype(codes_dtype(len(cases.categories))))
+            meta['categories'][CASE_COLUMN] = [str(name) for name in cases.categories]
+
+        np.save(os.path.join(tmp_dir, ARRAY_FILES[HOURS_COLUMN]), hours[order])
+        if GAP_COLUMN in df.columns:
+            np.save(os.path.join(tmp_dir, ARRAY_FILES[GAP_COLUMN]), df[GAP_COLUMN].to_numpy(dtype='float32')[order])
+
+        _publish(tmp_dir, target_dir, meta)
+        print(f"   Saved memory-mapped columns to: {target_dir}")
+        return target_dir
+    except Exception as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        print(f"   Could not write memory-mapped columns {target_dir}: {e}")
+        return None
+
+
+class MappedChunkWriter:
+    """
+    Write the memory-mapped column files of a processed log chunk by chunk.
+
+    Chunks are appended to spool files in arrival order, with event and case
+    names coded in first-seen order. close() then knows the frequency of every
+    event type and moves the rows into the grouped layout of write_mapped_log
+    in one more pass over the spool files, one chunk at a time, writing each
+    row straight to its final position. Memory depends on the chunk size and
+    the number of event types and cases, not on the number of events.
+
+    Args:
+        csv_path (str): Path of the CSV file written for the same log
+        chunk_events (int): Rows per chunk of the reorder pass
+    """
+
+    def __init__(self, csv_path, chunk_events=1_000_000):
+        self.target_dir = mapped_dir_for(csv_path)
+        self.tmp_dir = f'{self.target_dir}.tmp-{os.getpid()}'
+        self.chunk_events = int(chunk_events)
+        self.rows = 0
+        self._names = {EVENT_COLUMN: {}, CASE_COLUMN: {}}
+        # Included rows (time_since_case_start > 0) per event code, and those without an event name
+        self._included = np.zeros(0, dtype=np.int64)
+        self._included_unnamed = 0
+        self._columns = None
+        self._spools = {}
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def _spool_path(self, column):
+        return os.path.join(self.tmp_dir, ARRAY_FILES[column] + '.spool')
+
+    def _codes(self, column, values):
+        """Code names in first-seen order across chunks (-1 for missing names)."""
+        local_codes, uniques = pd.factorize(pd.Series(values))
+        known = self._names[column]
+        lookup = np.array([known.setdefault(str(name), len(known)) for name in uniques] + [-1], dtype=SPOOL_CODES)
+        return lookup[local_codes]
+
+    def write(self, df):
+        """Append a chunk of the event log (needs concept:name and time_since_case_start)."""
+        if self._columns is None:
+            self._columns = [column for column in ARRAY_FILES if column in df.columns]
+            self._spools = {column: open(self._spool_path(column), 'wb') for column in self._columns}
+
+        hours = df[HOURS_COLUMN].to_numpy(dtype='float32')
+        event_codes = self._codes(EVENT_COLUMN, df[EVENT_COLUMN])
+        included = event_codes[hours > 0]
+        self._included_unnamed += int(np.count_nonzero(included < 0))
+        counts = np.bincount(included[included >= 0], minlength=len(self._names[EVENT_COLUMN]))
+        self._included = np.pad(self._included, (0, len(counts) - len(self._included))) + counts
+
+        arrays = {EVENT_COLUMN: event_codes, HOURS_COLUMN: hours}
+        if CASE_COLUMN in self._columns:
+            arrays[CASE_COLUMN] = self._codes(CASE_COLUMN, df[CASE_COLUMN])
+        if GAP_COLUMN in self._columns:
+            arrays[GAP_COLUMN] = df[GAP_COLUMN].to_numpy(dtype='float32')
+        for column in self._columns:
+            arrays[column].tofile(self._spools[column])
+        self.rows += len(df)
+
+    def close(self):
+        """
+        Reorder the spooled rows into the mapped directory.
+
+        Returns:
+            str: Path of the written directory, or None if writing failed
+        """
+        try:
+            for spool in self._spools.values():
+                spool.close()
+
+            # Frequent types first (ties in first-seen order), then types that only occur in case-start rows
+            counts = self._included
+            frequent = np.argsort(-counts, kind='stable')
+            n_frequent = int(np.count_nonzero(counts))
+            n_categories = len(counts)
+            # First-seen code -> final code; the extra last entry keeps missing names (-1) at -1
+            rank = np.full(n_categories + 1, -1, dtype=np.int64)
+            rank[frequent] = np.arange(n_categories)
+
+            # Groups: one per event type, included rows without a name, case-start rows
+            sizes = np.r_[counts[frequent], self._included_unnamed, 0]
+            sizes[-1] = self.rows - sizes.sum()
+            cursor = np.r_[0, np.cumsum(sizes)[:-1]]
+
+            n_cases = len(self._names[CASE_COLUMN])
+            dtypes = {EVENT_COLUMN: codes_dtype(n_categories), CASE_COLUMN: codes_dtype(n_cases),
+                      HOURS_COLUMN: np.dtype('float32'), GAP_COLUMN: np.dtype('float32')}
+            spool_dtypes = {EVENT_COLUMN: SPOOL_CODES, CASE_COLUMN: SPOOL_CODES,
+                            HOURS_COLUMN: np.float32, GAP_COLUMN: np.float32}
+            outputs = {
+                column: np.lib.format.open_memmap(os.path.join(self.tmp_dir, ARRAY_FILES[column]), mode='w+',
+                                                  dtype=dtypes[column], shape=(self.rows,))
+                for column in self._columns
+            }
+            spools = {column: np.memmap(self._spool_path(column), dtype=spool_dtypes[column], mode='r',
+                                        shape=(self.rows,)) if self.rows else None
+                      for column in self._columns}
+
+            for start in range(0, self.rows, self.chunk_events):
+                stop = min(start + self.chunk_events, self.rows)
+                event_codes = np.asarray(spools[EVENT_COLUMN][start:stop])
+                included = np.asarray(spools[HOURS_COLUMN][start:stop]) > 0
+                final_codes = rank[event_codes]
+                group = np.where(final_codes >= 0, final_codes, n_categories)
+                group = np.where(included, group, n_categories + 1)
+
+                # Rows keep their order within a group, as in write_mapped_log
+                order = np.argsort(group, kind='stable')
+                group_counts = np.bincount(group, minlength=len(sizes))
+                sorted_group = group[order]
+                offset_in_chunk = np.arange(len(order)) - np.r_[0, np.cumsum(group_counts)[:-1]][sorted_group]
+                destination = cursor[sorted_group] + offset_in_chunk
+                cursor += group_counts
+
+                for column in self._columns:
+                    values = final_codes if column == EVENT_COLUMN else np.asarray(spools[column][start:stop])
+                    outputs[column][destination] = values[order]
+
+            for output in outputs.values():
+                output.flush()
+            del outputs, spools
+            for column in self._columns:
+                os.remove(self._spool_path(column))
+
+            event_names = list(self._names[EVENT_COLUMN])
+            meta = {
+                'version': FORMAT_VERSION,
+                'rows': int(self.rows),
+                'included_rows': int(counts.sum()) + self._included_unnamed,
+                'event_counts': counts[frequent][:n_frequent].tolist(),
+                'categories': {EVENT_COLUMN: [event_names[code] for code in frequent]},
+            }
+            if CASE_COLUMN in self._columns:
+                meta['categories'][CASE_COLUMN] = list(self._names[CASE_COLUMN])
+
+            _publish(self.tmp_dir, self.target_dir, meta)
+            print(f"   Saved memory-mapped columns to: {self.target_dir}")
+            return self.target_dir
+        except Exception as e:
+            self.abort()
+            print(f"   Could not write memory-mapped columns {self.target_dir}: {e}")
+            return None
+
+    def abort(self):
+        """Drop everything written so far."""
+        for spool in self._spools.values():
+            spool.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+
+def has_fresh_mapped(csv_path):
+    """
+    Check whether up-to-date mapped column files exist for a processed CSV.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+
+    Returns:
+        bool: True if the mapped directory exists and is not older than the CSV
+    """
+    meta_path = mapped_meta_path_for(csv_path)
+    if not os.path.exists(meta_path):
+        return False
+    if os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(meta_path):
+        return False
+    return True
+
+
+def _map_array(directory, column):
+    """Map an array file read-only (a plain ndarray view that keeps the mapping alive)."""
+    return np.load(os.path.join(directory, ARRAY_FILES[column]), mmap_mode='r').view(np.ndarray)
+
+
+def read_mapped_log(csv_path, columns=None, include_case_start=False):
+    """
+    Map the column files of a processed log and wrap them in a DataFrame.
+
+    Time measures are float32 and event/case names are categoricals whose codes are
+    the mapped arrays, so no event data is copied. The frame is read-only
+    (writing to it raises) and its row order is the grouped order described
+    in the module docstring.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+        columns (list): Columns to include (default: all stored columns)
+        include_case_start (bool): Also include the case-start rows (hours 0 or missing)
+
+    Returns:
+        pd.DataFrame: Event log backed by the mapped files
+    """
+    directory = mapped_dir_for(csv_path)
+    with open(os.path.join(directory, META_FILE), 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"unsupported mapped log version {meta.get('version')} in {directory}")
+
+    n_rows = meta['rows'] if include_case_start else meta['included_rows']
+    stored = [column for column in ARRAY_FILES if os.path.exists(os.path.join(directory, ARRAY_FILES[column]))]
+    columns = [column for column in (columns or ARRAY_FILES) if column in stored]
+
+    data = {}
+    for column in columns:
+        array = _map_array(directory, column)[:n_rows]
+        if column in CATEGORICAL_COLUMNS:
+            array = pd.Categorical.from_codes(array, meta['categories'][column], validate=False)
+        data[column] = array
+    return pd.DataFrame(data, copy=False)
+
+
+def leading_rows(df, event_types):
+    """
+    Count the rows of the given event types if they are exactly the first rows of a frame.
+
+    True for a frame from read_mapped_log and its most frequent event types,
+    whose rows can then be selected with a slice instead of a mask.
+
+    Args:
+        df (pd.DataFrame): Event log with a concept:name column
+        event_types (list): Event type names
+
+    Returns:
+        int: Number of leading rows, or None if the event types are not the leading groups
+    """
+    events = df[EVENT_COLUMN]
+    if not isinstance(events.dtype, pd.CategoricalDtype):
+        return None
+
+    categories = events.cat.categories
+    wanted = set(event_types)
+    n_types = len(wanted)
+    if n_types > len(categories) or set(categories[:n_types]) != wanted:
+        return None
+
+    # The first n categories must fill the first rows and occur nowhere after them
+    codes = events.array.codes
+    selected = (codes >= 0) & (codes < n_types)
+    n_rows = int(selected.sum())
+    return n_rows if selected[:n_rows].all() else None
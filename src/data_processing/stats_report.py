@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Per-Event-Type Statistics Report
+
+Command-line tool that summarizes a time measure per event type (count, min,
+quartiles, max, mean, std over all events) for any set of processed event
+logs and writes one combined CSV report. It replaces the per-dataset
+`scripts/analysis/*_event_log_stats.py` copies.
+
+Datasets are summarized in parallel worker processes. Each worker takes the
+numbers from the statistics sidecar (`processed_*.stats.json`) when it is up
+to date. Otherwise, or with --refresh, it reads only the dashboard columns
+(memory-mapped columns, else the Parquet copy, else the CSV), recomputes the
+sidecar and writes it, so the dashboard sorts from fresh statistics too.
+
+Usage:
+    python src/data_processing/stats_report.py --all
+    python src/data_processing/stats_report.py sepsis bpi_2012 --metric time_since_previous_event
+    python src/data_processing/stats_report.py datasets/processed/processed_x.csv --refresh -o report.csv
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import pandas as pd
+
+try:
+    from .event_stats import compute_event_type_stats, event_stats_frame, load_event_stats, metric_stats, write_event_stats
+    from .mapped_log import has_fresh_mapped, read_mapped_log
+    from .storage import DASHBOARD_COLUMNS, EVENT_COLUMN, HOURS_COLUMN, TIME_COLUMNS, read_compact_log
+    from .worker_pool import run_in_workers
+except ImportError:  # executed as a script
+    from event_stats import compute_event_type_stats, event_stats_frame, load_event_stats, metric_stats, write_event_stats
+    from mapped_log import has_fresh_mapped, read_mapped_log
+    from storage import DASHBOARD_COLUMNS, EVENT_COLUMN, HOURS_COLUMN, TIME_COLUMNS, read_compact_log
+    from worker_pool import run_in_workers
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Report columns, in the order (and with the names) of DataFrame.describe()
+REPORT_COLUMNS = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+DEFAULT_OUTPUT = 'event_type_stats_report.csv'
+
+
+def resolve_datasets(names, all_datasets=False):
+    """
+    Map dataset keys (entries of DATASETS in src/dataset_config.py) or CSV paths to processed CSV paths.
+
+    Args:
+        names (list): Dataset keys or paths to processed CSV files
+        all_datasets (bool): Add every DATASETS entry that has been processed
+
+    Returns:
+        dict: Dataset label -> processed CSV path, in the given order
+    """
+    datasets = {}
+    keys = [name for name in names if not name.lower().endswith('.csv')]
+    if keys or all_datasets:
+        # The dataset list is dashboard configuration (without the Dash app); only needed for keys
+        sys.path.insert(0, SRC_DIR)
+        from dataset_config import DATASETS, get_dataset_path
+
+        unknown = [key for key in keys if key not in DATASETS]
+        if unknown:
+            raise ValueError(f"unknown datasets: {', '.join(unknown)} (known: {', '.join(DATASETS)})")
+        for key in (DATASETS if all_datasets else []):
+            if os.path.exists(get_dataset_path(key)):
+                datasets[key] = get_dataset_path(key)
+            else:
+                print(f"⏭️  Not processed: {key}")
+
+    for name in names:
+        if name.lower().endswith('.csv'):
+            datasets[os.path.splitext(os.path.basename(name))[0]] = name
+        else:
+            datasets[name] = get_dataset_path(name)
+    return datasets
+
+
+def _read_stats_columns(csv_path):
+    """Read only the columns the statistics need (all events, including case starts)."""
+    if has_fresh_mapped(csv_path):
+        return read_mapped_log(csv_path, include_case_start=True), 'mapped'
+    return read_compact_log(csv_path, columns=DASHBOARD_COLUMNS), 'columns'
+
+
+def summarize_dataset(csv_path, metric=HOURS_COLUMN, refresh=False):
+    """
+    Summarize a time measure per event type over all events of a processed log.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+        metric (str): Time measure column
+        refresh (bool): Recompute the statistics sidecar even if it is up to date
+
+    Returns:
+        tuple: (summary frame indexed by event type with REPORT_COLUMNS,
+            dataset totals dict with cases and events, source of the numbers)
+    """
+    stats = None if refresh else load_event_stats(csv_path)
+    source = 'sidecar'
+    if stats is None or metric_stats(stats, metric) is None:
+        df, source = _read_stats_columns(csv_path)
+        if metric not in df.columns:
+            raise ValueError(f"no {metric} column; reprocess the dataset")
+        # Rewrite the sidecar; if that fails the statistics are still reported
+        if write_event_stats(df, csv_path) is not None:
+            stats = load_event_stats(csv_path)
+        if stats is None or metric_stats(stats, metric) is None:
+            stats = compute_event_type_stats(df)
+
+    summary = event_stats_frame(stats, scope='all_events', metric=metric)
+    summary = summary.rename(columns={'q1': '25%', 'median': '50%', 'q3': '75%'})[REPORT_COLUMNS]
+    summary.index.name = EVENT_COLUMN
+    return summary, {'cases': stats['cases'], 'events': stats['events']}, source
+
+
+def _summarize_captured(label, csv_path, metric, refresh):
+    """
+    Summarize one dataset while capturing its log output (process pool task).
+
+    Returns:
+        tuple: (label, summary or None, totals, source, seconds, captured log)
+    """
+    buffer = io.StringIO()
+    start = time.perf_counter()
+    summary, totals, source = None, None, None
+    with contextlib.redirect_stdout(buffer):
+        try:
+            summary, totals, source = summarize_dataset(csv_path, metric, refresh)
+        except Exception as e:
+            print(f"   Error summarizing {csv_path}: {e}")
+    return label, summary, totals, source, time.perf_counter() - start, buffer.getvalue()
+
+
+def build_report(datasets, metric=HOURS_COLUMN, refresh=False, jobs=0):
+    """
+    Summarize several datasets in parallel worker processes.
+
+    Args:
+        datasets (dict): Dataset label -> processed CSV path
+        metric (str): Time measure column
+        refresh (bool): Recompute every statistics sidecar
+        jobs (int): Worker processes (0 = one per CPU, 1 = in this process)
+
+    Returns:
+        tuple: (combined report frame with a dataset column, list of failed labels)
+    """
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(datasets)))
+
+    summaries = {}
+    failed = []
+
+    def record(label, summary, totals, source, seconds, log):
+        # Each dataset's log is printed as one block once it is done
+        if summary is None:
+            failed.append(label)
+            print(f"❌ {label}")
+        else:
+            summaries[label] = summary
+            print(f"📊 {label}: {totals['events']:,} events, {len(summary)} event types "
+                  f"({source}, {seconds:.2f}s)")
+        if log:
+            print(log, end='' if log.endswith('\n') else '\n')
+
+    tasks = {label: (label, csv_path, metric, refresh) for label, csv_path in datasets.items()}
+    if jobs == 1:
+        for task in tasks.values():
+            record(*_summarize_captured(*task))
+    else:
+        print(f"Summarizing {len(tasks)} datasets with {jobs} worker processes...")
+        # A crashed worker breaks the pool; its unfinished datasets are rerun one at a time
+        for label, result, error in run_in_workers(_summarize_captured, tasks, jobs):
+            if error is None:
+                record(*result)
+            else:
+                record(label, None, None, None, 0.0, f"   Worker failed: {error!r}\n")
+
+    # Combined report in the requested dataset order
+    frames = [summaries[label].reset_index().assign(dataset=label) for label in datasets if label in summaries]
+    if not frames:
+        return pd.DataFrame(columns=['dataset', EVENT_COLUMN] + REPORT_COLUMNS), failed
+    report = pd.concat(frames, ignore_index=True)
+    return report[['dataset', EVENT_COLUMN] + REPORT_COLUMNS], failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-event-type statistics report of processed event logs")
+    parser.add_argument('datasets', nargs='*', help='Dataset keys (see DATASETS in src/dataset_config.py) or processed CSV paths')
+    parser.add_argument('--all', action='store_true', help='Report every configured dataset')
+    parser.add_argument('--metric', choices=TIME_COLUMNS, default=HOURS_COLUMN,
+                        help=f'Time measure to summarize (default: {HOURS_COLUMN})')
+    parser.add_argument('--refresh', action='store_true', help='Recompute the statistics sidecars from the data')
+    parser.add_argument('--jobs', type=int, default=0, help='Worker processes (default: one per CPU)')
+    parser.add_argument('-o', '--output', default=DEFAULT_OUTPUT, help=f'Report CSV path (default: {DEFAULT_OUTPUT})')
+    args = parser.parse_args()
+
+    if not args.datasets and not args.all:
+        parser.error('name datasets or pass --all')
+    try:
+        datasets = resolve_datasets(args.datasets, args.all)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    report, failed = build_report(datasets, args.metric, args.refresh, args.jobs)
+    report.to_csv(args.output, index=False)
+
+    with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 160):
+        print(report.set_index(['dataset', EVENT_COLUMN])[['min', '25%', '50%', '75%', 'max', 'count']])
+    print(f"Saved {args.output}: {len(datasets) - len(failed)} datasets in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Columnar Storage for Processed Event Logs
+
+This module writes processed event logs to a typed columnar format (Parquet)
+next to the CSV output and reads them back with their dtypes intact, so the
+dashboard does not have to re-parse large CSV files on every load.
+"""
+
+import os
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine)
+    COLUMNAR_AVAILABLE = True
+except ImportError:
+    COLUMNAR_AVAILABLE = False
+
+COLUMNAR_SUFFIX = '.parquet'
+
+# Columns with a fixed on-disk type; everything else is stored as-is
+EVENT_COLUMN = 'concept:name'
+CASE_COLUMN = 'case:concept:name'
+TIMESTAMP_COLUMN = 'time:timestamp'
+HOURS_COLUMN = 'time_since_case_start'
+GAP_COLUMN = 'time_since_previous_event'
+
+# Per-event time measures (hours), in the order the dashboard offers them
+TIME_COLUMNS = [HOURS_COLUMN, GAP_COLUMN]
+
+# Columns the dashboard needs, and their in-memory types
+DASHBOARD_COLUMNS = [CASE_COLUMN, EVENT_COLUMN, HOURS_COLUMN, GAP_COLUMN]
+COMPACT_DTYPES = {
+    CASE_COLUMN: 'category',
+    EVENT_COLUMN: 'category',
+    HOURS_COLUMN: 'float32',
+    GAP_COLUMN: 'float32',
+}
+
+
+def columnar_path_for(csv_path):
+    """
+    Get the columnar file path that belongs to a processed CSV file.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+
+    Returns:
+        str: Path of the matching Parquet file
+    """
+    return os.path.splitext(str(csv_path))[0] + COLUMNAR_SUFFIX
+
+
+def to_epoch_ns(timestamps):
+    """
+    Convert a timestamp column to int64 nanoseconds since the Unix epoch (UTC).
+
+    Missing timestamps (NaT) become the minimum int64 value, as in NumPy.
+
+    Args:
+        timestamps (pd.Series): Datetime values, ISO8601 strings or int64 nanoseconds
+
+    Returns:
+        np.ndarray: int64 nanoseconds since epoch
+    """
+    if pd.api.types.is_integer_dtype(timestamps):
+        return timestamps.to_numpy(dtype='int64')
+
+    if not pd.api.types.is_datetime64_any_dtype(timestamps):
+        timestamps = pd.to_datetime(timestamps, utc=True, format='ISO8601')
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert('UTC').dt.tz_localize(None)
+
+    return timestamps.to_numpy(dtype='datetime64[ns]').view('int64')
+
+
+def _has_string_categories(series):
+    """Check whether a column is already a categorical of strings."""
+    return (isinstance(series.dtype, pd.CategoricalDtype)
+            and pd.api.types.is_string_dtype(series.cat.categories)
+            and series.cat.categories.map(type).isin([str]).all())
+
+
+def to_columnar_frame(df):
+    """
+    Cast a processed event log to the compact types used on disk.
+
+    Event and case names become categoricals, timestamps become int64
+    nanoseconds and the time measures (hours) become float32. Remaining free-text columns are
+    stored as strings so mixed-type XES attributes do not break the writer.
+
+    Args:
+        df (pd.DataFrame): Processed event log
+
+    Returns:
+        pd.DataFrame: Typed copy of the event log
+    """
+    typed = df.copy()
+
+    for column in (EVENT_COLUMN, CASE_COLUMN):
+        if column in typed.columns and not _has_string_categories(typed[column]):
+            typed[column] = typed[column].astype(str).astype('category')
+
+    if TIMESTAMP_COLUMN in typed.columns:
+        typed[TIMESTAMP_COLUMN] = to_epoch_ns(typed[TIMESTAMP_COLUMN])
+
+    for column in TIME_COLUMNS:
+        if column in typed.columns:
+            typed[column] = typed[column].astype('float32')
+
+    for column in typed.columns:
+        if typed[column].dtype == object:
+            typed[column] = typed[column].astype('string')
+
+    return typed
+
+
+def write_columnar(df, csv_path):
+    """
+    Write the columnar companion file of a processed CSV.
+
+    Args:
+        df (pd.DataFrame): Processed event log
+        csv_path (str): Path of the CSV file written for the same log
+
+    Returns:
+        str: Path of the written Parquet file, or None if unavailable/failed
+    """
+    if not COLUMNAR_AVAILABLE:
+        print("   Skipping columnar output (pyarrow not installed)")
+        return None
+
+    parquet_path = columnar_path_for(csv_path)
+    try:
+        to_columnar_frame(df).to_parquet(parquet_path, index=False)
+        print(f"   Saved columnar copy to: {parquet_path}")
+        return parquet_path
+    except Exception as e:
+        print(f"   Could not write columnar copy {parquet_path}: {e}")
+        return None
+
+
+class ColumnarChunkWriter:
+    """
+    Incrementally write a processed event log to Parquet, one chunk at a time.
+
+    The schema is fixed by the first chunk, so later chunks must have the same
+    columns and compatible types.
+
+    Args:
+        csv_path (str): Path of the CSV file written for the same log
+    """
+
+    def __init__(self, csv_path):
+        self.path = columnar_path_for(csv_path)
+        self._writer = None
+        self._schema = None
+
+    def write(self, df):
+        """Append a chunk of the event log."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        typed = to_columnar_frame(df)
+        if self._writer is None:
+            table = pa.Table.from_pandas(typed, preserve_index=False)
+            self._schema = table.schema
+            self._writer = pq.ParquetWriter(self.path, self._schema)
+        else:
+            table = pa.Table.from_pandas(typed, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        """Finish the Parquet file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def abort(self):
+        """Drop the partly written file (closing it would leave a valid but truncated log)."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def has_fresh_columnar(csv_path):
+    """
+    Check whether an up-to-date columnar file exists for a processed CSV.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+
+    Returns:
+        bool: True if the Parquet file exists and is not older than the CSV
+    """
+    parquet_path = columnar_path_for(csv_path)
+    if not COLUMNAR_AVAILABLE or not os.path.exists(parquet_path):
+        return False
+    if os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(parquet_path):
+        return False
+    return True
+
+
+def read_compact_log(csv_path, columns=None):
+    """
+    Load selected columns of a processed event log with compact dtypes.
+
+    Event and case names are categoricals and the time measures are float32
+    (see COMPACT_DTYPES). Columns missing from the file (e.g. inter-event
+    time in logs processed before it was added) are skipped.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+        columns (list): Columns to read (default: DASHBOARD_COLUMNS)
+
+    Returns:
+        pd.DataFrame: Event log holding only the requested columns
+    """
+    columns = list(columns or DASHBOARD_COLUMNS)
+
+    if has_fresh_columnar(csv_path):
+        import pyarrow.parquet as pq
+
+        available = set(pq.read_schema(columnar_path_for(csv_path)).names)
+        df = pd.read_parquet(columnar_path_for(csv_path), columns=[c for c in columns if c in available])
+    else:
+        dtypes = {column: dtype for column, dtype in COMPACT_DTYPES.items() if column in columns}
+        df = pd.read_csv(csv_path, usecols=lambda column: column in columns, dtype=dtypes)
+
+    return _to_compact_dtypes(df)
+
+
+def _to_compact_dtypes(df):
+    """Cast the COMPACT_DTYPES columns of a frame (a no-op for columns read from the columnar file)."""
+    for column, dtype in COMPACT_DTYPES.items():
+        if column in df.columns and df[column].dtype != dtype:
+            df[column] = df[column].astype(dtype)
+    return df
+
+
+def iter_compact_chunks(csv_path, columns=None, chunk_events=1_000_000):
+    """
+    Read selected columns of a processed event log chunk by chunk with compact dtypes.
+
+    The columnar file is read in record batches (never more than one row
+    group at a time), the CSV with a chunked reader, so memory depends on the
+    chunk size and not on the size of the log.
+
+    Args:
+        csv_path (str): Path to the processed CSV file
+        columns (list): Columns to read (default: DASHBOARD_COLUMNS); missing ones are skipped
+        chunk_events (int): Rows per chunk
+
+    Yields:
+        pd.DataFrame: Consecutive chunks (categories may differ between chunks)
+    """
+    columns = list(columns or DASHBOARD_COLUMNS)
+
+    if has_fresh_columnar(csv_path):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(columnar_path_for(csv_path))
+        available = set(parquet_file.schema_arrow.names)
+        for batch in parquet_file.iter_batches(batch_size=chunk_events, columns=[c for c in columns if c in available]):
+            yield _to_compact_dtypes(batch.to_pandas())
+        return
+
+    dtypes = {column: dtype for column, dtype in COMPACT_DTYPES.items() if column in columns}
+    with pd.read_csv(csv_path, usecols=lambda column: column in columns, dtype=dtypes, chunksize=chunk_events) as reader:
+        for chunk in reader:
+            yield _to_compact_dtypes(chunk)
+
+
+def bytes_per_event(df):
+    """
+    Measure the in-memory size of an event log per row.
+
+    Args:
+        df (pd.DataFrame): Event log
+
+    Returns:
+        float: Deep memory usage (including the index) divided by the number of rows
+    """
+    return float(df.memory_usage(index=True, deep=True).sum()) / max(len(df), 1)
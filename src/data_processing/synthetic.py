@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Synthetic Event Log Generator
+
+This module generates event logs with the same columns as the processed
+output of `process_xes_to_csv` (and optionally the XES input), so scaling,
+load and CI tests do not need the real BPI/sepsis/traffic fines data.
+
+Logs are built with vectorized NumPy operations:
+- events per case follow a geometric distribution around a configurable mean
+- event types follow a Zipf-like (skewed) frequency over an alphabet
+- waiting times between events are heavy-tailed (Pareto/Lomax), scaled per
+  event type so each violin has its own shape
+
+Generated logs are recorded in a registry file in the processed directory
+(`synthetic_datasets.json`); the dashboard adds them to DATASETS at start.
+
+Usage:
+    python src/data_processing/synthetic.py --cases 1000000 --events-per-case 10 --name synthetic_10m
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .event_sketches import write_event_sketches
+    from .event_stats import write_event_stats
+    from .mapped_log import write_mapped_log
+    from .storage import COLUMNAR_AVAILABLE, write_columnar
+    from .time_features import NS_PER_SECOND, SECONDS_PER_HOUR
+except ImportError:  # executed as a script
+    from event_sketches import write_event_sketches
+    from event_stats import write_event_stats
+    from mapped_log import write_mapped_log
+    from storage import COLUMNAR_AVAILABLE, write_columnar
+    from time_features import NS_PER_SECOND, SECONDS_PER_HOUR
+
+REGISTRY_NAME = 'synthetic_datasets.json'
+
+# Start of the first case; case starts are spread over one year after it
+BASE_TIMESTAMP = pd.Timestamp('2020-01-01', tz='UTC')
+NS_PER_MS = 1_000_000
+MS_PER_HOUR = 1000 * SECONDS_PER_HOUR
+
+# Longest waiting time between two events of a case
+MAX_GAP_HOURS = 24 * 365
+
+
+def dataset_key_for(name):
+    """Normalize a log name to a dataset key (as processed_csv_name does for XES files)."""
+    return name.lower().replace(' ', '_').replace('-', '_')
+
+
+def generate_event_log(n_cases=10_000, events_per_case=10, n_activities=20, zipf_exponent=1.0,
+                       gap_scale_hours=12.0, tail_index=1.5, n_resources=50, seed=0):
+    """
+    Generate a processed event log.
+
+    Args:
+        n_cases (int): Number of cases
+        events_per_case (float): Mean number of events per case (at least 1 each)
+        n_activities (int): Size of the event type alphabet
+        zipf_exponent (float): Skew of the event type frequencies (0 = uniform)
+        gap_scale_hours (float): Typical waiting time between events
+        tail_index (float): Pareto tail index of the waiting times (smaller = heavier tail)
+        n_resources (int): Number of distinct resources
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: Log sorted by case and timestamp with the columns
+        concept:name, org:resource, lifecycle:transition, time:timestamp,
+        case:concept:name, time_since_case_start and time_since_previous_event
+        (in the order the converters produce them for the XES from write_xes)
+    """
+    rng = np.random.default_rng(seed)
+
+    lengths = rng.geometric(1.0 / max(events_per_case, 1.0), n_cases)
+    n_events = int(lengths.sum())
+    case_codes = np.repeat(np.arange(n_cases), lengths)
+    case_starts = np.r_[0, np.cumsum(lengths)[:-1]]
+
+    weights = 1.0 / np.arange(1, n_activities + 1) ** zipf_exponent
+    activity_codes = rng.choice(n_activities, n_events, p=weights / weights.sum())
+
+    # Heavy-tailed waiting times, with a typical scale per event type
+    activity_scale = rng.lognormal(0.0, 1.0, n_activities) * gap_scale_hours
+    gap_hours = np.minimum(rng.pareto(tail_index, n_events) * activity_scale[activity_codes], MAX_GAP_HOURS)
+    # Millisecond resolution, like real XES timestamps
+    gap_ns = (gap_hours * MS_PER_HOUR).astype(np.int64) * NS_PER_MS
+    gap_ns[case_starts] = 0
+
+    # Per-case running sums from one global cumsum. Integer overflow wraps modulo
+    # 2**64, so the differences within a case stay exact.
+    with np.errstate(over='ignore'):
+        running_ns = np.cumsum(gap_ns)
+        offset_ns = running_ns - np.repeat(running_ns[case_starts], lengths)
+
+    start_ns = BASE_TIMESTAMP.value + rng.integers(0, 365 * 24 * MS_PER_HOUR, n_cases) * NS_PER_MS
+    timestamps_ns = start_ns[case_codes] + offset_ns
+
+    df = pd.DataFrame({
+        'concept:name': pd.Categorical.from_codes(
+            activity_codes, [f'Activity {i + 1}' for i in range(n_activities)]
+        ),
+        'org:resource': pd.Categorical.from_codes(
+            rng.integers(0, n_resources, n_events), [f'Resource {i + 1}' for i in range(n_resources)]
+        ),
+        'lifecycle:transition': pd.Categorical.from_codes(np.zeros(n_events, dtype=np.int8), ['complete']),
+        'time:timestamp': pd.to_datetime(timestamps_ns.view('datetime64[ns]'), utc=True),
+        'case:concept:name': pd.Categorical.from_codes(case_codes, [f'case_{i + 1}' for i in range(n_cases)]),
+    })
+    # Same arithmetic as add_time_features; the first event of a case has no previous one
+    df['time_since_case_start'] = offset_ns / NS_PER_SECOND / SECONDS_PER_HOUR
+    previous_hours = gap_ns / NS_PER_SECOND / SECONDS_PER_HOUR
+    previous_hours[case_starts] = np.nan
+    df['time_since_previous_event'] = previous_hours
+    return df
+
+
+def format_utc_timestamps(timestamps, separator=' '):
+    """
+    Format timestamps as millisecond UTC strings, e.g. '2020-01-01 08:30:00.000+00:00'.
+
+    Uses pyarrow's string cast on naive UTC values when available (its
+    timezone-aware formatting and pandas' strftime are much slower).
+
+    Args:
+        timestamps (pd.Series): Timezone-aware timestamps
+        separator (str): Separator between date and time ('T' for XES)
+
+    Returns:
+        pyarrow.Array or pd.Series: Formatted strings
+    """
+    if not COLUMNAR_AVAILABLE:
+        return timestamps.dt.strftime(f'%Y-%m-%d{separator}%H:%M:%S.%f').str[:-3] + '+00:00'
+
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    utc_ms = timestamps.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy().astype('datetime64[ms]')
+    formatted = pa.array(utc_ms).cast(pa.string())
+    if separator != ' ':
+        formatted = pc.replace_substring(formatted, ' ', separator, max_replacements=1)
+    return pc.binary_join_element_wise(formatted, '+00:00', '')
+
+
+def write_csv(df, csv_path):
+    """Write a log as CSV, with pyarrow's multi-threaded writer when available."""
+    if not COLUMNAR_AVAILABLE:
+        df.assign(**{'time:timestamp': format_utc_timestamps(df['time:timestamp'])}).to_csv(csv_path, index=False)
+        return
+
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.set_column(
+        table.schema.get_field_index('time:timestamp'), 'time:timestamp',
+        format_utc_timestamps(df['time:timestamp'])
+    )
+    pa_csv.write_csv(table, csv_path)
+
+
+def write_xes(df, xes_path):
+    """
+    Write a log as a minimal XES file (one trace per case).
+
+    Args:
+        df (pd.DataFrame): Log sorted by case, as from generate_event_log
+        xes_path (str): Output path
+    """
+    timestamps = np.asarray(format_utc_timestamps(df['time:timestamp'], separator='T'), dtype=object)
+    names = [quoteattr(str(name)) for name in df['concept:name'].cat.categories]
+    resources = [quoteattr(str(name)) for name in df['org:resource'].cat.categories]
+    name_codes = df['concept:name'].cat.codes.to_numpy()
+    resource_codes = df['org:resource'].cat.codes.to_numpy()
+    case_codes = df['case:concept:name'].cat.codes.to_numpy()
+    cases = df['case:concept:name'].cat.categories
+    boundaries = np.flatnonzero(np.r_[True, case_codes[1:] != case_codes[:-1], True])
+
+    with open(xes_path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<log xes.version="1.0">\n')
+        for start, end in zip(boundaries[:-1], boundaries[1:]):
+            f.write(f'<trace>\n<string key="concept:name" value={quoteattr(str(cases[case_codes[start]]))}/>\n')
+            f.writelines(
+                f'<event><string key="concept:name" value={names[name_codes[i]]}/>'
+                f'<string key="org:resource" value={resources[resource_codes[i]]}/>'
+                f'<string key="lifecycle:transition" value="complete"/>'
+                f'<date key="time:timestamp" value="{timestamps[i]}"/></event>\n'
+                for i in range(start, end)
+            )
+            f.write('</trace>\n')
+        f.write('</log>\n')
+
+
+def write_processed_log(df, csv_path, stats=True):
+    """
+    Write the processed outputs of a generated log: CSV, columnar copy, mapped columns, statistics and sketches.
+
+    Args:
+        df (pd.DataFrame): Generated log
+        csv_path (str): Output CSV path
+        stats (bool): Also write the per-event-type statistics and sketch sidecars
+    """
+    write_csv(df, csv_path)
+    print(f"   Saved to: {csv_path}")
+    write_columnar(df, csv_path)
+    write_mapped_log(df, csv_path)
+    if stats:
+        write_event_stats(df, csv_path)
+        write_event_sketches(df, csv_path)
+
+
+def load_registered_datasets(processed_dir):
+    """
+    Load the dataset entries of generated logs.
+
+    Args:
+        processed_dir (str): Processed datasets directory
+
+    Returns:
+        dict: Dataset key -> DATASETS-style entry (empty if there is no registry)
+    """
+    path = Path(processed_dir) / REGISTRY_NAME
+    if not path.exists():
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable dataset registry {path}: {e}")
+        return {}
+
+
+def register_dataset(processed_dir, dataset_key, entry):
+    """
+    Add or replace a dataset entry in the registry of generated logs.
+
+    Args:
+        processed_dir (str): Processed datasets directory
+        dataset_key (str): Key used in the dataset dropdown
+        entry (dict): DATASETS-style entry (name, file, description, domain, cases, events)
+    """
+    datasets = load_registered_datasets(processed_dir)
+    datasets[dataset_key] = entry
+    path = Path(processed_dir) / REGISTRY_NAME
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(datasets, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def create_synthetic_dataset(name, processed_dir, raw_dir=None, stats=True, **log_options):
+    """
+    Generate a log, write its outputs and register it for the dashboard.
+
+    Args:
+        name (str): Log name (normalized to the dataset key)
+        processed_dir (str): Directory for the processed CSV/columnar/statistics files
+        raw_dir (str): Also write the XES file to this directory if given
+        stats (bool): Write the statistics sidecar
+        **log_options: Passed to generate_event_log
+
+    Returns:
+        str: Path of the processed CSV file
+    """
+    dataset_key = dataset_key_for(name)
+    Path(processed_dir).mkdir(parents=True, exist_ok=True)
+    csv_path = str(Path(processed_dir) / f'processed_{dataset_key}.csv')
+
+    start = time.perf_counter()
+    df = generate_event_log(**log_options)
+    n_cases = df['case:concept:name'].cat.categories.size
+    print(f"   Generated {n_cases:,} cases, {len(df):,} events in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    write_processed_log(df, csv_path, stats=stats)
+    print(f"   Wrote processed outputs in {time.perf_counter() - start:.1f}s")
+
+    if raw_dir is not None:
+        Path(raw_dir).mkdir(parents=True, exist_ok=True)
+        xes_path = str(Path(raw_dir) / f'{dataset_key}.xes')
+        start = time.perf_counter()
+        write_xes(df, xes_path)
+        print(f"   Saved XES to: {xes_path} ({time.perf_counter() - start:.1f}s)")
+
+    register_dataset(processed_dir, dataset_key, {
+        'name': f'🧪 Synthetic {name}',
+        'file': os.path.basename(csv_path),
+        'description': f'Synthetic log ({log_options.get("n_activities", 20)} event types)',
+        'domain': 'Synthetic',
+        'cases': f'{n_cases:,}',
+        'events': f'{len(df):,}',
+    })
+    return csv_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic event log for the dashboard")
+    parser.add_argument('--name', default='synthetic', help='Log name / dataset key (default: synthetic)')
+    parser.add_argument('--cases', type=int, default=10_000, help='Number of cases (default: 10000)')
+    parser.add_argument('--events-per-case', type=float, default=10, help='Mean events per case (default: 10)')
+    parser.add_argument('--activities', type=int, default=20, help='Event type alphabet size (default: 20)')
+    parser.add_argument('--zipf', type=float, default=1.0, help='Event type frequency skew (default: 1.0)')
+    parser.add_argument('--gap-hours', type=float, default=12.0, help='Typical waiting time in hours (default: 12)')
+    parser.add_argument('--tail-index', type=float, default=1.5, help='Pareto tail index of waiting times (default: 1.5)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--processed-dir', default='datasets/processed', help='Output directory for processed files')
+    parser.add_argument('--xes', action='store_true', help='Also write the XES file to --raw-dir')
+    parser.add_argument('--raw-dir', default='datasets/raw', help='Output directory for the XES file')
+    parser.add_argument('--no-stats', action='store_true', help='Skip the statistics sidecar')
+    args = parser.parse_args()
+
+    print(f"🧪 Generating synthetic log '{args.name}'...")
+    create_synthetic_dataset(
+        args.name, args.processed_dir,
+        raw_dir=args.raw_dir if args.xes else None,
+        stats=not args.no_stats,
+        n_cases=args.cases,
+        events_per_case=args.events_per_case,
+        n_activities=args.activities,
+        zipf_exponent=args.zipf,
+        gap_scale_hours=args.gap_hours,
+        tail_index=args.tail_index,
+        seed=args.seed,
+    )
+    print("✅ Registered for the dashboard")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Vectorized Time Features for Event Logs
+
+This module computes per-event time measures (time since case start and
+inter-event time) on whole event logs with NumPy array operations instead of
+one Python call per case. The log is sorted by case and timestamp first, so
+every case is a contiguous block whose first row holds the case start and
+every other row follows its previous event.
+"""
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .storage import to_epoch_ns
+except ImportError:  # executed as a script
+    from storage import to_epoch_ns
+
+NS_PER_SECOND = 1e9
+SECONDS_PER_HOUR = 3600
+
+
+def case_boundaries(case_ids):
+    """
+    Find where each case starts in an event log sorted by case.
+
+    Args:
+        case_ids (array-like): Case identifier of each event, grouped by case
+
+    Returns:
+        tuple: (starts, lengths) int arrays with the first row and size of each case
+    """
+    codes = pd.factorize(np.asarray(case_ids), use_na_sentinel=False)[0]
+    if len(codes) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    lengths = np.diff(np.r_[starts, len(codes)])
+    return starts, lengths
+
+
+def add_time_features(df, case_column='case:concept:name', timestamp_column='time:timestamp'):
+    """
+    Sort an event log and add the per-event time measures in hours.
+
+    Adds two columns in a single vectorized pass over int64 nanosecond arrays:
+
+    - 'time_since_case_start': same values as
+      ``groupby(case)[timestamp].transform(lambda x: (x - x.min()).dt.total_seconds() / 3600)``
+    - 'time_since_previous_event' (inter-event time): same values as
+      ``groupby(case)[timestamp].diff().dt.total_seconds() / 3600``, so
+      missing for the first event of each case
+
+    Events without a timestamp get missing values in both columns.
+
+    Args:
+        df (pd.DataFrame): Event log with case and timestamp columns
+        case_column (str): Column identifying the case
+        timestamp_column (str): Column with event timestamps
+
+    Returns:
+        pd.DataFrame: Log sorted by case and timestamp with both time columns
+    """
+    # Sort first: each case becomes contiguous and starts with its earliest event
+    df = df.sort_values([case_column, timestamp_column], kind='stable')
+
+    timestamps_ns = to_epoch_ns(df[timestamp_column])
+    missing = timestamps_ns == np.iinfo(np.int64).min
+
+    starts, lengths = case_boundaries(df[case_column])
+    case_start_ns = np.repeat(timestamps_ns[starts], lengths)
+
+    hours = (timestamps_ns - case_start_ns) / NS_PER_SECOND / SECONDS_PER_HOUR
+    if missing.any():
+        hours[missing] = np.nan
+
+    # Previous event of the same case: the row before, except at case starts
+    gap_ns = np.empty_like(timestamps_ns)
+    gap_ns[1:] = timestamps_ns[1:] - timestamps_ns[:-1]
+    gaps = gap_ns / NS_PER_SECOND / SECONDS_PER_HOUR
+    no_previous = missing.copy()
+    no_previous[1:] |= missing[:-1]
+    no_previous[starts] = True
+    gaps[no_previous] = np.nan
+
+    df['time_since_case_start'] = hours
+    df['time_since_previous_event'] = gaps
+    return df
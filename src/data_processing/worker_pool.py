@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Crash-Isolating Worker Pool
+
+This module runs independent tasks (one input file or dataset each) in
+worker processes. A worker that dies (killed, out of memory, crashed in a
+C extension) breaks the whole ProcessPoolExecutor: every future still
+pending fails with BrokenProcessPool, not only the one that crashed. The
+tasks left unfinished are therefore rerun one by one, each in a fresh
+single-worker pool, so only a task that crashes its own worker fails.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+
+def run_in_workers(function, tasks, jobs):
+    """
+    Call a function for every task in worker processes.
+
+    Args:
+        function (callable): Picklable module-level function
+        tasks (dict): Task key -> tuple of positional arguments
+        jobs (int): Number of worker processes
+
+    Yields:
+        tuple: (key, result, error) in completion order; error is None on
+            success, else the exception and result is None
+    """
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(function, *args): key for key, args in tasks.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                yield key, future.result(), None
+            except BrokenProcessPool:
+                # Any worker's crash lands here; which task caused it is unknown
+                unfinished.append(key)
+            except Exception as e:
+                yield key, None, e
+
+    if unfinished:
+        print(f"⚠️  A worker process crashed; rerunning {len(unfinished)} unfinished tasks one at a time")
+    for key in sorted(unfinished, key=list(tasks).index):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(function, *tasks[key])
+            try:
+                yield key, future.result(), None
+            except Exception as e:
+                yield key, None, e
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming XES to CSV Conversion
+
+This module converts XES event logs to the same CSV (columnar, mapped) output as
+`process_xes_to_csv`, but parses the log trace by trace with `iterparse`
+instead of loading it through pm4py. Rows are buffered until a chunk is full
+and then written, so peak memory depends on the chunk size and the largest
+trace rather than on the size of the whole log. The per-event-type quantile
+sketches and the memory-mapped columns (mapped_log.MappedChunkWriter) are
+built chunk by chunk as well.
+
+The exact statistics sidecar (`processed_*.stats.json`) needs every value of
+an event type at once, so it is not written here: the dashboard sorts from
+the loaded events (or the sketches) until `stats_report.py` writes it.
+
+Unlike the in-memory path, rows are written in file order of the traces
+(events are still sorted by timestamp within each trace). The CSV is written
+to a temporary file that replaces the output only once the whole log is
+converted; on failure the partial Parquet copy and mapped columns are
+removed, so a partial log is never served as a fresh one.
+"""
+
+import gzip
+import os
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+
+try:
+    from .event_sketches import EventTypeSketches, save_event_sketches
+    from .mapped_log import MappedChunkWriter
+    from .storage import ColumnarChunkWriter, COLUMNAR_AVAILABLE, columnar_path_for
+    from .time_features import add_time_features
+except ImportError:  # executed as a script
+    from event_sketches import EventTypeSketches, save_event_sketches
+    from mapped_log import MappedChunkWriter
+    from storage import ColumnarChunkWriter, COLUMNAR_AVAILABLE, columnar_path_for
+    from time_features import add_time_features
+
+# Default number of events buffered before a chunk is written
+DEFAULT_CHUNK_EVENTS = 100_000
+
+# XES attribute elements that carry a single value
+ATTRIBUTE_TYPES = {'string', 'date', 'int', 'float', 'boolean', 'id'}
+
+# Internal column used to keep traces apart inside a chunk
+TRACE_COLUMN = '__trace__'
+
+
+def _local_name(tag):
+    """Strip the XML namespace from a tag."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _open_xes(xes_path):
+    """Open a plain or gzip-compressed XES file for binary reading."""
+    if str(xes_path).endswith('.gz'):
+        return gzip.open(xes_path, 'rb')
+    return open(xes_path, 'rb')
+
+
+def _read_attributes(elem):
+    """Yield (key, type, value) for the direct value attributes of an element."""
+    for child in elem:
+        attribute_type = _local_name(child.tag)
+        if attribute_type in ATTRIBUTE_TYPES:
+            yield child.get('key'), attribute_type, child.get('value')
+
+
+def _iter_traces(xes_path):
+    """
+    Iterate over the traces of an XES file without building the full tree.
+
+    Yields:
+        tuple: (case_attributes, events) where case_attributes is a list of
+        (key, type, value) and events is a list of such lists
+    """
+    with _open_xes(xes_path) as xes_file:
+        context = ET.iterparse(xes_file, events=('start', 'end'))
+        _, root = next(context)
+
+        for event, elem in context:
+            if event != 'end' or _local_name(elem.tag) != 'trace':
+                continue
+
+            case_attributes = list(_read_attributes(elem))
+            events = [
+                list(_read_attributes(child))
+                for child in elem
+                if _local_name(child.tag) == 'event'
+            ]
+            yield case_attributes, events
+
+            # Drop the parsed trace so the tree never grows beyond one trace
+            elem.clear()
+            root.clear()
+
+
+def scan_xes_schema(xes_path):
+    """
+    Collect the event and case attribute keys (and their types) of an XES log.
+
+    This is a cheap streaming pass used to fix the output columns before
+    any chunk is written.
+
+    Args:
+        xes_path (str): Path to input XES file
+
+    Returns:
+        tuple: (event_types, case_types) dicts mapping attribute key to XES type,
+        in first-seen order
+    """
+    event_types = {}
+    case_types = {}
+
+    def record(types, key, attribute_type):
+        previous = types.setdefault(key, attribute_type)
+        if previous != attribute_type:
+            # Conflicting declarations are stored as plain strings
+            types[key] = 'string'
+
+    for case_attributes, events in _iter_traces(xes_path):
+        for key, attribute_type, _ in case_attributes:
+            record(case_types, key, attribute_type)
+        for event_attributes in events:
+            for key, attribute_type, _ in event_attributes:
+                record(event_types, key, attribute_type)
+
+    return event_types, case_types
+
+
+def _convert_column(values, attribute_type):
+    """Vectorized conversion of raw XES attribute strings to typed values."""
+    if attribute_type == 'date':
+        return pd.to_datetime(values, utc=True, format='ISO8601')
+    if attribute_type in ('int', 'float'):
+        return pd.to_numeric(values, errors='coerce').astype('float64')
+    if attribute_type == 'boolean':
+        return values.str.lower().map({'true': True, 'false': False}).astype('boolean')
+    return values.astype('string')
+
+
+def _build_chunk(rows, column_types):
+    """
+    Turn buffered rows into a typed DataFrame with its time features.
+
+    Args:
+        rows (list): Row dicts of whole traces, including TRACE_COLUMN
+        column_types (dict): Output column name to XES type
+
+    Returns:
+        pd.DataFrame: Chunk sorted by trace and timestamp
+    """
+    df = pd.DataFrame(rows, columns=[TRACE_COLUMN] + list(column_types))
+
+    for column, attribute_type in column_types.items():
+        df[column] = _convert_column(df[column], attribute_type)
+
+    # Sort by trace and timestamp, then calculate time since case start and since the previous event (in hours)
+    df = add_time_features(df, case_column=TRACE_COLUMN)
+    return df.drop(columns=TRACE_COLUMN)
+
+
+def stream_xes_to_csv(xes_path, csv_path, chunk_events=DEFAULT_CHUNK_EVENTS, write_columnar=True):
+    """
+    Convert an XES event log to CSV with bounded memory.
+
+    Args:
+        xes_path (str): Path to input XES file (optionally .gz compressed)
+        csv_path (str): Path to output CSV file
+        chunk_events (int): Number of events buffered before a chunk is written
+        write_columnar (bool): Also write the typed Parquet copy
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    columnar_writer = None
+    mapped_writer = None
+    tmp_csv_path = f'{csv_path}.tmp-{os.getpid()}'
+    try:
+        print(f"   Streaming XES file: {xes_path}")
+
+        event_types, case_types = scan_xes_schema(xes_path)
+        if event_types.get('time:timestamp') != 'date':
+            raise ValueError("events have no 'time:timestamp' date attribute")
+
+        column_types = dict(event_types)
+        column_types.update({f'case:{key}': value for key, value in case_types.items()})
+
+        if write_columnar and COLUMNAR_AVAILABLE:
+            columnar_writer = ColumnarChunkWriter(csv_path)
+
+        mapped_writer = MappedChunkWriter(csv_path)
+        sketches = EventTypeSketches()
+        rows = []
+        n_cases = 0
+        n_events = 0
+        header = True
+
+        def flush():
+            nonlocal header
+            chunk = _build_chunk(rows, column_types)
+            chunk.to_csv(tmp_csv_path, index=False, mode='w' if header else 'a', header=header)
+            if columnar_writer is not None:
+                columnar_writer.write(chunk)
+            sketches.update(chunk)
+            mapped_writer.write(chunk)
+            header = False
+            rows.clear()
+
+        for case_attributes, events in _iter_traces(xes_path):
+            case_row = {f'case:{key}': value for key, _, value in case_attributes}
+            for event_attributes in events:
+                row = {key: value for key, _, value in event_attributes}
+                row.update(case_row)
+                row[TRACE_COLUMN] = n_cases
+                rows.append(row)
+
+            n_cases += 1
+            n_events += len(events)
+
+            # Only flush on trace boundaries so each trace stays in one chunk
+            if len(rows) >= chunk_events:
+                flush()
+
+        if rows or header:
+            flush()
+
+        print(f"   Streamed {n_cases} cases, {n_events} events")
+        if columnar_writer is not None:
+            columnar_writer.close()
+        # The CSV keeps the mtime of its last chunk, so the Parquet copy finished after it stays fresh
+        os.replace(tmp_csv_path, csv_path)
+        columnar_writer = None
+        print(f"   Saved to: {csv_path}")
+        if write_columnar and COLUMNAR_AVAILABLE:
+            print(f"   Saved columnar copy to: {columnar_path_for(csv_path)}")
+        save_event_sketches(sketches, csv_path)
+        mapped_writer.close()
+        mapped_writer = None
+
+        return True
+
+    except Exception as e:
+        print(f"   Error streaming {xes_path}: {e}")
+        return False
+
+    finally:
+        if columnar_writer is not None:
+            columnar_writer.abort()
+        if mapped_writer is not None:
+            mapped_writer.abort()
+        if os.path.exists(tmp_csv_path):
+            os.remove(tmp_csv_path)
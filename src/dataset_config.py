@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Dataset Configuration
+
+The datasets the dashboard offers and where their processed files live.
+Kept apart from app.py so command-line tools (e.g. the statistics report)
+can resolve dataset keys without building the Dash app.
+"""
+
+import os
+
+from data_processing.synthetic import load_registered_datasets
+
+DATASETS = {
+    'traffic_fines': {
+        'name': '🚗 Traffic Fines',
+        'file': 'processed_road_traffic_fine_management_process.csv',
+        'description': 'Road Traffic Fine Management Process',
+        'domain': 'Government',
+        'cases': '150,370',
+        'events': '561,470'
+    },
+    'bpi_2012': {
+        'name': '🏦 BPI Challenge 2012',
+        'file': 'processed_bpi_challenge_2012.csv',
+        'description': 'Loan Application Process',
+        'domain': 'Finance',
+        'cases': '13,087',
+        'events': '262,000'
+    },
+    'bpi_2017': {
+        'name': '🏦 BPI Challenge 2017',
+        'file': 'processed_bpi_challenge_2017.csv',
+        'description': 'Credit Application Process',
+        'domain': 'Finance',
+        'cases': '31,509',
+        'events': '1,202,267'
+    },
+    'sepsis': {
+        'name': '🏥 Sepsis Cases',
+        'file': 'processed_sepsis_cases___event_log.csv',
+        'description': 'Hospital Patient Treatment Process',
+        'domain': 'Healthcare',
+        'cases': '1,050',
+        'events': '15,214'
+    }
+}
+
+PROCESSED_DIR = os.path.join(os.path.dirname(__file__), '..', 'datasets', 'processed')
+
+# Generated logs (see data_processing/synthetic.py) are added as extra datasets
+for _key, _entry in load_registered_datasets(PROCESSED_DIR).items():
+    DATASETS.setdefault(_key, _entry)
+
+
+def get_dataset_path(dataset_key):
+    """Get the processed CSV path of a dataset."""
+    return os.path.join(PROCESSED_DIR, DATASETS[dataset_key]['file'])
@@ -0,0 +1,240 @@
+"""
+In-Process Dataset Store for the Dashboard
+
+This module keeps already-loaded (and already-filtered) event logs in memory
+so Dash callbacks do not re-read the processed files on every interaction.
+Entries are keyed by dataset key and the size/mtime of the files they were
+loaded from, evicted least-recently-used once a memory budget is exceeded,
+and safe to use from a threaded Dash server.
+"""
+
+import mmap
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def file_signature(*paths):
+    """
+    Build a cheap change-detection signature for a set of files.
+
+    Args:
+        *paths (str): File paths (missing files are recorded as absent)
+
+    Returns:
+        tuple: (path, mtime_ns, size) per path, or (path, None, None) if missing
+    """
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((str(path), None, None))
+    return tuple(signature)
+
+
+def _array_nbytes(array, counted):
+    """Bytes of an array's buffer unless it is memory-mapped or already counted."""
+    root = array
+    while True:
+        if isinstance(root, (np.memmap, mmap.mmap)):
+            # Mapped files live in the page cache, shared by all processes
+            return 0
+        if getattr(root, 'base', None) is None:
+            break
+        root = root.base
+    if id(root) in counted:
+        return 0
+    counted.add(id(root))
+    return int(root.nbytes if isinstance(root, np.ndarray) else array.nbytes)
+
+
+def _values_nbytes(values, counted):
+    """Bytes held by a Series or Index, counting shared buffers once."""
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        nbytes = _array_nbytes(values.array.codes, counted)
+        if id(dtype.categories) not in counted:
+            counted.add(id(dtype.categories))
+            nbytes += int(dtype.categories.memory_usage(deep=True))
+        return nbytes
+    if isinstance(values, pd.RangeIndex):
+        return int(values.memory_usage())
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+        return _array_nbytes(values.to_numpy(copy=False), counted)
+    if isinstance(values, pd.Index):
+        return int(values.memory_usage(deep=True))
+    return int(values.memory_usage(index=False, deep=True))
+
+
+def estimate_nbytes(value, counted=None):
+    """
+    Estimate the memory held by a cached value.
+
+    Views are counted at the size of the array they share, once; memory-mapped
+    arrays (e.g. from read_mapped_log) are not counted.
+
+    Args:
+        value: DataFrame, Series, NumPy array, list/tuple/dict of those, or other object
+        counted (set): ids of the buffers already counted (updated in place),
+            so values sharing memory with them add nothing
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    counted = set() if counted is None else counted
+    if isinstance(value, pd.DataFrame):
+        return _values_nbytes(value.index, counted) + sum(
+            _values_nbytes(series, counted) for _, series in value.items()
+        )
+    if isinstance(value, pd.Series):
+        return _values_nbytes(value.index, counted) + _values_nbytes(value, counted)
+    if isinstance(value, pd.Index):
+        return _values_nbytes(value, counted)
+    if isinstance(value, np.ndarray):
+        return _array_nbytes(value, counted)
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v, counted) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_nbytes(v, counted) for v in value)
+    return 64
+
+
+class DatasetEntry:
+    """
+    A loaded dataset plus memoized products derived from it.
+
+    The frame is shared between callbacks and must be treated as read-only.
+    """
+
+    def __init__(self, dataset_key, signature, df):
+        self.dataset_key = dataset_key
+        self.signature = signature
+        self.df = df
+        # Buffers already counted in nbytes, so derived views of them add nothing
+        self._counted = set()
+        self.nbytes = estimate_nbytes(df, self._counted)
+        self._derived = {}
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def memo(self, key, compute):
+        """
+        Return a derived value, computing it once per entry.
+
+        Only callers of the same key wait for each other; other keys (and
+        memo calls made by `compute` itself) proceed while it runs.
+
+        Args:
+            key (hashable): Identifier of the derived value
+            compute (callable): Zero-argument function producing the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        with self._lock:
+            if key in self._derived:
+                return self._derived[key]
+            key_lock = self._key_locks.setdefault(key, threading.RLock())
+
+        with key_lock:
+            # Another thread may have computed the value while we waited
+            with self._lock:
+                if key in self._derived:
+                    return self._derived[key]
+            value = compute()
+            with self._lock:
+                self._derived[key] = value
+                self.nbytes += estimate_nbytes(value, self._counted)
+                self._key_locks.pop(key, None)
+            return value
+
+
+class DatasetStore:
+    """
+    Thread-safe LRU store of loaded datasets bounded by a memory budget.
+
+    Args:
+        max_bytes (int): Memory budget; least-recently-used entries are evicted
+            once the total exceeds it (the most recent entry is always kept)
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def get(self, dataset_key, paths, loader):
+        """
+        Get a dataset entry, loading it if missing or if its files changed.
+
+        Concurrent requests for the same dataset wait for a single load.
+
+        Args:
+            dataset_key (str): Key of the dataset
+            paths (list): Files the dataset is loaded from (used for invalidation)
+            loader (callable): Zero-argument function returning the DataFrame
+
+        Returns:
+            DatasetEntry: Cached or freshly loaded entry
+        """
+        signature = file_signature(*paths)
+
+        entry = self._lookup(dataset_key, signature)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(dataset_key, threading.Lock())
+
+        with load_lock:
+            # Another thread may have finished the load while we waited
+            entry = self._lookup(dataset_key, signature)
+            if entry is not None:
+                return entry
+
+            entry = DatasetEntry(dataset_key, signature, loader())
+            with self._lock:
+                self._entries[dataset_key] = entry
+                self._entries.move_to_end(dataset_key)
+                self._evict()
+            return entry
+
+    def _lookup(self, dataset_key, signature):
+        with self._lock:
+            entry = self._entries.get(dataset_key)
+            if entry is None:
+                return None
+            if entry.signature != signature:
+                del self._entries[dataset_key]
+                return None
+            self._entries.move_to_end(dataset_key)
+            # Derived values may have grown the entry since it was stored
+            self._evict()
+            return entry
+
+    def _evict(self):
+        # Caller holds self._lock
+        while len(self._entries) > 1 and self.total_bytes() > self.max_bytes:
+            evicted_key, _ = self._entries.popitem(last=False)
+            print(f"Evicted dataset {evicted_key} from cache")
+
+    def total_bytes(self):
+        """Get the approximate memory held by all cached entries."""
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def clear(self):
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, dataset_key):
+        with self._lock:
+            return dataset_key in self._entries
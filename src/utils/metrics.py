@@ -0,0 +1,235 @@
+"""
+Lightweight Stage Timing Metrics
+
+This module times named stages of the dashboard callbacks and the XES
+processing pipeline, keeps the durations as in-memory histograms and renders
+them in the Prometheus text format for a `/metrics` route.
+
+Metrics are off unless PMVA_METRICS is set (1/true/yes). When off, `stage()`
+returns a shared no-op context manager and `instrument_callback` returns the
+callback unchanged, so the hot paths pay one function call per stage at most.
+With PMVA_SLOW_CALLBACK_MS set, callbacks slower than that are logged with
+their per-stage breakdown.
+
+Histograms live in the memory of the process that records them. Under
+gunicorn every worker has its own, and `/metrics` returns only those of the
+worker that answers the request: its counts cover one worker, not the
+whole server.
+"""
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+ENABLED = os.environ.get('PMVA_METRICS', '').lower() in ('1', 'true', 'yes')
+
+# Callbacks slower than this are logged (0 disables)
+SLOW_CALLBACK_SECONDS = float(os.environ.get('PMVA_SLOW_CALLBACK_MS', '0')) / 1000
+
+# Histogram bucket upper bounds in seconds (Prometheus defaults plus longer processing runs)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+STAGE_METRIC = 'pmva_stage_seconds'
+CALLBACK_METRIC = 'pmva_callback_seconds'
+REQUEST_METRIC = 'pmva_request_seconds'
+
+LABEL_NAMES = {
+    STAGE_METRIC: 'stage',
+    CALLBACK_METRIC: 'callback',
+    REQUEST_METRIC: 'route',
+}
+
+HELP = {
+    STAGE_METRIC: 'Duration of dashboard and processing stages',
+    CALLBACK_METRIC: 'Duration of Dash callbacks',
+    REQUEST_METRIC: 'Duration of Dash callback requests including serialization',
+}
+
+_NOOP = nullcontext()
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed durations."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Record one observation (caller holds the module lock)."""
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+                break
+
+
+# Metric name -> label value -> Histogram
+_histograms = {}
+
+
+def observe(metric, label, seconds):
+    """
+    Record a duration.
+
+    Args:
+        metric (str): Metric name (STAGE_METRIC, CALLBACK_METRIC or REQUEST_METRIC)
+        label (str): Stage, callback or route name
+        seconds (float): Duration
+    """
+    with _lock:
+        histogram = _histograms.setdefault(metric, {}).get(label)
+        if histogram is None:
+            histogram = _histograms[metric][label] = Histogram()
+        histogram.observe(seconds)
+
+    timings = getattr(_local, 'timings', None)
+    if timings is not None and metric == STAGE_METRIC:
+        timings.append((label, seconds))
+
+
+@contextmanager
+def _timed_stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(STAGE_METRIC, name, time.perf_counter() - start)
+
+
+def stage(name):
+    """
+    Time a block as a named stage.
+
+    Usage:
+        with metrics.stage('read'):
+            df = read_compact_log(path)
+
+    Args:
+        name (str): Stage name
+
+    Returns:
+        Context manager (a shared no-op one when metrics are disabled)
+    """
+    if not ENABLED:
+        return _NOOP
+    return _timed_stage(name)
+
+
+@contextmanager
+def collect_stages():
+    """
+    Collect the (stage, seconds) pairs recorded by this thread inside the block.
+
+    Yields:
+        list: Filled with the stage timings as they are recorded
+    """
+    previous = getattr(_local, 'timings', None)
+    _local.timings = timings = []
+    try:
+        yield timings
+    finally:
+        _local.timings = previous
+
+
+def format_stages(timings):
+    """Format stage timings as 'read=12ms, transform=3ms'."""
+    return ', '.join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in timings)
+
+
+def instrument_callback(func):
+    """
+    Decorator timing a Dash callback and logging it if it is slow.
+
+    Place it below @app.callback. Returns the function unchanged when
+    metrics are disabled.
+    """
+    if not ENABLED:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        with collect_stages() as timings:
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                observe(CALLBACK_METRIC, func.__name__, elapsed)
+                if SLOW_CALLBACK_SECONDS and elapsed > SLOW_CALLBACK_SECONDS:
+                    print(f"🐢 Slow callback {func.__name__}: {elapsed * 1000:.0f}ms ({format_stages(timings)})")
+    return wrapper
+
+
+def _format_bound(bound):
+    return f'{bound:g}'
+
+
+def render_prometheus():
+    """
+    Render all histograms in the Prometheus text exposition format.
+
+    Returns:
+        str: Metrics text
+    """
+    lines = []
+    with _lock:
+        for metric, histograms in sorted(_histograms.items()):
+            label_name = LABEL_NAMES.get(metric, 'label')
+            lines.append(f'# HELP {metric} {HELP.get(metric, metric)}')
+            lines.append(f'# TYPE {metric} histogram')
+            for label, histogram in sorted(histograms.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{label_name}="{label}",le="{_format_bound(bound)}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{label_name}="{label}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{metric}_sum{{{label_name}="{label}"}} {histogram.sum:.6f}')
+                lines.append(f'{metric}_count{{{label_name}="{label}"}} {histogram.count}')
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    """Drop all recorded observations."""
+    with _lock:
+        _histograms.clear()
+
+
+def register_metrics_route(server, path='/metrics'):
+    """
+    Add the metrics route and request timing to a Flask server.
+
+    Does nothing when metrics are disabled. Dash callback requests are timed
+    as a whole, so request minus callback time is the JSON serialization and
+    transport overhead.
+
+    Args:
+        server (flask.Flask): Server of the Dash app (app.server)
+        path (str): Route of the metrics endpoint
+    """
+    if not ENABLED:
+        return
+
+    from flask import Response, g, request
+
+    @server.route(path)
+    def metrics_endpoint():
+        return Response(render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+    @server.before_request
+    def start_request_timer():
+        g.pmva_request_start = time.perf_counter()
+
+    @server.after_request
+    def record_request_time(response):
+        start = getattr(g, 'pmva_request_start', None)
+        if start is not None and request.path.startswith('/_dash-update-component'):
+            observe(REQUEST_METRIC, request.path, time.perf_counter() - start)
+        return response
@@ -0,0 +1,254 @@
+"""
+Mergeable Quantile Sketches (KLL)
+
+This module implements the KLL quantile sketch (Karnin, Lang, Liberty 2016)
+with NumPy arrays, so quantiles of a value stream can be estimated in
+bounded memory, one batch (chunk, file) at a time.
+
+A sketch keeps its items in levels; an item on level h stands for 2**h
+values. When a level exceeds its capacity it is sorted and every other item
+(starting at a random offset) moves one level up. Capacities shrink by a
+factor 2/3 per level below the top, and levels are only compacted once the
+sketch as a whole is full, so a sketch holds at most about 3 * k items
+whatever the stream length. Count, minimum and maximum are tracked exactly,
+mean and variance with the pairwise update of Chan et al. (exact up to
+floating point rounding).
+
+Error bounds: the rank of a returned quantile deviates from the requested
+rank by at most eps * n with high probability, where eps = O(1/k). For the
+default k = 200 the largest normalized rank error over the 1st-99th
+percentiles measured by benchmarks/bench_quantile_sketch.py is 0.15-0.6% for
+streams of 10k-10M values, fed at once or in chunks and after merges, with
+300-600 retained items (2-4 KiB as JSON). In value terms, a rank error of
+0.01 moves a median by up to the distance between the 49th and 51st
+percentile, which is large only where the distribution is sparse. Streams of
+at most k values are kept completely and give exact order statistics (up to
+float32 rounding once serialized).
+
+Sketches with the same k merge into a sketch of the combined stream with the
+same guarantee, and serialize to JSON-safe dicts (items as base64 float32).
+"""
+
+import base64
+
+import numpy as np
+
+# Accuracy parameter (level-0 capacity); memory and error scale with k and 1/k
+DEFAULT_K = 200
+
+# Capacity ratio between adjacent levels and smallest capacity of any level
+CAPACITY_RATIO = 2 / 3
+MIN_CAPACITY = 8
+
+# Seed of the compaction coin flips; a fixed seed makes sketches reproducible
+DEFAULT_SEED = 0
+
+
+def _encode(items):
+    """Encode items as base64 float32."""
+    return base64.b64encode(np.asarray(items, dtype='<f4').tobytes()).decode('ascii')
+
+
+def _decode(text):
+    """Decode base64 float32 items."""
+    return np.frombuffer(base64.b64decode(text), dtype='<f4').astype(np.float64)
+
+
+class KLLSketch:
+    """
+    Approximate quantiles of a stream of values (see module docstring).
+
+    Args:
+        k (int): Accuracy parameter (default: 200)
+        seed (int): Seed of the compaction coin flips
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=DEFAULT_SEED):
+        self.k = int(k)
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - 1 - level
+        return max(int(np.ceil(self.k * CAPACITY_RATIO ** depth)), MIN_CAPACITY)
+
+    def _compress(self):
+        """Compact levels until the sketch is within its total capacity."""
+        # Lazy compaction: levels may exceed their own capacity while there is room
+        # elsewhere, so the sketch keeps (and uses) about all of its capacity
+        while self.retained > sum(self._capacity(level) for level in range(len(self.levels))):
+            level = next(h for h, items in enumerate(self.levels) if len(items) > self._capacity(h))
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[level])
+            # With an odd count the smallest item stays, so the total weight is unchanged
+            odd = len(items) % 2
+            promoted = items[odd + self._rng.integers(2)::2]
+            self.levels[level] = items[:odd]
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def _add_moments(self, n, mean, m2):
+        """Combine the count, mean and sum of squared deviations with those of another batch."""
+        total = self.n + n
+        delta = mean - self._mean
+        self._mean += delta * n / total
+        self._m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+
+    def update(self, values):
+        """
+        Add values to the sketch (NaN values are skipped).
+
+        Args:
+            values (array-like): Values of one batch
+
+        Returns:
+            KLLSketch: self
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        batch_mean = float(values.mean())
+        self._add_moments(len(values), batch_mean, float(np.sum((values - batch_mean) ** 2)))
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Add the stream of another sketch to this one.
+
+        Args:
+            other (KLLSketch): Sketch with the same k
+
+        Returns:
+            KLLSketch: self
+        """
+        if other.k != self.k:
+            raise ValueError(f"cannot merge sketches with k={self.k} and k={other.k}")
+        if other.n == 0:
+            return self
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self._add_moments(other.n, other._mean, other._m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def weighted_items(self):
+        """
+        Get the retained items with their weights, sorted by value.
+
+        Returns:
+            tuple: (items, weights) float arrays; weights sum to n
+        """
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items_h), 2.0 ** h) for h, items_h in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], weights[order]
+
+    def quantiles(self, qs):
+        """
+        Estimate quantiles (0 gives the exact minimum, 1 the exact maximum).
+
+        Args:
+            qs (array-like): Quantiles in [0, 1]
+
+        Returns:
+            np.ndarray: Estimated values (NaN for an empty sketch)
+        """
+        qs = np.asarray(qs, dtype=np.float64)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        items, weights = self.weighted_items()
+        cumulative = np.cumsum(weights)
+        # Smallest item whose cumulative weight reaches q * n
+        positions = np.searchsorted(cumulative, qs * self.n, side='left')
+        values = items[np.clip(positions, 0, len(items) - 1)]
+        values = np.clip(values, self.min, self.max)
+        return np.where(qs <= 0, self.min, np.where(qs >= 1, self.max, values))
+
+    def quantile(self, q):
+        """Estimate one quantile (see quantiles)."""
+        return float(self.quantiles([q])[0])
+
+    def rank(self, value):
+        """
+        Estimate the fraction of values less than or equal to a value.
+
+        Args:
+            value (float): Value
+
+        Returns:
+            float: Normalized rank in [0, 1] (NaN for an empty sketch)
+        """
+        if self.n == 0:
+            return np.nan
+        items, weights = self.weighted_items()
+        return float(weights[:np.searchsorted(items, value, side='right')].sum() / self.n)
+
+    @property
+    def mean(self):
+        """Mean of the values (NaN if empty)."""
+        return self._mean if self.n else np.nan
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1; NaN for fewer than 2 values)."""
+        if self.n < 2:
+            return np.nan
+        return float(np.sqrt(max(self._m2, 0.0) / (self.n - 1)))
+
+    @property
+    def retained(self):
+        """Number of items the sketch stores."""
+        return sum(len(items) for items in self.levels)
+
+    def to_dict(self):
+        """
+        Serialize the sketch.
+
+        Returns:
+            dict: JSON-safe representation (see from_dict)
+        """
+        empty = self.n == 0
+        return {
+            'k': self.k,
+            'n': int(self.n),
+            'min': None if empty else self.min,
+            'max': None if empty else self.max,
+            'mean': self._mean,
+            'm2': self._m2,
+            'levels': [_encode(items) for items in self.levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data, seed=DEFAULT_SEED):
+        """
+        Restore a sketch serialized with to_dict.
+
+        Args:
+            data (dict): Serialized sketch
+            seed (int): Seed for further compactions
+
+        Returns:
+            KLLSketch: Restored sketch
+        """
+        sketch = cls(data['k'], seed=seed)
+        sketch.levels = [_decode(items) for items in data['levels']] or [np.empty(0)]
+        sketch.n = int(data['n'])
+        if sketch.n:
+            sketch.min, sketch.max = float(data['min']), float(data['max'])
+        sketch._mean, sketch._m2 = float(data['mean']), float(data['m2'])
+        return sketch
@@ -0,0 +1,89 @@
+"""
+Stratified Event Sampling for Interactive Rendering
+
+This module draws a deterministic, stratified sample of events per event
+type so the dashboard can render huge logs with a bounded number of points.
+
+Every event gets a seeded pseudo-random priority and each event type keeps
+the events with the smallest priorities. This is the set a priority
+(bottom-k) reservoir keeps after one pass over the log; it is computed here
+with vectorized NumPy operations instead of a Python loop. The quota of each
+event type is proportional to its share of the events (with a floor so rare
+types remain drawable), and the smallest and largest value of every type are
+always kept, so minimum and maximum stay exact.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Seed of the event priorities; a fixed seed makes samples reproducible
+DEFAULT_SEED = 0
+
+# Minimum number of events kept per event type (or all of them if fewer)
+MIN_STRATUM_SIZE = 200
+
+
+def stratum_quotas(counts, cap, min_stratum=MIN_STRATUM_SIZE):
+    """
+    Split a sample size over strata proportionally to their sizes.
+
+    Args:
+        counts (np.ndarray): Number of events per stratum
+        cap (int): Target total sample size
+        min_stratum (int): Minimum quota per stratum
+
+    Returns:
+        np.ndarray: Quota per stratum, never larger than the stratum
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    total = counts.sum()
+    if total == 0:
+        return counts.copy()
+    proportional = np.floor(counts * (cap / total)).astype(np.int64)
+    return np.minimum(counts, np.maximum(proportional, min_stratum))
+
+
+def stratified_sample_indices(groups, values, cap, seed=DEFAULT_SEED, min_stratum=MIN_STRATUM_SIZE):
+    """
+    Select a stratified sample of events.
+
+    Args:
+        groups (array-like): Stratum (event type) of each event
+        values (array-like): Value of each event; the first minimum and maximum
+            of each stratum are always included
+        cap (int): Target sample size; the result can exceed it slightly because
+            of per-stratum floors and the kept extremes
+        seed (int): Seed of the event priorities
+        min_stratum (int): Minimum number of events kept per stratum
+
+    Returns:
+        np.ndarray: Sorted positions of the sampled events
+    """
+    codes, _ = pd.factorize(pd.Series(groups), sort=False)
+    values = np.asarray(values, dtype=np.float64)
+    n_events = len(codes)
+    if n_events <= cap:
+        return np.arange(n_events)
+
+    counts = np.bincount(codes[codes >= 0])
+    quotas = stratum_quotas(counts, cap, min_stratum)
+
+    # Bottom-k priorities per stratum: sort by (stratum, priority) and keep each stratum's head.
+    # Code plus a priority in [0, 1) orders by stratum first with a single float sort.
+    priorities = np.random.default_rng(seed).random(n_events)
+    order = np.argsort(codes + priorities)
+    sorted_codes = codes[order]
+    starts = np.searchsorted(sorted_codes, np.arange(len(counts)))
+    valid = sorted_codes >= 0
+    rank = np.arange(n_events) - starts[np.where(valid, sorted_codes, 0)]
+    keep = np.zeros(n_events, dtype=bool)
+    keep[order[valid & (rank < quotas[np.where(valid, sorted_codes, 0)])]] = True
+
+    # Always keep the extremes of every stratum
+    present = (codes >= 0) & ~np.isnan(values)
+    positions = np.flatnonzero(present)
+    by_stratum = pd.Series(values[present], index=positions).groupby(codes[present])
+    for extreme in (by_stratum.idxmin(), by_stratum.idxmax()):
+        keep[extreme.to_numpy(dtype=np.int64)] = True
+
+    return np.flatnonzero(keep)
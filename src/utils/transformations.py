@@ -3,10 +3,98 @@ Time Transformation Methods for Process Mining Visualization
 
 This module contains various time transformation methods used to preprocess
 event log time data for better visualization in violin plots.
+
+Transformations live in a registry of named, vectorized NumPy functions.
+New ones (including user-defined ones) are added with
+`register_transformation`. The dashboard reads the dropdown options once,
+when src/app.py builds its layout, so register them before importing the
+app module; later registrations can be applied but do not show up in the
+dropdown.
 """
 
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
+
+
+# Registry of named transformations, in dropdown order
+TRANSFORMATIONS = {}
+
+# Transformation used for unknown names
+DEFAULT_TRANSFORMATION = 'log_hours'
+
+# Placeholder in axis titles for the plotted time measure
+METRIC_PLACEHOLDER = '{metric}'
+DEFAULT_METRIC_TITLE = 'Time Since Case Start'
+
+
+def register_transformation(name, function, label, x_title, plot_title,
+                            elementwise=True, description=None):
+    """
+    Register a named time transformation.
+    
+    Args:
+        name (str): Key used in the dropdown and in caches
+        function (callable): Vectorized function mapping a float ndarray of
+            hours to an ndarray of the same length
+        label (str): Dropdown label
+        x_title (str): X-axis title of the plot; '{metric}' is replaced by
+            the name of the plotted time measure (see get_axis_title)
+        plot_title (str): Plot title
+        elementwise (bool): True if each output value depends only on its own
+            input value (results can then be computed once per dataset and
+            subset freely); False for data-fitted transformations like min-max
+        description (dict): Optional entry for TRANSFORMATION_DESCRIPTIONS
+            (name, description, use_case, formula)
+    """
+    TRANSFORMATIONS[name] = {
+        'function': function,
+        'label': label,
+        'x_title': x_title,
+        'plot_title': plot_title,
+        'elementwise': elementwise,
+    }
+    if description is not None:
+        TRANSFORMATION_DESCRIPTIONS[name] = description
+
+
+def get_transformation(transformation_type):
+    """
+    Look up a registered transformation (falls back to the default one).
+    
+    Args:
+        transformation_type (str): Name of the transformation
+        
+    Returns:
+        dict: Registry entry with function, label, titles and elementwise flag
+    """
+    return TRANSFORMATIONS.get(transformation_type, TRANSFORMATIONS[DEFAULT_TRANSFORMATION])
+
+
+def get_axis_title(transformation_type, metric_title=DEFAULT_METRIC_TITLE):
+    """
+    Get the x-axis title of a transformation for a time measure.
+    
+    Args:
+        transformation_type (str): Name of the transformation
+        metric_title (str): Name of the time measure, e.g. 'Time Since Previous Event'
+        
+    Returns:
+        str: Axis title
+    """
+    return get_transformation(transformation_type)['x_title'].replace(METRIC_PLACEHOLDER, metric_title)
+
+
+def apply_transformation(data, transformation_type):
+    """
+    Apply a registered transformation to time data.
+    
+    Args:
+        data (array-like): Time measure in hours
+        transformation_type (str): Name of the transformation
+        
+    Returns:
+        np.ndarray: Transformed values
+    """
+    return get_transformation(transformation_type)['function'](np.asarray(data, dtype=np.float64))
 
 
 def transform_time_data(data, transformation_type):
@@ -20,45 +108,9 @@ def transform_time_data(data, transformation_type):
     Returns:
         tuple: (transformed_data, x_axis_title, plot_title)
     """
-    
-    if transformation_type == 'raw_hours':
-        transformed_data = data
-        x_title = "Time Since Case Start (Hours)"
-        plot_title = "🕐 Event Time Distribution - Raw Time (Hours)"
-        
-    elif transformation_type == 'raw_days':
-        transformed_data = data / 24
-        x_title = "Time Since Case Start (Days)"
-        plot_title = "📅 Event Time Distribution - Raw Time (Days)"
-        
-    elif transformation_type == 'raw_weeks':
-        transformed_data = np.round(data / (24 * 7), 1)  # Round to 1 decimal place
-        x_title = "Time Since Case Start (Weeks)"
-        plot_title = "📊 Event Time Distribution - Raw Time (Weeks)"
-        
-    elif transformation_type == 'raw_months':
-        # Convert to months and round to whole numbers
-        transformed_data = np.round(data / (24 * 30.44), 0)  # Round to whole months
-        x_title = "Time Since Case Start (Months)"
-        plot_title = "📆 Event Time Distribution - Raw Time (Months)"
-        
-    elif transformation_type == 'sqrt_hours':
-        transformed_data = np.sqrt(data)
-        x_title = "√(Time Since Case Start) (√Hours)"
-        plot_title = "√ Event Time Distribution - Square Root Time"
-        
-    elif transformation_type == 'minmax':
-        scaler = MinMaxScaler()
-        transformed_data = scaler.fit_transform(data.values.reshape(-1, 1)).flatten()
-        x_title = "Min-Max Scaled Time (0-1)"
-        plot_title = "📏 Event Time Distribution - Min-Max Scaled"
-        
-    else:  # log_hours (default)
-        transformed_data = np.log1p(data)
-        x_title = "Log(Time Since Case Start + 1)"
-        plot_title = "📊 Event Time Distribution - Log Time"
-    
-    return transformed_data, x_title, plot_title
+    transformation = get_transformation(transformation_type)
+    transformed_data = apply_transformation(data, transformation_type)
+    return transformed_data, get_axis_title(transformation_type), transformation['plot_title']
 
 
 def get_transformation_options():
@@ -69,16 +121,22 @@ def get_transformation_options():
         list: List of transformation options with labels and values
     """
     return [
-        {'label': '📊 Log Time (Hours)', 'value': 'log_hours'},
-        {'label': '🕐 Raw Time (Hours)', 'value': 'raw_hours'},
-        {'label': '📅 Raw Time (Days)', 'value': 'raw_days'},
-        {'label': '📊 Raw Time (Weeks)', 'value': 'raw_weeks'},
-        {'label': '📆 Raw Time (Months)', 'value': 'raw_months'},
-        {'label': '√ Square Root (Hours)', 'value': 'sqrt_hours'},
-        {'label': '📏 Min-Max Scaled', 'value': 'minmax'}
+        {'label': transformation['label'], 'value': name}
+        for name, transformation in TRANSFORMATIONS.items()
     ]
 
 
+def min_max_scale(data):
+    """Scale values to the range 0-1 (all zeros if the values are constant); NaN stays NaN and is ignored, as in sklearn's MinMaxScaler."""
+    if len(data) == 0 or np.isnan(data).all():
+        return data.copy()
+    low = np.nanmin(data)
+    value_range = np.nanmax(data) - low
+    if value_range == 0:
+        return np.where(np.isnan(data), np.nan, 0.0)
+    return (data - low) / value_range
+
+
 # Transformation descriptions for documentation
 TRANSFORMATION_DESCRIPTIONS = {
     'log_hours': {
@@ -124,3 +182,35 @@ TRANSFORMATION_DESCRIPTIONS = {
         'formula': '(x - min) / (max - min)'
     }
 }
+
+
+# Built-in transformations
+register_transformation(
+    'log_hours', np.log1p,
+    '📊 Log Time (Hours)', "Log({metric} + 1)", "📊 Event Time Distribution - Log Time"
+)
+register_transformation(
+    'raw_hours', lambda data: data,
+    '🕐 Raw Time (Hours)', "{metric} (Hours)", "🕐 Event Time Distribution - Raw Time (Hours)"
+)
+register_transformation(
+    'raw_days', lambda data: data / 24,
+    '📅 Raw Time (Days)', "{metric} (Days)", "📅 Event Time Distribution - Raw Time (Days)"
+)
+register_transformation(
+    'raw_weeks', lambda data: np.round(data / (24 * 7), 1),  # Round to 1 decimal place
+    '📊 Raw Time (Weeks)', "{metric} (Weeks)", "📊 Event Time Distribution - Raw Time (Weeks)"
+)
+register_transformation(
+    'raw_months', lambda data: np.round(data / (24 * 30.44), 0),  # Round to whole months
+    '📆 Raw Time (Months)', "{metric} (Months)", "📆 Event Time Distribution - Raw Time (Months)"
+)
+register_transformation(
+    'sqrt_hours', np.sqrt,
+    '√ Square Root (Hours)', "√({metric}) (√Hours)", "√ Event Time Distribution - Square Root Time"
+)
+register_transformation(
+    'minmax', min_max_scale,
+    '📏 Min-Max Scaled', "Min-Max Scaled Time (0-1)", "📏 Event Time Distribution - Min-Max Scaled",
+    elementwise=False
+)
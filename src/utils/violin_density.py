@@ -0,0 +1,475 @@
+"""
+Server-Side Violin Plot Construction
+
+This module computes violin densities, quartiles and whiskers per event type
+on the server and turns them into fixed-size Plotly traces, so the figure
+sent to the browser no longer contains every event value.
+
+Each violin is drawn as a filled outline (256 density points by default)
+with a precomputed box on top. The settings mirror Plotly's own violin
+defaults: Gaussian kernel, Silverman's rule-of-thumb bandwidth, a 'soft'
+span of two bandwidths beyond the data, all violins of a figure scaled to a
+common maximum width, and outliers beyond the 1.5 IQR whiskers as points.
+
+Every violin sits on its own hidden y-axis overlaying the main axis, so the
+violin order is purely a layout property (the axis ranges and tick labels)
+and a re-sorted figure can be sent as a small layout update.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+try:
+    from utils.quantile_sketch import KLLSketch
+except ImportError:  # utils directory on sys.path
+    from quantile_sketch import KLLSketch
+
+# Number of points per violin outline
+DENSITY_POINTS = 256
+
+# Half of the violin width and the full box width, in category units
+VIOLIN_HALF_WIDTH = 0.35
+BOX_WIDTH = 0.175
+
+# Outlier markers kept per violin (evenly spread over the sorted outliers)
+MAX_OUTLIERS = 64
+
+
+def rule_of_thumb_bandwidth(n, std, q1, q3, value_range):
+    """
+    Rule-of-thumb KDE bandwidth as used by Plotly violins, from summary statistics.
+
+    Args:
+        n (int): Number of values
+        std (float): Sample standard deviation (ddof=1)
+        q1 (float): First quartile
+        q3 (float): Third quartile
+        value_range (float): Maximum minus minimum
+
+    Returns:
+        float: Positive bandwidth
+    """
+    std = std if n > 1 else 0.0
+    spread = min(std, (q3 - q1) / 1.349) if q3 > q1 else std
+    bandwidth = 1.059 * spread * n ** -0.2
+    if bandwidth > 0:
+        return bandwidth
+    return value_range / 100 if value_range > 0 else 1.0
+
+
+def silverman_bandwidth(values, q1, q3):
+    """
+    Rule-of-thumb KDE bandwidth as used by Plotly violins.
+
+    Args:
+        values (np.ndarray): Sample values
+        q1 (float): First quartile
+        q3 (float): Third quartile
+
+    Returns:
+        float: Positive bandwidth
+    """
+    n = len(values)
+    std = float(np.std(values, ddof=1)) if n > 1 else 0.0
+    value_range = float(np.max(values) - np.min(values)) if n else 0.0
+    return rule_of_thumb_bandwidth(n, std, q1, q3, value_range)
+
+
+def linear_bin_counts(values, grid):
+    """
+    Spread values onto an evenly spaced grid, each split between its two neighbouring points.
+
+    Counts of several batches on the same grid add up to the counts of all values.
+
+    Args:
+        values (np.ndarray): Sample values
+        grid (np.ndarray): Evenly spaced grid points
+
+    Returns:
+        np.ndarray: Weight per grid point (sums to the number of values)
+    """
+    n_points = len(grid)
+    step = grid[1] - grid[0]
+
+    position = (values - grid[0]) / step
+    left = np.clip(np.floor(position).astype(np.int64), 0, n_points - 2)
+    weight_right = np.clip(position - left, 0.0, 1.0)
+    counts = np.bincount(left, weights=1.0 - weight_right, minlength=n_points)
+    counts += np.bincount(left + 1, weights=weight_right, minlength=n_points)
+    return counts
+
+
+def smooth_bin_counts(counts, grid, bandwidth, n):
+    """
+    Convolve binned counts with a sampled Gaussian kernel into a density.
+
+    Args:
+        counts (np.ndarray): Weight per grid point (see linear_bin_counts)
+        grid (np.ndarray): Evenly spaced grid points
+        bandwidth (float): Kernel bandwidth
+        n (int): Number of values the counts were built from
+
+    Returns:
+        np.ndarray: Density at each grid point
+    """
+    n_points = len(grid)
+    step = grid[1] - grid[0]
+
+    half_length = min(int(np.ceil(4 * bandwidth / step)), n_points - 1)
+    offsets = np.arange(-half_length, half_length + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+
+    smoothed = np.convolve(counts, kernel, mode='full')[half_length:half_length + n_points]
+    return smoothed / (n * bandwidth * np.sqrt(2 * np.pi))
+
+
+def binned_kde(values, grid, bandwidth):
+    """
+    Gaussian KDE evaluated on an evenly spaced grid via linear binning.
+
+    Values are spread onto the grid points and convolved with a sampled
+    Gaussian kernel, which costs O(n + points * kernel) instead of O(n * points).
+
+    Args:
+        values (np.ndarray): Sample values
+        grid (np.ndarray): Evenly spaced evaluation points
+        bandwidth (float): Kernel bandwidth
+
+    Returns:
+        np.ndarray: Density at each grid point
+    """
+    return smooth_bin_counts(linear_bin_counts(values, grid), grid, bandwidth, len(values))
+
+
+def _spread_outliers(outliers, max_outliers):
+    """Keep at most max_outliers of the sorted outliers, evenly spread."""
+    if len(outliers) > max_outliers:
+        outliers = outliers[np.linspace(0, len(outliers) - 1, max_outliers).round().astype(np.int64)]
+    return outliers
+
+
+def summarize_violin(values, n_points=DENSITY_POINTS, max_outliers=MAX_OUTLIERS, quartiles=None):
+    """
+    Compute everything needed to draw one violin with its inner box.
+
+    Args:
+        values (np.ndarray): Values of one event type
+        n_points (int): Number of density points
+        max_outliers (int): Maximum number of outlier markers kept
+        quartiles (tuple): Precomputed (q1, median, q3), e.g. from quantile
+            sketches; the values are then never sorted, only the outliers
+
+    Returns:
+        dict: grid, density, quartiles, whisker ends, mean, count and outliers
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return None
+
+    if quartiles is None:
+        values = np.sort(values)
+        q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    else:
+        q1, median, q3 = quartiles
+    iqr = q3 - q1
+    low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+    # Whiskers end at the most extreme values within 1.5 IQR of the box
+    if quartiles is None:
+        lowerfence = values[np.searchsorted(values, low, side='left')]
+        upperfence = values[np.searchsorted(values, high, side='right') - 1]
+        outliers = np.concatenate([values[values < lowerfence], values[values > upperfence]])
+    else:
+        inside = values[(values >= low) & (values <= high)]
+        # Approximate quartiles can put every value outside the fences; the box then has no whiskers
+        lowerfence, upperfence = (inside.min(), inside.max()) if len(inside) else (q1, q3)
+        outliers = np.sort(values[(values < low) | (values > high)])
+    outliers = _spread_outliers(outliers, max_outliers)
+
+    bandwidth = silverman_bandwidth(values, q1, q3)
+    grid = np.linspace(values.min() - 2 * bandwidth, values.max() + 2 * bandwidth, n_points)
+
+    return {
+        'grid': grid,
+        'density': binned_kde(values, grid, bandwidth),
+        'q1': float(q1),
+        'median': float(median),
+        'q3': float(q3),
+        'lowerfence': float(lowerfence),
+        'upperfence': float(upperfence),
+        'mean': float(values.mean()),
+        'count': int(len(values)),
+        'bandwidth': float(bandwidth),
+        'outliers': outliers,
+    }
+
+
+def summarize_groups(groups, values, n_points=DENSITY_POINTS, quartiles=None):
+    """
+    Compute violin summaries for every group with a single sort.
+
+    Args:
+        groups (array-like): Group label (event type) of each value
+        values (array-like): Values to summarize
+        quartiles (dict): Optional group label -> (q1, median, q3), see summarize_violin
+
+    Returns:
+        dict: Group label -> summary (see summarize_violin)
+    """
+    values = np.asarray(values, dtype=np.float64)
+    quartiles = quartiles or {}
+
+    # Factorizing uses the codes of categorical columns instead of comparing label strings
+    codes, labels = pd.factorize(pd.Series(groups, copy=False), sort=True)
+    order = np.argsort(codes, kind='stable')
+    # Values without a group (code -1) sort first and are skipped
+    bounds = np.count_nonzero(codes < 0) + np.r_[0, np.cumsum(np.bincount(codes[codes >= 0], minlength=len(labels)))]
+
+    summaries = {}
+    for i, label in enumerate(labels):
+        summary = summarize_violin(
+            values[order[bounds[i]:bounds[i + 1]]], n_points, quartiles=quartiles.get(label)
+        )
+        if summary is not None:
+            summaries[label] = summary
+    return summaries
+
+
+class ViolinAccumulator:
+    """
+    Build the summary of one violin from batches of values (out-of-core loading).
+
+    The box, grid and bandwidth are fixed up front from a quantile sketch of
+    all values (exact count, mean, std, min and max, approximate quartiles),
+    so each batch only adds its linear-binned counts, its whisker candidates
+    and its outliers. The result has the layout of summarize_violin. With the
+    same quartiles the density, whiskers and mean equal those of
+    summarize_violin up to float rounding; outlier markers are exact as long
+    as there are at most `k` outliers (the outlier sketch's k), else evenly
+    spread approximately.
+
+    Args:
+        sketch (KLLSketch): Sketch of all values of the violin
+        n_points (int): Number of density points
+        max_outliers (int): Maximum number of outlier markers kept
+    """
+
+    def __init__(self, sketch, n_points=DENSITY_POINTS, max_outliers=MAX_OUTLIERS):
+        self.q1, self.median, self.q3 = (float(q) for q in sketch.quantiles([0.25, 0.5, 0.75]))
+        iqr = self.q3 - self.q1
+        self.low, self.high = self.q1 - 1.5 * iqr, self.q3 + 1.5 * iqr
+        self.n, self.mean = sketch.n, sketch.mean
+        self.bandwidth = rule_of_thumb_bandwidth(sketch.n, sketch.std, self.q1, self.q3, sketch.max - sketch.min)
+        self.grid = np.linspace(sketch.min - 2 * self.bandwidth, sketch.max + 2 * self.bandwidth, n_points)
+        self.max_outliers = max_outliers
+        self.counts = np.zeros(n_points)
+        self.lowerfence, self.upperfence = np.inf, -np.inf
+        self.outliers = KLLSketch()
+
+    def update(self, values):
+        """Add a batch of values (NaN values are skipped)."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.counts += linear_bin_counts(values, self.grid)
+        inside = (values >= self.low) & (values <= self.high)
+        if inside.any():
+            self.lowerfence = min(self.lowerfence, float(values[inside].min()))
+            self.upperfence = max(self.upperfence, float(values[inside].max()))
+        self.outliers.update(values[~inside])
+
+    def summary(self):
+        """
+        Get the violin summary of all added values.
+
+        Returns:
+            dict: Same keys as summarize_violin
+        """
+        if self.outliers.retained == self.outliers.n:
+            # Every outlier retained (never compacted): same selection as summarize_violin
+            outliers = _spread_outliers(np.sort(np.concatenate(self.outliers.levels)), self.max_outliers)
+        else:
+            outliers = self.outliers.quantiles(np.linspace(0, 1, self.max_outliers))
+        lowerfence, upperfence = (
+            (self.lowerfence, self.upperfence) if self.lowerfence <= self.upperfence else (self.q1, self.q3)
+        )
+        return {
+            'grid': self.grid,
+            'density': smooth_bin_counts(self.counts, self.grid, self.bandwidth, self.n),
+            'q1': self.q1,
+            'median': self.median,
+            'q3': self.q3,
+            'lowerfence': float(lowerfence),
+            'upperfence': float(upperfence),
+            'mean': float(self.mean),
+            'count': int(self.n),
+            'bandwidth': float(self.bandwidth),
+            'outliers': outliers,
+        }
+
+
+def violin_axis(index):
+    """Layout key and trace reference of the overlay axis of a violin."""
+    return f'yaxis{index + 2}', f'y{index + 2}'
+
+
+def violin_axis_range(position, n_violins):
+    """
+    Range of a violin's overlay axis that puts its centre (y=0) at `position`
+    of the main axis, whose range is [-0.5, n_violins - 0.5].
+    """
+    return [-0.5 - position, n_violins - 0.5 - position]
+
+
+def common_max_density(summaries, names):
+    """Largest density of a set of violins, the scale all of them share (Plotly's 'width' scale mode)."""
+    return float(max((summaries[name]['density'].max() for name in names), default=1.0))
+
+
+def violin_outline(summary, max_density):
+    """
+    Coordinates of a violin's closed outline around y=0.
+
+    Args:
+        summary (dict): Violin summary
+        max_density (float): Density drawn at the full violin width
+
+    Returns:
+        tuple: (x, y) float32 arrays (plenty for screen coordinates, half the payload)
+    """
+    half_width = summary['density'] / max_density * VIOLIN_HALF_WIDTH
+    x = np.concatenate([summary['grid'], summary['grid'][::-1]]).astype(np.float32)
+    y = np.concatenate([half_width, -half_width[::-1]]).astype(np.float32)
+    return x, y
+
+
+def build_violin_traces(summaries, names, color, max_density=None, first_axis=0):
+    """
+    Build the outline, box and outlier traces of a set of violins.
+
+    Args:
+        summaries (dict): Event type -> summary
+        names (list): Event types to draw (violin i uses overlay axis first_axis + i)
+        color (str): Violin color
+        max_density (float): Common density scale; defaults to the largest
+            density of the drawn violins (see common_max_density)
+        first_axis (int): Overlay axis of the first violin, to append violins to a figure
+
+    Returns:
+        list: Plotly traces, three per violin
+    """
+    if max_density is None:
+        max_density = common_max_density(summaries, names)
+
+    traces = []
+    for index, name in enumerate(names, start=first_axis):
+        summary = summaries[name]
+        _, axis_ref = violin_axis(index)
+        x, y = violin_outline(summary, max_density)
+
+        traces.append(go.Scatter(
+            x=x,
+            y=y,
+            yaxis=axis_ref,
+            mode='lines',
+            fill='toself',
+            line={'color': color, 'width': 1},
+            fillcolor=color,
+            opacity=0.5,
+            name=name,
+            hoverinfo='skip',
+            showlegend=False
+        ))
+        traces.append(go.Box(
+            q1=[summary['q1']],
+            median=[summary['median']],
+            q3=[summary['q3']],
+            lowerfence=[summary['lowerfence']],
+            upperfence=[summary['upperfence']],
+            mean=[summary['mean']],
+            y=[0],
+            yaxis=axis_ref,
+            orientation='h',
+            width=BOX_WIDTH,
+            whiskerwidth=0,
+            fillcolor='rgba(255,255,255,0.6)',
+            line={'color': color, 'width': 1},
+            name=name,
+            hovertemplate=(
+                f"<b>{name}</b><br>n={summary['count']:,}<br>"
+                "lower fence=%{lowerfence}<br>q1=%{q1}<br>median=%{median}<br>"
+                "q3=%{q3}<br>upper fence=%{upperfence}<extra></extra>"
+            ),
+            showlegend=False
+        ))
+        traces.append(go.Scatter(
+            x=summary['outliers'],
+            y=np.zeros(len(summary['outliers'])),
+            yaxis=axis_ref,
+            mode='markers',
+            marker={'color': color, 'size': 4, 'opacity': 0.6},
+            name=name,
+            hovertemplate=f"{name}: %{{x}}<extra></extra>",
+            showlegend=False
+        ))
+    return traces
+
+
+def violin_axes_layout(names, event_order):
+    """
+    Layout for the main y-axis and one hidden overlay axis per violin.
+
+    Args:
+        names (list): Event types in trace order
+        event_order (list): Display order, first entry at the top (as in px.violin)
+
+    Returns:
+        dict: Layout properties to apply with fig.update_layout
+    """
+    n_violins = len(event_order)
+    # Tick 0 is at the bottom, so the first entry gets the highest position
+    position = {name: n_violins - 1 - i for i, name in enumerate(event_order)}
+
+    layout = {
+        'yaxis': {
+            'tickmode': 'array',
+            'tickvals': list(range(n_violins)),
+            'ticktext': list(reversed(event_order)),
+            'range': [-0.5, n_violins - 0.5],
+            'fixedrange': True,
+            'zeroline': False,
+        }
+    }
+    for index, name in enumerate(names):
+        axis_key, _ = violin_axis(index)
+        layout[axis_key] = {
+            'overlaying': 'y',
+            'visible': False,
+            'fixedrange': True,
+            'range': violin_axis_range(position[name], n_violins),
+        }
+    return layout
+
+
+def build_violin_figure(summaries, event_order, color, trace_order=None):
+    """
+    Build a horizontal box-in-violin figure from precomputed summaries.
+
+    Args:
+        summaries (dict): Event type -> summary (see summarize_groups)
+        event_order (list): Event types in display order (first at the top)
+        color (str): Violin color
+        trace_order (list): Event types in trace order (default: event_order);
+            keep it fixed across sort orders so re-sorting only changes the layout
+
+    Returns:
+        go.Figure: Figure whose size does not depend on the number of events
+    """
+    names = [name for name in (trace_order or event_order) if name in summaries]
+    order = [name for name in event_order if name in summaries]
+    fig = go.Figure(data=build_violin_traces(summaries, names, color))
+    fig.update_layout(**violin_axes_layout(names, order))
+    return fig
@@ -0,0 +1,126 @@
+"""
+Background Dataset Warm-Up
+
+This module loads a set of datasets concurrently in a thread pool (e.g. at
+server start) and tracks the state of each load, so the dashboard can answer
+readiness probes and tell users which datasets are still loading.
+
+Loads go through the same cached loaders the callbacks use, so a callback
+that asks for a dataset while it is warming waits for that single load
+instead of starting a second one.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PENDING = 'pending'
+LOADING = 'loading'
+READY = 'ready'
+FAILED = 'failed'
+
+
+class DatasetWarmer:
+    """
+    Warm up datasets in background threads.
+
+    Args:
+        loaders (dict): Dataset key -> zero-argument function that loads and
+            prepares the dataset; it should return a falsy value or raise on failure
+        max_workers (int): Number of concurrent loads (default: one per dataset)
+    """
+
+    def __init__(self, loaders, max_workers=None):
+        self.loaders = dict(loaders)
+        self.max_workers = max_workers or max(len(self.loaders), 1)
+        self._status = {key: PENDING for key in self.loaders}
+        self._errors = {}
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._started_at = None
+        self._finished_at = None
+
+    def start(self):
+        """
+        Start loading all datasets without blocking.
+
+        Returns:
+            DatasetWarmer: self
+        """
+        self._started_at = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='warmup')
+        futures = [executor.submit(self._load, key) for key in self.loaders]
+        executor.shutdown(wait=False)
+
+        if not futures:
+            self._finish()
+        return self
+
+    def _load(self, key):
+        self._set_status(key, LOADING)
+        start = time.perf_counter()
+        try:
+            ok = self.loaders[key]()
+            status = READY if ok else FAILED
+            if not ok:
+                self._errors[key] = 'loader returned no data'
+        except Exception as e:
+            status = FAILED
+            self._errors[key] = str(e)
+        self._set_status(key, status)
+        print(f"{'🔥' if status == READY else '⚠️ '} Warm-up {key}: {status} in {time.perf_counter() - start:.1f}s")
+
+        with self._lock:
+            finished = all(value in (READY, FAILED) for value in self._status.values())
+        if finished:
+            self._finish()
+
+    def _finish(self):
+        self._finished_at = time.perf_counter()
+        self._done.set()
+
+    def _set_status(self, key, status):
+        with self._lock:
+            self._status[key] = status
+
+    def wait(self, timeout=None):
+        """
+        Block until every dataset finished loading.
+
+        Args:
+            timeout (float): Maximum seconds to wait (None waits forever)
+
+        Returns:
+            bool: True if all loads finished
+        """
+        return self._done.wait(timeout)
+
+    def is_ready(self):
+        """Check whether all loads finished (successfully or not)."""
+        return self._done.is_set()
+
+    def is_loading(self, key):
+        """Check whether a dataset is still waiting for or in its warm-up load."""
+        with self._lock:
+            return self._status.get(key) in (PENDING, LOADING)
+
+    def snapshot(self):
+        """
+        Describe the warm-up state.
+
+        Returns:
+            dict: ready flag (all loads finished), failed flag (all finished and
+                none succeeded), per-dataset status, errors and elapsed seconds
+        """
+        with self._lock:
+            status = dict(self._status)
+            errors = dict(self._errors)
+        end = self._finished_at or time.perf_counter()
+        ready = self.is_ready()
+        return {
+            'ready': ready,
+            'failed': ready and bool(status) and READY not in status.values(),
+            'datasets': status,
+            'errors': errors,
+            'elapsed_seconds': round(end - self._started_at, 3) if self._started_at else None,
+        }
@@ -0,0 +1,25 @@
+"""
+WSGI Entry Point for Production Serving
+
+Exposes the dashboard's Flask server as `server` for multi-worker WSGI
+servers. Importing this module loads and prepares every configured dataset
+before returning, so with a preloading server (gunicorn --preload, or
+`python setup_and_run.py --serve production`) the datasets are loaded once
+in the master process and the forked workers share those memory pages
+copy-on-write instead of each loading its own copy.
+
+Usage:
+    gunicorn --preload --chdir src --workers 4 --threads 4 wsgi:server
+"""
+
+import gc
+
+from app import app, start_warmup
+
+start_warmup(wait=True)
+
+# Move everything allocated so far out of the garbage collector's reach, so
+# collections in the workers do not write to (and thereby copy) shared pages
+gc.freeze()
+
+server = app.server
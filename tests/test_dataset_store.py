@@ -0,0 +1,52 @@
+"""
+Tests for the in-process dataset store (src/utils/dataset_store.py)
+"""
+
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.dataset_store import DatasetEntry, estimate_nbytes  # noqa: E402
+
+
+def test_views_are_counted_once(tmp_path):
+    values = np.zeros(100_000)
+    assert estimate_nbytes([values, values[:10], values[::2]]) == values.nbytes
+
+    entry = DatasetEntry('key', (), pd.DataFrame({'hours': values}))
+    before = entry.nbytes
+    entry.memo('head', lambda: entry.df['hours'].to_numpy()[:1000])
+    assert entry.nbytes == before
+
+
+def test_memory_mapped_arrays_are_not_counted(tmp_path):
+    np.save(tmp_path / 'hours.npy', np.zeros(100_000))
+    mapped = np.load(tmp_path / 'hours.npy', mmap_mode='r')
+    assert estimate_nbytes(mapped) == 0
+    assert estimate_nbytes(mapped.view(np.ndarray)[:500]) == 0
+
+
+def test_memo_does_not_block_other_keys():
+    entry = DatasetEntry('key', (), None)
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return 'slow'
+
+    thread = threading.Thread(target=entry.memo, args=('slow', slow))
+    thread.start()
+    started.wait(5)
+    try:
+        assert entry.memo('fast', lambda: 'fast') == 'fast'
+        assert entry.memo('outer', lambda: entry.memo('inner', lambda: 1) + 1) == 2
+    finally:
+        release.set()
+        thread.join()
+    assert entry.memo('slow', lambda: 'recomputed') == 'slow'
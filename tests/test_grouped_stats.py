@@ -0,0 +1,53 @@
+"""
+Tests for the single-pass grouped statistics (src/utils/grouped_stats.py)
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.grouped_stats import grouped_stats  # noqa: E402
+
+
+def _log(dtype, n=20_000, seed=7):
+    rng = np.random.default_rng(seed)
+    keys = pd.Series(rng.choice(['a', 'b', 'c', 'd'], size=n)).astype('category')
+    values = rng.pareto(1.5, size=n).astype(dtype)
+    values[::97] = np.nan
+    return keys, pd.Series(values)
+
+
+def _pandas_stats(keys, values):
+    groups = values.groupby(keys, observed=True)
+    return pd.DataFrame({
+        'count': groups.count(), 'mean': groups.mean(), 'std': groups.std(), 'min': groups.min(),
+        'max': groups.max(), 'q1': groups.quantile(0.25), 'median': groups.quantile(0.5),
+        'q3': groups.quantile(0.75),
+    })
+
+
+def test_float64_matches_pandas_exactly():
+    keys, values = _log(np.float64)
+    stats = grouped_stats(keys, values, std=True)
+    expected = _pandas_stats(keys, values)
+    for column in expected.columns:
+        np.testing.assert_array_equal(stats[column].to_numpy(), expected[column].to_numpy(dtype=np.float64))
+
+
+def test_float32_is_computed_in_float64():
+    keys, values = _log(np.float32)
+    stats = grouped_stats(keys, values, std=True)
+
+    # Equal to pandas on the upcast values
+    upcast = _pandas_stats(keys, values.astype(np.float64))
+    for column in upcast.columns:
+        np.testing.assert_array_equal(stats[column].to_numpy(), upcast[column].to_numpy(dtype=np.float64))
+
+    # Close to pandas' float32 statistics, but not necessarily equal in the low bits
+    native = _pandas_stats(keys, values)
+    for column in native.columns:
+        np.testing.assert_allclose(stats[column].to_numpy(), native[column].to_numpy(dtype=np.float64), rtol=1e-5)
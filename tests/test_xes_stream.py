@@ -0,0 +1,54 @@
+"""
+Tests for the streaming XES conversion (src/data_processing/xes_stream.py)
+"""
+
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from data_processing import xes_stream  # noqa: E402
+from data_processing.mapped_log import has_fresh_mapped  # noqa: E402
+from data_processing.storage import columnar_path_for, has_fresh_columnar  # noqa: E402
+from data_processing.synthetic import generate_event_log, write_xes  # noqa: E402
+
+
+def _write_log(tmp_path, n_cases=200):
+    xes_path = str(tmp_path / 'log.xes')
+    write_xes(generate_event_log(n_cases=n_cases, events_per_case=5), xes_path)
+    return xes_path, str(tmp_path / 'processed_log.csv')
+
+
+def test_stream_writes_all_outputs(tmp_path):
+    xes_path, csv_path = _write_log(tmp_path)
+
+    assert xes_stream.stream_xes_to_csv(xes_path, csv_path, chunk_events=100)
+    assert os.path.exists(csv_path)
+    assert has_fresh_mapped(csv_path)
+    if xes_stream.COLUMNAR_AVAILABLE:
+        assert has_fresh_columnar(csv_path)
+    assert not [name for name in os.listdir(tmp_path) if '.tmp-' in name]
+
+
+def test_parse_error_mid_stream_leaves_no_partial_output(tmp_path, monkeypatch):
+    xes_path, csv_path = _write_log(tmp_path)
+    iter_traces = xes_stream._iter_traces
+    calls = []
+
+    def failing_iter_traces(path):
+        # The schema scan passes; the conversion pass fails after several chunks were written
+        calls.append(path)
+        for i, trace in enumerate(iter_traces(path)):
+            if len(calls) > 1 and i == 150:
+                raise ET.ParseError('mismatched tag')
+            yield trace
+
+    monkeypatch.setattr(xes_stream, '_iter_traces', failing_iter_traces)
+
+    assert not xes_stream.stream_xes_to_csv(xes_path, csv_path, chunk_events=100)
+    assert not os.path.exists(csv_path)
+    assert not os.path.exists(columnar_path_for(csv_path))
+    assert not has_fresh_columnar(csv_path)
+    assert not has_fresh_mapped(csv_path)
+    assert not [name for name in os.listdir(tmp_path) if '.tmp-' in name]